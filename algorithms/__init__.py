@@ -0,0 +1,8 @@
+import os
+
+# Opt-in profiling has to be installed before any engine module is imported
+if os.environ.get('OTHELLO_PROFILE'):
+    from algorithms import profiling
+    _mode = profiling.parse_mode(os.environ['OTHELLO_PROFILE'])
+    if _mode:
+        profiling.install(_mode)
@@ -1,16 +1,37 @@
 from algorithms.heuristics import weighted_heuristic
+from algorithms.stats import SearchStats
 from model.board import Board
+from model.snapshot import Snapshot
 
-def backtracking_minimax_generator(state, depth, alpha, beta, player, heuristic_func):
+def backtracking_minimax_generator(state, depth, alpha, beta, player, heuristic_func, stats, cache=None, ply=0):
     """
        minimax generator with Alpha-Beta pruning that uses perfect backtracking (in-place modification).
     it avoids copying the board, massively reducing memory allocations.
+    Flips are recorded on the board's own undo stack (push_move / pop_move),
+    so no flip list is allocated per node either.
+    cache: optional TreeCache (algorithms/tree_cache.py) kept between moves;
+    its best moves are searched first and its bounds settle nodes below the root.
     """
-    yield {'type': 'search_node', 'state': state, 'depth': depth, 'alpha': alpha, 'beta': beta}
+    entry = None
+    if cache is not None and depth > 0:
+        key = cache.key(state)
+        stats.tt_probes += 1
+        entry = cache.probe(key)
+        if entry is not None and ply > 0:
+            value = cache.cutoff(entry, depth, alpha, beta)
+            if value is not None:
+                stats.tt_hits += 1
+                yield {'type': 'dp_hit', 'state': Snapshot.from_state(state), 'score': value, 'depth': depth}
+                return value, entry[3]
+    original_alpha, original_beta = alpha, beta
+
+    stats.node(depth)
+    yield {'type': 'search_node', 'state': Snapshot.from_state(state), 'depth': depth, 'alpha': alpha, 'beta': beta}
 
     if depth == 0 or state.is_terminal():
         score = heuristic_func(state.board, player)
-        yield {'type': 'leaf', 'state': state, 'depth': depth, 'score': score}
+        stats.leaves += 1
+        yield {'type': 'leaf', 'state': Snapshot.from_state(state), 'depth': depth, 'score': score}
         return score, None
 
     # we only get moves for the cURRENT turn player
@@ -22,30 +43,39 @@ def backtracking_minimax_generator(state, depth, alpha, beta, player, heuristic_
         original_player = state.player
         state.player = -state.player
         
-        val, _ = yield from backtracking_minimax_generator(state, depth-1, alpha, beta, player, heuristic_func)
+        val, _ = yield from backtracking_minimax_generator(state, depth-1, alpha, beta, player, heuristic_func, stats, cache, ply + 1)
         
         # Backtrack player
         state.player = original_player
+
+        if cache is not None:
+            cache.store(key, depth, val, original_alpha, original_beta, None)
+            stats.tt_stores += 1
         
         return val, None
 
+    if entry is not None and entry[3] in moves:
+        # Previous best move first
+        moves.remove(entry[3])
+        moves.insert(0, entry[3])
+
     best_move = None
 
     if state.player == player: 
         # Maximizing Player
         max_eval = float('-inf')
-        for r, c in moves:
+        for index, (r, c) in enumerate(moves):
             # APPLY MOVE IN-PLACE
-            flipped = state.board.apply_move_in_place(r, c, state.player)
+            state.board.push_move(r, c, state.player)
             original_player = state.player
             state.player = -state.player
             
             # RECURSE
-            eval_score, _ = yield from backtracking_minimax_generator(state, depth - 1, alpha, beta, player, heuristic_func)
+            eval_score, _ = yield from backtracking_minimax_generator(state, depth - 1, alpha, beta, player, heuristic_func, stats, cache, ply + 1)
             
             # BACKTRACK (Undo Move)
             state.player = original_player
-            state.board.undo_move(r, c, state.player, flipped)
+            state.board.pop_move()
             
             if eval_score > max_eval:
                 max_eval = eval_score
@@ -53,9 +83,14 @@ def backtracking_minimax_generator(state, depth, alpha, beta, player, heuristic_
             
             alpha = max(alpha, eval_score)
             if beta <= alpha:
-                yield {'type': 'prune', 'state': state, 'depth': depth, 'score': eval_score}
+                stats.cutoff(depth, index)
+                yield {'type': 'prune', 'state': Snapshot.from_state(state), 'depth': depth, 'score': eval_score, 'move': (r, c)}
                 break # Beta Prune
 
+        if cache is not None:
+            cache.store(key, depth, max_eval, original_alpha, original_beta, best_move)
+            stats.tt_stores += 1
+
         # best_move is just coordinates. To be compatible with UI which expects a GameState,
         # we will reconstruct the *best state* once at the end in the wrapper.
         return max_eval, best_move
@@ -63,18 +98,18 @@ def backtracking_minimax_generator(state, depth, alpha, beta, player, heuristic_
     else: 
         # Minimizing Player
         min_eval = float('inf')
-        for r, c in moves:
+        for index, (r, c) in enumerate(moves):
             # APPLY MOVE IN-PLACE
-            flipped = state.board.apply_move_in_place(r, c, state.player)
+            state.board.push_move(r, c, state.player)
             original_player = state.player
             state.player = -state.player
             
             # RECURSE
-            eval_score, _ = yield from backtracking_minimax_generator(state, depth - 1, alpha, beta, player, heuristic_func)
+            eval_score, _ = yield from backtracking_minimax_generator(state, depth - 1, alpha, beta, player, heuristic_func, stats, cache, ply + 1)
             
             # BACKTRACK
             state.player = original_player
-            state.board.undo_move(r, c, state.player, flipped)
+            state.board.pop_move()
             
             if eval_score < min_eval:
                 min_eval = eval_score
@@ -82,18 +117,32 @@ def backtracking_minimax_generator(state, depth, alpha, beta, player, heuristic_
                 
             beta = min(beta, eval_score)
             if beta <= alpha:
-                yield {'type': 'prune', 'state': state, 'depth': depth, 'score': eval_score}
+                stats.cutoff(depth, index)
+                yield {'type': 'prune', 'state': Snapshot.from_state(state), 'depth': depth, 'score': eval_score, 'move': (r, c)}
                 break # Alpha Prune
+
+        if cache is not None:
+            cache.store(key, depth, min_eval, original_alpha, original_beta, best_move)
+            stats.tt_stores += 1
         
         return min_eval, best_move
 
-def get_backtracking_move_generator(state, depth=3):
+def get_backtracking_move_generator(state, depth=3, heuristic_func=weighted_heuristic, stats=None, cache=None):
     """
     Entry point for the Backtracking Minimax generator.
+    heuristic_func can be any (board, player) evaluator, e.g. pattern_heuristic.
+    stats (SearchStats) is filled in during the search and returned in the result event.
+    cache: TreeCache kept between this side's moves (see algorithms/tree_cache.py).
     """
+    if stats is None:
+        stats = SearchStats()
+    stats.begin_iteration(depth)
     score, best_move_coords = yield from backtracking_minimax_generator(
-        state, depth, float('-inf'), float('inf'), state.player, weighted_heuristic
+        state, depth, float('-inf'), float('inf'), state.player, heuristic_func, stats, cache
     )
+    stats.end_iteration()
+    if cache is not None:
+        stats.tt_size = len(cache)
     
     # Once the search is done, GameState is back to its original configuration.
     # The UI needs the new GameState corresponding to the best move.
@@ -108,11 +157,11 @@ def get_backtracking_move_generator(state, depth=3):
         from model.game_state import GameState
         best_state = GameState(state.board, -state.player) # Ideally copy board
         
-    yield {'type': 'result', 'state': best_state, 'score': score}
+    yield {'type': 'result', 'state': best_state, 'score': score, 'stats': stats}
 
-def get_best_move(state, depth=3):
+def get_best_move(state, depth=3, heuristic_func=weighted_heuristic, stats=None):
     """ Backward compatibility wrapper. """
-    gen = get_backtracking_move_generator(state, depth)
+    gen = get_backtracking_move_generator(state, depth, heuristic_func, stats)
     result_state = None
     for item in gen:
         if item['type'] == 'result':
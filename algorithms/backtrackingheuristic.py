@@ -1,4 +1,5 @@
 from model.board import Board
+from model.snapshot import Snapshot
 from algorithms.heuristics import weighted_heuristic
 from model.game_state import GameState
 
@@ -33,7 +34,7 @@ def evaluatemove(board, moves, depth, playerturn, rootplayer, ismax):
 
 def evaluatemovevisual(board, moves, depth, playerturn, rootplayer, ismax):
 
-    viewstate = GameState(board, playerturn)
+    viewstate = Snapshot.from_board(board, playerturn)
     yield {'type': 'search_node', 'state': viewstate, 'depth': depth}
 
     results = []
@@ -45,7 +46,7 @@ def evaluatemovevisual(board, moves, depth, playerturn, rootplayer, ismax):
         if depth == 0 or newboard.is_full():
             score = weighted_heuristic(newboard, rootplayer)
 
-            leafstate = GameState(newboard, -playerturn)
+            leafstate = Snapshot.from_board(newboard, -playerturn)
             yield {'type': 'leaf', 'state': leafstate, 'depth': depth, 'score': score}
 
             results.append((score, move))
@@ -57,7 +58,7 @@ def evaluatemovevisual(board, moves, depth, playerturn, rootplayer, ismax):
         if not opponentmoves:
             score = weighted_heuristic(newboard, rootplayer)
 
-            leafstate = GameState(newboard, -playerturn)
+            leafstate = Snapshot.from_board(newboard, -playerturn)
             yield {'type': 'leaf', 'state': leafstate, 'depth': depth, 'score': score}
 
             results.append((score, move))
@@ -1,5 +1,8 @@
 from model.board import Board
+from model.bitboard import BitBoard, popcount
+from model.snapshot import Snapshot
 from model.game_state import GameState
+from algorithms.stats import SearchStats
 
 def scorer(board,player):
     s=0
@@ -40,9 +43,11 @@ def evaluatemove(board, moves, depth, playerturn, rootplayer, ismax):
     return res
 
 
-def evaluatemovevisual(board, moves, depth, playerturn, rootplayer, ismax):
+def evaluatemovevisual(board, moves, depth, playerturn, rootplayer, ismax, stats=None):
 
-    viewstate = GameState(board, playerturn)
+    viewstate = Snapshot.from_board(board, playerturn)
+    if stats is not None:
+        stats.node(depth)
     yield {'type': 'search_node', 'state': viewstate, 'depth': depth}
 
     results = []
@@ -55,7 +60,9 @@ def evaluatemovevisual(board, moves, depth, playerturn, rootplayer, ismax):
 
             score = scorer(newboard, rootplayer)
 
-            leafstate = GameState(newboard, -playerturn)
+            leafstate = Snapshot.from_board(newboard, -playerturn)
+            if stats is not None:
+                stats.leaves += 1
             yield {'type': 'leaf', 'state': leafstate, 'depth': depth, 'score': score}
 
             results.append((score, move))
@@ -68,14 +75,16 @@ def evaluatemovevisual(board, moves, depth, playerturn, rootplayer, ismax):
 
             score = scorer(newboard, rootplayer)
 
-            leafstate = GameState(newboard, -playerturn)
+            leafstate = Snapshot.from_board(newboard, -playerturn)
+            if stats is not None:
+                stats.leaves += 1
             yield {'type': 'leaf', 'state': leafstate, 'depth': depth, 'score': score}
 
             results.append((score, move))
             continue
 
         opponentresults = yield from evaluatemovevisual(
-            newboard, opponentmoves, depth-1, opponent, rootplayer, not ismax
+            newboard, opponentmoves, depth-1, opponent, rootplayer, not ismax, stats
         )
 
         scores = [s for s, m in opponentresults]
@@ -90,7 +99,7 @@ def evaluatemovevisual(board, moves, depth, playerturn, rootplayer, ismax):
     return results
 
 def choosebestmove(board,player,depth=3):
-    moves = board.get_valid_move(player)
+    moves = board.get_valid_moves(player)
     if not moves:
         return None 
     scmoves = evaluatemove(board, moves, depth, player, player, True)
@@ -99,14 +108,18 @@ def choosebestmove(board,player,depth=3):
     
     return bestmove
 
-def choosebestmovevisual(board, player, depth=3):
+def choosebestmovevisual(board, player, depth=3, stats=None):
 
     moves = board.get_valid_moves(player)
 
     if not moves:
         return
 
-    scoredmoves = yield from evaluatemovevisual(board, moves, depth, player, player, True)
+    if stats is None:
+        stats = SearchStats()
+    stats.begin_iteration(depth)
+    scoredmoves = yield from evaluatemovevisual(board, moves, depth, player, player, True, stats)
+    stats.end_iteration()
 
     scoredmoves.sort(key=lambda x: x[0], reverse=True)
 
@@ -118,4 +131,141 @@ def choosebestmovevisual(board, player, depth=3):
 
     resultstate = GameState(newboard, nextplayer)
 
-    yield {'type': 'result', 'state': resultstate}
+    yield {'type': 'result', 'state': resultstate, 'stats': stats}
+
+
+# ── In-place, memoized version ────────────────────────────────────────────────
+#
+# Same scores as evaluatemove: a move is scored by the disc difference for the
+# root player once 'depth' reaches 0, the board is full or the opponent has no
+# reply; otherwise by the min (opponent to move) or max (root player to move)
+# over the replies. The search runs on one BitBoard with push_move/pop_move,
+# and the value of a node - it only depends on the discs, the side to move and
+# the depth left - is stored in a table keyed by (black, white, turn, depth),
+# so transposed subtrees are searched once.
+
+def _bit_scorer(bb, rootplayer):
+    own, opp = bb._sides(rootplayer)
+    return popcount(own) - popcount(opp)
+
+def _node_value(bb, depth, playerturn, rootplayer, table, stats):
+    """ Value of the node where 'playerturn' (who has a legal move) is to play. """
+    key = (bb.black, bb.white, playerturn, depth)
+    stats.tt_probes += 1
+    value = table.get(key)
+    if value is not None:
+        stats.tt_hits += 1
+        return value
+
+    stats.node(depth)
+    ismax = playerturn == rootplayer
+    value = None
+    for r, c in bb.get_valid_moves(playerturn):
+        score = _move_score(bb, r, c, depth, playerturn, rootplayer, table, stats)
+        if value is None or (score > value if ismax else score < value):
+            value = score
+    table[key] = value
+    stats.tt_stores += 1
+    return value
+
+def _move_score(bb, r, c, depth, playerturn, rootplayer, table, stats):
+    bb.push_move(r, c, playerturn)
+    if depth == 0 or bb.is_full() or not bb.get_moves_mask(-playerturn):
+        stats.leaves += 1
+        score = _bit_scorer(bb, rootplayer)
+    else:
+        score = _node_value(bb, depth - 1, -playerturn, rootplayer, table, stats)
+    bb.pop_move()
+    return score
+
+def evaluatemove_memo(board, moves, depth, player, stats=None):
+    """
+    Same (score, move) list as evaluatemove(board, moves, depth, player, player, True),
+    computed in-place on a BitBoard copy with a transposition table.
+    """
+    if stats is None:
+        stats = SearchStats()
+    stats.begin_iteration(depth)
+    bb = BitBoard.from_board(board)
+    table = {}
+    stats.node(depth)
+    res = [(_move_score(bb, m[0], m[1], depth, player, player, table, stats), m) for m in moves]
+    stats.end_iteration()
+    stats.tt_size = len(table)
+    return res
+
+def choosebestmove_memo(board, player, depth=3):
+    moves = board.get_valid_moves(player)
+    if not moves:
+        return None
+    scmoves = evaluatemove_memo(board, moves, depth, player)
+    scmoves.sort(key=lambda x: x[0], reverse=True)
+    return scmoves[0][1]
+
+def _node_value_visual(bb, depth, playerturn, rootplayer, table, stats):
+    """ _node_value as a UI generator: search_node, leaf and dp_hit (table hit) events. """
+    key = (bb.black, bb.white, playerturn, depth)
+    stats.tt_probes += 1
+    value = table.get(key)
+    if value is not None:
+        stats.tt_hits += 1
+        yield {'type': 'dp_hit', 'state': Snapshot.from_masks(bb.black, bb.white, bb.SIZE, playerturn), 'score': value, 'depth': depth}
+        return value
+
+    stats.node(depth)
+    yield {'type': 'search_node', 'state': Snapshot.from_masks(bb.black, bb.white, bb.SIZE, playerturn), 'depth': depth}
+    ismax = playerturn == rootplayer
+    value = None
+    for r, c in bb.get_valid_moves(playerturn):
+        score = yield from _move_score_visual(bb, r, c, depth, playerturn, rootplayer, table, stats)
+        if value is None or (score > value if ismax else score < value):
+            value = score
+    table[key] = value
+    stats.tt_stores += 1
+    return value
+
+def _move_score_visual(bb, r, c, depth, playerturn, rootplayer, table, stats):
+    bb.push_move(r, c, playerturn)
+    if depth == 0 or bb.is_full() or not bb.get_moves_mask(-playerturn):
+        stats.leaves += 1
+        score = _bit_scorer(bb, rootplayer)
+        yield {'type': 'leaf', 'state': Snapshot.from_masks(bb.black, bb.white, bb.SIZE, -playerturn), 'depth': depth, 'score': score}
+    else:
+        score = yield from _node_value_visual(bb, depth - 1, -playerturn, rootplayer, table, stats)
+    bb.pop_move()
+    return score
+
+def evaluatemovevisual_memo(board, moves, depth, player, stats):
+    """
+    Generator version of evaluatemove_memo (same events as evaluatemovevisual,
+    plus dp_hit for table hits); returns the (score, move) list.
+    """
+    bb = BitBoard.from_board(board)
+    table = {}
+    stats.node(depth)
+    yield {'type': 'search_node', 'state': Snapshot.from_masks(bb.black, bb.white, bb.SIZE, player), 'depth': depth}
+    scoredmoves = []
+    for m in moves:
+        score = yield from _move_score_visual(bb, m[0], m[1], depth, player, player, table, stats)
+        scoredmoves.append((score, m))
+    stats.tt_size = len(table)
+    return scoredmoves
+
+def choosebestmovevisual_memo(board, player, depth=3, stats=None):
+    """
+    choosebestmovevisual with the in-place, memoized search: same scores and
+    the same chosen move. 'board' itself is not modified.
+    """
+    moves = board.get_valid_moves(player)
+    if not moves:
+        return
+    if stats is None:
+        stats = SearchStats()
+    stats.begin_iteration(depth)
+    scoredmoves = yield from evaluatemovevisual_memo(board, moves, depth, player, stats)
+    stats.end_iteration()
+
+    scoredmoves.sort(key=lambda x: x[0], reverse=True)
+    bestscore, bestmove = scoredmoves[0]
+    newboard, _ = board.apply_move(bestmove[0], bestmove[1], player)
+    yield {'type': 'result', 'state': GameState(newboard, -player), 'score': bestscore, 'stats': stats}
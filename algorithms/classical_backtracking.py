@@ -1,7 +1,9 @@
 from model.board import Board
+from model.snapshot import Snapshot
+from algorithms.small_board import load_table
 
 
-def classical_backtracking_generator(state, alpha, beta, player):
+def classical_backtracking_generator(state, alpha, beta, player, table=None, ply=0):
     """
     Pure / Classical Backtracking Minimax with Alpha-Beta Pruning.
 
@@ -10,10 +12,20 @@ def classical_backtracking_generator(state, alpha, beta, player):
     - NO heuristic: score is the raw piece-count difference at game over.
       (positive = Black winning, negative = White winning)
     - Uses in-place board mutation + undo to avoid copying (memory efficient).
+      The undo history lives in the board's preallocated stack (push_move / pop_move).
 
     WARNING: Exponential complexity. Best on 4x4 or 6x6 boards.
+
+    table: optional SolvedTable (algorithms.small_board). Positions below the
+    root that it holds return their perfect-play value without a search.
     """
-    yield {'type': 'search_node', 'state': state, 'depth': 0, 'alpha': alpha, 'beta': beta}
+    if table is not None and ply > 0:
+        value = table.lookup(state.board, state.player)
+        if value is not None:
+            yield {'type': 'dp_hit', 'state': Snapshot.from_state(state), 'depth': 0, 'score': value}
+            return value, None
+
+    yield {'type': 'search_node', 'state': Snapshot.from_state(state), 'depth': 0, 'alpha': alpha, 'beta': beta}
 
     moves = state.board.get_valid_moves(state.player)
 
@@ -27,14 +39,14 @@ def classical_backtracking_generator(state, alpha, beta, player):
             # Neither player can move → true game over
             black, white = state.board.get_counts()
             score = black - white  # pure piece count, no heuristic
-            yield {'type': 'leaf', 'state': state, 'depth': 0, 'score': score}
+            yield {'type': 'leaf', 'state': Snapshot.from_state(state), 'depth': 0, 'score': score}
             return score, None
 
         # Current player must pass; switch and continue
         original_player = state.player
         state.player = opponent
 
-        val, _ = yield from classical_backtracking_generator(state, alpha, beta, player)
+        val, _ = yield from classical_backtracking_generator(state, alpha, beta, player, table, ply + 1)
 
         state.player = original_player  # backtrack player
         return val, None
@@ -46,16 +58,16 @@ def classical_backtracking_generator(state, alpha, beta, player):
         max_eval = float('-inf')
         for r, c in moves:
             # Apply move in-place
-            flipped = state.board.apply_move_in_place(r, c, state.player)
+            state.board.push_move(r, c, state.player)
             original_player = state.player
             state.player = -state.player
 
             # Recurse (no depth decrement — goes until terminal)
-            eval_score, _ = yield from classical_backtracking_generator(state, alpha, beta, player)
+            eval_score, _ = yield from classical_backtracking_generator(state, alpha, beta, player, table, ply + 1)
 
             # BACKTRACK
             state.player = original_player
-            state.board.undo_move(r, c, state.player, flipped)
+            state.board.pop_move()
 
             if eval_score > max_eval:
                 max_eval = eval_score
@@ -63,7 +75,7 @@ def classical_backtracking_generator(state, alpha, beta, player):
 
             alpha = max(alpha, eval_score)
             if beta <= alpha:
-                yield {'type': 'prune', 'state': state, 'depth': 0, 'score': eval_score}
+                yield {'type': 'prune', 'state': Snapshot.from_state(state), 'depth': 0, 'score': eval_score, 'move': (r, c)}
                 break  # Beta cut-off
 
         return max_eval, best_move
@@ -73,16 +85,16 @@ def classical_backtracking_generator(state, alpha, beta, player):
         min_eval = float('inf')
         for r, c in moves:
             # Apply move in-place
-            flipped = state.board.apply_move_in_place(r, c, state.player)
+            state.board.push_move(r, c, state.player)
             original_player = state.player
             state.player = -state.player
 
             # Recurse
-            eval_score, _ = yield from classical_backtracking_generator(state, alpha, beta, player)
+            eval_score, _ = yield from classical_backtracking_generator(state, alpha, beta, player, table, ply + 1)
 
             # BACKTRACK
             state.player = original_player
-            state.board.undo_move(r, c, state.player, flipped)
+            state.board.pop_move()
 
             if eval_score < min_eval:
                 min_eval = eval_score
@@ -90,19 +102,32 @@ def classical_backtracking_generator(state, alpha, beta, player):
 
             beta = min(beta, eval_score)
             if beta <= alpha:
-                yield {'type': 'prune', 'state': state, 'depth': 0, 'score': eval_score}
+                yield {'type': 'prune', 'state': Snapshot.from_state(state), 'depth': 0, 'score': eval_score, 'move': (r, c)}
                 break  # Alpha cut-off
 
         return min_eval, best_move
 
 
-def get_classical_bt_generator(state):
+def get_classical_bt_generator(state, use_table=True):
     """
     Entry point for the Classical Backtracking generator.
     Compatible with the UI's generator protocol (yields vis events, ends with 'result').
+    With use_table, a solved table for the board size (solve_small_board.py)
+    answers directly when it covers the position, and is probed during the
+    search otherwise. Scores are black - white, so Black is the maximiser.
     """
+    table = load_table(state.board.SIZE) if use_table else None
+    if table is not None:
+        found = table.best_move(state.board, state.player)
+        if found is not None:
+            (r, c), score = found
+            new_board, _ = state.board.apply_move(r, c, state.player)
+            from model.game_state import GameState
+            yield {'type': 'result', 'state': GameState(new_board, -state.player), 'score': score}
+            return
+
     score, best_move_coords = yield from classical_backtracking_generator(
-        state, float('-inf'), float('inf'), state.player
+        state, float('-inf'), float('inf'), Board.BLACK, table
     )
 
     best_state = None
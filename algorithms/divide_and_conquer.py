@@ -1,5 +1,10 @@
+import time
+from heapq import merge
 from model.board import Board
+from model.bitboard import get_bitboard_tables, get_flips_mask, get_moves_mask, popcount
+from model.snapshot import Snapshot
 from model.game_state import GameState
+from algorithms.stats import SearchStats
 
 def classifier(board, moves):
     A = [] 
@@ -53,12 +58,78 @@ def quaddom(board, player, r0, c0, size):
 
     return q1 + q2 + q3 + q4
 
+# size -> tuple of leaf-block bitmasks, built once per board size
+_LEAF_BLOCKS = {}
+
+def get_leaf_blocks(size):
+    """
+    Bitmasks (square r*size+c, as in BitBoard) of the leaf blocks quaddom
+    ends up counting on a size x size board. The recursion only depends on
+    the size, so quaddom(board, player, 0, 0, size) equals the number of
+    blocks in which 'player' has more discs than the opponent.
+    """
+    blocks = _LEAF_BLOCKS.get(size)
+    if blocks is None:
+        found = []
+
+        def split(r0, c0, n):
+            if n <= 2:
+                mask = 0
+                for r in range(r0, min(r0 + n, size)):
+                    for c in range(c0, min(c0 + n, size)):
+                        mask |= 1 << (r * size + c)
+                if mask:
+                    found.append(mask)
+                return
+            half = n // 2
+            split(r0, c0, half)
+            split(r0, c0 + half, half)
+            split(r0 + half, c0, half)
+            split(r0 + half, c0 + half, half)
+
+        split(0, 0, size)
+        blocks = _LEAF_BLOCKS[size] = tuple(found)
+    return blocks
+
+def board_masks(board, player):
+    """ (own, opp) bitmasks of 'board' from the point of view of 'player'. """
+    own = opp = 0
+    bit = 1
+    for row in board.grid:
+        for v in row:
+            if v == player:
+                own |= bit
+            elif v == -player:
+                opp |= bit
+            bit <<= 1
+    return own, opp
+
+def quaddom_masks(own, opp, blocks):
+    """ quaddom on bitmasks: one popcount pair per leaf block. """
+    won = 0
+    for mask in blocks:
+        if popcount(own & mask) > popcount(opp & mask):
+            won += 1
+    return won
+
+def evalmove_masks(own, opp, sq, blocks, tables):
+    """ Score of playing square 'sq', without building the resulting board. """
+    flips = get_flips_mask(own, opp, sq, tables)
+    return quaddom_masks(own | flips | tables.bits[sq], opp & ~flips, blocks)
+
 def evalmove(board, move, player):
-    newboard,_ = board.apply_move(move[0], move[1], player)
-    size = len(newboard.grid)
-    res = quaddom(newboard, player, 0, 0, size)
-    score = res
-    return score
+    size = len(board.grid)
+    tables = get_bitboard_tables(size)
+    own, opp = board_masks(board, player)
+    return evalmove_masks(own, opp, tables.index[move[0]][move[1]], get_leaf_blocks(size), tables)
+
+def _snapshot_after(own, opp, sq, tables, player):
+    """ Snapshot of the position after 'player' plays 'sq', opponent to move. """
+    flips = get_flips_mask(own, opp, sq, tables)
+    own |= flips | tables.bits[sq]
+    opp &= ~flips
+    black, white = (own, opp) if player == Board.BLACK else (opp, own)
+    return Snapshot.from_masks(black, white, tables.size, -player)
 
 def choosebestmove(board, player):
 
@@ -76,19 +147,27 @@ def choosebestmove(board, player):
     else:
         bucket = D
 
+    size = len(board.grid)
+    tables = get_bitboard_tables(size)
+    blocks = get_leaf_blocks(size)
+    own, opp = board_masks(board, player)
+
     bestm = None
     bests = -1
     for move in bucket:
-        score = evalmove(board, move, player)
+        score = evalmove_masks(own, opp, tables.index[move[0]][move[1]], blocks, tables)
         if score > bests:
             bests = score
             bestm = move
     return bestm
 
-def choosebestmovevisual(board, player):
+def choosebestmovevisual(board, player, stats=None):
     moves = board.get_valid_moves(player)
     if not moves:
         return
+    if stats is None:
+        stats = SearchStats()
+    stats.begin_iteration(1)
 
     A,B,C,D = classifier(board, moves)
     if A:
@@ -102,16 +181,21 @@ def choosebestmovevisual(board, player):
     bestmove = None
     bestscore = -1
 
+    size = len(board.grid)
+    tables = get_bitboard_tables(size)
+    blocks = get_leaf_blocks(size)
+    own, opp = board_masks(board, player)
 
     for move in bucket:
+        sq = tables.index[move[0]][move[1]]
 
-        newboard,_ = board.apply_move(move[0], move[1], player)
-
-        viewstate = GameState(newboard, -player)
+        viewstate = _snapshot_after(own, opp, sq, tables, player)
 
+        stats.node(0)
         yield {'type':'search_node','state':viewstate}
 
-        score = evalmove(board, move, player)
+        score = evalmove_masks(own, opp, sq, blocks, tables)
+        stats.leaves += 1
 
         if score > bestscore:
             bestscore = score
@@ -120,4 +204,208 @@ def choosebestmovevisual(board, player):
 
     newboard,_ = board.apply_move(bestmove[0], bestmove[1], player)
     resultstate = GameState(newboard, -player)
-    yield {'type':'result','state':resultstate}
+    stats.end_iteration()
+    yield {'type':'result','state':resultstate,'stats':stats}
+
+
+# ── Anytime multi-level D&C ───────────────────────────────────────────────────
+#
+# The board is split into four regions (quadrants). At every node each region
+# orders its own candidate moves - classifier bucket first, then how many of
+# the region's leaf blocks the move wins - independently of the other regions.
+# The per-region lists are merged into one order, the best 'beam' moves are
+# searched, and the leaves are scored with quaddom for both sides. Iterative
+# deepening keeps the best move of the last finished depth, so the search can
+# stop whenever the time budget runs out. The budget counts only time spent
+# inside the generator: the GUI advances it a slice per frame (and pondering
+# shares its slices between several searches), so wall-clock time would make
+# the depth reached depend on the frame rate.
+
+DEFAULT_BUDGET = 1.0    # seconds of search per move
+DEFAULT_BEAM = 6        # moves searched per node after the merge
+WIN_SCORE = 1000        # game over, scaled by the disc difference
+# Leaf weight of a disc per classifier bucket: corners, edges, inner, next to a corner
+RANK_WEIGHTS = (8, 1, 0, -4)
+
+# size -> RegionTables
+_REGIONS = {}
+
+
+class RegionTables:
+    """
+    Per-size tables of the multi-level engine.
+        regions: (region mask, leaf blocks inside it) for the four quadrants
+        rank:    square -> classifier bucket (0 corners, 1 edges, 2 inner, 3 next to a corner)
+        blocks:  all leaf blocks (get_leaf_blocks)
+    """
+
+    def __init__(self, size):
+        tables = get_bitboard_tables(size)
+        self.blocks = get_leaf_blocks(size)
+        half = size // 2
+        self.regions = []
+        for rows, cols in (((0, half), (0, half)), ((0, half), (half, size)),
+                           ((half, size), (0, half)), ((half, size), (half, size))):
+            mask = 0
+            for r in range(*rows):
+                for c in range(*cols):
+                    mask |= tables.bits[tables.index[r][c]]
+            if mask:
+                self.regions.append((mask, tuple(b for b in self.blocks if b & mask)))
+
+        squares = [(r, c) for r in range(size) for c in range(size)]
+        self.rank = [0] * (size * size)
+        self.weighted = []
+        for rank, bucket in enumerate(classifier(Board(size=size), squares)):
+            mask = 0
+            for r, c in bucket:
+                self.rank[tables.index[r][c]] = rank
+                mask |= tables.bits[tables.index[r][c]]
+            if mask and RANK_WEIGHTS[rank]:
+                self.weighted.append((mask, RANK_WEIGHTS[rank]))
+
+
+def get_region_tables(size):
+    regions = _REGIONS.get(size)
+    if regions is None:
+        regions = _REGIONS[size] = RegionTables(size)
+    return regions
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+def order_region(own, opp, moves, blocks, rank, tables):
+    """
+    Local move order of one region: (rank, -blocks won after the move, square)
+    keys, best first. Only the region's own leaf blocks are counted.
+    """
+    keyed = []
+    bits = tables.bits
+    while moves:
+        b = moves & -moves
+        moves ^= b
+        sq = b.bit_length() - 1
+        flips = get_flips_mask(own, opp, sq, tables)
+        keyed.append((rank[sq], -quaddom_masks(own | flips | bits[sq], opp & ~flips, blocks), sq))
+    keyed.sort()
+    return keyed
+
+def ordered_moves(own, opp, moves_mask, regions, tables):
+    """ Merges the independent per-region orders into one list of squares. """
+    lists = [order_region(own, opp, moves_mask & mask, blocks, regions.rank, tables)
+             for mask, blocks in regions.regions if moves_mask & mask]
+    return [sq for _, _, sq in merge(*lists)]
+
+def leaf_score(own, opp, regions):
+    """ Blocks won minus blocks lost, plus the classifier bucket weights. """
+    score = quaddom_masks(own, opp, regions.blocks) - quaddom_masks(opp, own, regions.blocks)
+    for mask, weight in regions.weighted:
+        score += weight * (popcount(own & mask) - popcount(opp & mask))
+    return score
+
+def _search_time(ctx):
+    """ Seconds spent searching so far, without the time the generator was suspended. """
+    return ctx['spent'] + time.perf_counter() - ctx['resumed']
+
+def lookahead(own, opp, depth, alpha, beta, ctx):
+    """
+    Negamax alpha-beta on bitmasks over the merged, beam-limited move order.
+    Returns the score for the side owning 'own'.
+    """
+    stats = ctx['stats']
+    stats.node(depth)
+    if ctx['budget'] is not None and stats.nodes & 255 == 0 and _search_time(ctx) > ctx['budget']:
+        raise _OutOfBudget()
+
+    tables = ctx['tables']
+    if depth == 0:
+        stats.leaves += 1
+        return leaf_score(own, opp, ctx['regions'])
+
+    moves_mask = get_moves_mask(own, opp, tables)
+    if not moves_mask:
+        if not get_moves_mask(opp, own, tables):
+            stats.leaves += 1
+            return (popcount(own) - popcount(opp)) * WIN_SCORE
+        return -lookahead(opp, own, depth - 1, -beta, -alpha, ctx)
+
+    best = float('-inf')
+    moves = ordered_moves(own, opp, moves_mask, ctx['regions'], tables)[:ctx['beam']]
+    for index, sq in enumerate(moves):
+        flips = get_flips_mask(own, opp, sq, tables)
+        score = -lookahead(opp & ~flips, own | flips | tables.bits[sq], depth - 1, -beta, -alpha, ctx)
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            stats.cutoff(depth, index)
+            break
+    return best
+
+def get_dnc_lookahead_generator(state, budget=DEFAULT_BUDGET, max_depth=None, beam=DEFAULT_BEAM, stats=None):
+    """
+    Anytime multi-level D&C engine (UI generator protocol).
+    Deepens one ply at a time until 'budget' seconds of search are spent or
+    'max_depth' is reached; more budget means a deeper lookahead. Only time
+    inside the generator counts, not the time between next() calls. The
+    first depth always completes, so there is a move even with a budget of 0.
+    """
+    board = state.board
+    player = state.player
+    if stats is None:
+        stats = SearchStats()
+    size = len(board.grid)
+    tables = get_bitboard_tables(size)
+    regions = get_region_tables(size)
+    own, opp = board_masks(board, player)
+
+    moves_mask = get_moves_mask(own, opp, tables)
+    if not moves_mask:
+        return
+    root_moves = ordered_moves(own, opp, moves_mask, regions, tables)
+    # Deeper than the number of empty squares only repeats the same search
+    limit = size * size - popcount(own | opp)
+    if max_depth is not None:
+        limit = min(limit, max_depth)
+    # 'spent' adds up the search time before the last yield, 'resumed' is when the caller resumed us
+    ctx = {'tables': tables, 'regions': regions, 'beam': beam, 'stats': stats, 'budget': None,
+           'spent': 0.0, 'resumed': time.perf_counter()}
+
+    best_sq, best_score = root_moves[0], None
+    for depth in range(1, limit + 1):
+        stats.begin_iteration(depth)
+        alpha = float('-inf')
+        iter_best = None
+        try:
+            for sq in root_moves:
+                snapshot = _snapshot_after(own, opp, sq, tables, player)
+                ctx['spent'] = _search_time(ctx)
+                yield {'type': 'search_node', 'state': snapshot, 'depth': depth}
+                ctx['resumed'] = time.perf_counter()
+                flips = get_flips_mask(own, opp, sq, tables)
+                score = -lookahead(opp & ~flips, own | flips | tables.bits[sq], depth - 1,
+                                   float('-inf'), -alpha, ctx)
+                ctx['spent'] = _search_time(ctx)
+                yield {'type': 'leaf', 'state': snapshot, 'depth': depth, 'score': score}
+                ctx['resumed'] = time.perf_counter()
+                if score > alpha:
+                    alpha = score
+                    iter_best = sq
+        except _OutOfBudget:
+            stats.end_iteration()
+            break
+        stats.end_iteration()
+        best_sq, best_score = iter_best, alpha
+        # Search the best move first on the next, deeper pass
+        root_moves.remove(best_sq)
+        root_moves.insert(0, best_sq)
+        ctx['budget'] = budget
+        if _search_time(ctx) > budget:
+            break
+
+    r, c = tables.coords[best_sq]
+    newboard, _ = board.apply_move(r, c, player)
+    yield {'type': 'result', 'state': GameState(newboard, -player), 'score': best_score, 'stats': stats}
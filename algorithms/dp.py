@@ -1,12 +1,20 @@
 from algorithms.heuristics import weighted_heuristic
+from algorithms.stats import SearchStats
 from model.board import Board
+from model.snapshot import Snapshot
 
 # Transposition Table Constants
 FLAG_EXACT = 0
 FLAG_LOWERBOUND = 1
 FLAG_UPPERBOUND = 2
 
-def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo):
+# Builds the per-move memo table (profiling swaps in a timed dict)
+MEMO_FACTORY = dict
+
+def memo_key(state):
+    return (tuple(tuple(row) for row in state.board.grid), state.player)
+
+def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo, stats):
     """
     Minimax generator with Alpha-Beta pruning and Memoization (Dynamic Programming).
     
@@ -18,22 +26,22 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
     """
     
     # 1. Create a hashable key for the state
-    # We need board configuration, player, and depth to uniquely identify the subproblem.
-    # Note: Depth is included because a search at depth 1 is different from depth 3.
-    # However, if we have a stored result for depth D, it is valid for any search with depth <= D.
-    # For simplicity here, we use exact depth as part of the key.
-    
-    grid_tuple = tuple(tuple(row) for row in state.board.grid)
-    # Remove depth → better memo reuse
-    state_key = (grid_tuple, state.player)
+    # We need board configuration and player to identify the subproblem.
+    # Depth is stored with the entry instead of being part of the key:
+    # a result searched to depth D is valid for any search with depth <= D,
+    # which is what lets a memo kept between moves (pondering) be reused.
+    state_key = memo_key(state)
 
     # 2. Check Transposition Table (Memoization)
+    stats.tt_probes += 1
     if state_key in memo:
-        stored_val, flag = memo[state_key]
+        stored_val, flag, stored_depth = memo[state_key]
         
-        # Check if the stored value is useful for the current alpha-beta window
+        # Check if the stored value is deep enough and useful for the current alpha-beta window
         hit = False
-        if flag == FLAG_EXACT:
+        if stored_depth < depth:
+            pass
+        elif flag == FLAG_EXACT:
             hit = True
         elif flag == FLAG_LOWERBOUND and stored_val >= beta:
             hit = True
@@ -41,12 +49,14 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
             hit = True
              
         if hit:
+            stats.tt_hits += 1
             # Visualize the DP Hit!
-            yield {'type': 'dp_hit', 'state': state, 'score': stored_val, 'depth': depth}
+            yield {'type': 'dp_hit', 'state': Snapshot.from_state(state), 'score': stored_val, 'depth': depth}
             return stored_val, None
 
     # Visualization: Exploring this node
-    yield {'type': 'search_node', 'state': state, 'depth': depth, 'alpha': alpha, 'beta': beta}
+    stats.node(depth)
+    yield {'type': 'search_node', 'state': Snapshot.from_state(state), 'depth': depth, 'alpha': alpha, 'beta': beta}
 
     # 3. Base Case
     if depth == 0 or state.is_terminal():
@@ -54,9 +64,11 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
         
         # Store exact value in memo
         # Base cases are always exact
-        memo[state_key] = (score, FLAG_EXACT)
+        memo[state_key] = (score, FLAG_EXACT, depth)
+        stats.tt_stores += 1
+        stats.leaves += 1
         
-        yield {'type': 'leaf', 'state': state, 'depth': depth, 'score': score}
+        yield {'type': 'leaf', 'state': Snapshot.from_state(state), 'depth': depth, 'score': score}
         return score, None
 
     successors = state.get_successors()
@@ -67,7 +79,7 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
     
     # If no moves (Pass)
     if not successors:
-        val, _ = yield from dp_minimax_generator(state, depth-1, player, heuristic_func, alpha, beta, memo)
+        val, _ = yield from dp_minimax_generator(state, depth-1, player, heuristic_func, alpha, beta, memo, stats)
         return val, None
 
     best_op = None
@@ -77,8 +89,8 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
     if state.player == player: 
         # Maximizing Player
         max_eval = float('-inf')
-        for successor in successors:
-            eval_score, _ = yield from dp_minimax_generator(successor, depth - 1, player, heuristic_func, alpha, beta, memo)
+        for index, successor in enumerate(successors):
+            eval_score, _ = yield from dp_minimax_generator(successor, depth - 1, player, heuristic_func, alpha, beta, memo, stats)
             
             if eval_score > max_eval:
                 max_eval = eval_score
@@ -86,6 +98,7 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
             
             alpha = max(alpha, eval_score)
             if beta <= alpha:
+                stats.cutoff(depth, index)
                 break # Beta Prune
 
         # 5. Store in Transposition Table
@@ -95,15 +108,16 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
         elif max_eval >= beta:
             flag = FLAG_LOWERBOUND
             
-        memo[state_key] = (max_eval, flag)
+        memo[state_key] = (max_eval, flag, depth)
+        stats.tt_stores += 1
         
         return max_eval, best_op
 
     else: 
         # Minimizing Player
         min_eval = float('inf')
-        for successor in successors:
-            eval_score, _ = yield from dp_minimax_generator(successor, depth - 1, player, heuristic_func, alpha, beta, memo)
+        for index, successor in enumerate(successors):
+            eval_score, _ = yield from dp_minimax_generator(successor, depth - 1, player, heuristic_func, alpha, beta, memo, stats)
             
             if eval_score < min_eval:
                 min_eval = eval_score
@@ -111,6 +125,7 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
                 
             beta = min(beta, eval_score)
             if beta <= alpha:
+                stats.cutoff(depth, index)
                 break # Alpha Prune
         
         # 5. Store in Transposition Table
@@ -120,22 +135,36 @@ def dp_minimax_generator(state, depth, player, heuristic_func, alpha, beta, memo
         elif min_eval >= beta:
             flag = FLAG_LOWERBOUND
             
-        memo[state_key] = (min_eval, flag)
+        memo[state_key] = (min_eval, flag, depth)
+        stats.tt_stores += 1
 
         return min_eval, best_op
 
-def get_dp_move_generator(state, depth=3):
+def get_dp_move_generator(state, depth=3, heuristic_func=weighted_heuristic, stats=None, memo=None):
     """
     Entry point for the DP-enhanced Minimax generator.
     Initializes the memoization table (transposition table).
+    heuristic_func can be any (board, player) evaluator, e.g. pattern_heuristic.
+    stats (SearchStats) is filled in during the search and returned in the result event.
+    memo: transposition table to keep between searches (see algorithms/ponder.py).
+    Values are scored for the side to move at the root, so a shared memo must
+    only be used for one player and one heuristic.
     """
-    # The memoization table persists only for one full move calculation 
-    # (or could be shared across moves if we implemented iterative deepening)
-    memo = {} 
+    if stats is None:
+        stats = SearchStats()
+    if memo is None:
+        # The memoization table persists only for one full move calculation
+        memo = MEMO_FACTORY()
+    else:
+        # A stored root value has no move to play: the root is always searched
+        memo.pop(memo_key(state), None)
     
+    stats.begin_iteration(depth)
     score, best_state = yield from dp_minimax_generator(
-        state, depth, state.player, weighted_heuristic, 
-        float('-inf'), float('inf'), memo
+        state, depth, state.player, heuristic_func, 
+        float('-inf'), float('inf'), memo, stats
     )
+    stats.end_iteration()
+    stats.tt_size = len(memo)
     
-    yield {'type': 'result', 'state': best_state, 'score': score}
+    yield {'type': 'result', 'state': best_state, 'score': score, 'stats': stats}
@@ -0,0 +1,97 @@
+"""
+Engine registry for the headless tools (tournament, benchmarks).
+
+Every engine follows the UI generator protocol: make(state, depth, stats) yields
+visualization events and finishes with {'type': 'result', 'state': next_state,
+'stats': SearchStats}. Visualization events carry an immutable Snapshot of
+the position as 'state', so they can be buffered safely.
+The wrappers below also take care of the details the GUI handles by hand:
+in-place engines get their own copy of the board, and a side with no legal
+move simply passes.
+"""
+from model.board import Board
+from model.game_state import GameState
+from algorithms.greedy import get_greedy_move_generator
+from algorithms.divide_and_conquer import choosebestmovevisual as dnc_visual
+from algorithms.divide_and_conquer import get_dnc_lookahead_generator
+from algorithms.dp import get_dp_move_generator
+from algorithms.backtracking import get_backtracking_move_generator
+from algorithms.backtracknoheuristic import choosebestmovevisual as bt_noheur_visual
+from algorithms.backtracknoheuristic import choosebestmovevisual_memo as bt_memo_visual
+from algorithms.graph import get_best_move_generator
+from algorithms.stats import SearchStats
+from algorithms import profiling
+
+
+def _copy_state(state):
+    board = Board(state.board.grid, size=state.board.SIZE)
+    return GameState(board=board, player=state.player)
+
+def _pass_or_none(state):
+    """ Result for a side that has no legal move: a pass, or None at game over. """
+    if state.board.get_valid_moves(-state.player):
+        return GameState(state.board, -state.player)
+    return None
+
+def _greedy(state, depth, stats):
+    return get_greedy_move_generator(state, stats=stats)
+
+def _dnc(state, depth, stats):
+    return dnc_visual(state.board, state.player, stats=stats)
+
+def _dnc_deep(state, depth, stats):
+    return get_dnc_lookahead_generator(state, max_depth=depth, stats=stats)
+
+def _dp(state, depth, stats):
+    return get_dp_move_generator(state, depth=depth, stats=stats)
+
+def _bt(state, depth, stats):
+    return get_backtracking_move_generator(_copy_state(state), depth=depth, stats=stats)
+
+def _bt_noheur(state, depth, stats):
+    return bt_noheur_visual(state.board, state.player, depth, stats=stats)
+
+def _bt_memo(state, depth, stats):
+    return bt_memo_visual(state.board, state.player, depth, stats=stats)
+
+def _alphabeta(state, depth, stats):
+    return get_best_move_generator(state, depth=depth, stats=stats)
+
+
+# name -> (label, generator factory, uses depth)
+ENGINES = {
+    'greedy':    ("Greedy",           _greedy,     False),
+    'dnc':       ("Divide & Conquer", _dnc,        False),
+    'dnc_deep':  ("D&C Lookahead",    _dnc_deep,   True),
+    'dp':        ("DP",               _dp,         True),
+    'bt':        ("Backtracking",     _bt,         True),
+    'bt_noheur': ("BT (No Heur)",     _bt_noheur,  True),
+    'bt_memo':   ("BT (No Heur, TT)", _bt_memo,    True),
+    'alphabeta': ("Alpha-Beta",       _alphabeta,  True),
+}
+
+
+def get_move_generator(name, state, depth=3, stats=None):
+    """
+    Returns the generator of engine 'name' for 'state'.
+    'stats' (a SearchStats, created if omitted) is filled in and returned in the result.
+    Positions without a legal move yield only the pass (or None) result.
+    """
+    if stats is None:
+        stats = SearchStats()
+    if not state.board.get_valid_moves(state.player):
+        return iter([{'type': 'result', 'state': _pass_or_none(state), 'stats': stats}])
+    gen = ENGINES[name][1](state, depth, stats)
+    if profiling.ENABLED:
+        gen = profiling.profile_generator(gen, name)
+    return gen
+
+def play_move(name, state, depth=3, stats=None):
+    """
+    Runs engine 'name' to completion and returns its final 'result' event.
+    """
+    result = None
+    for evt in get_move_generator(name, state, depth, stats):
+        if evt['type'] == 'result':
+            result = evt
+    return result
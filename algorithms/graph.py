@@ -1,11 +1,21 @@
+import os
+import time
+import shutil
+import tempfile
 from collections import deque
-from algorithms.heuristics import weighted_heuristic
+from algorithms.heuristics import weighted_heuristic, get_cell_weight
+from algorithms.stats import SearchStats
+from model.snapshot import Snapshot
+from model.bitboard import get_bitboard_tables, get_moves_mask, get_flips_mask
+from model.position_keys import (encode_key, decode_key, key_from_state, key_width,
+                                 write_key_file, merge_key_files, KeyFile)
 
 def bfs_explore(start_state, max_nodes=1000):
     """
     Breadth-First Search traversal generator.
     Explores the game graph layer by layer.
     Useful for analyzing immediate move possibilities.
+    Keeps every GameState it has seen; for deep runs use bfs_layers.
     """
     queue = deque([start_state])
     visited = set()
@@ -23,6 +33,104 @@ def bfs_explore(start_state, max_nodes=1000):
                     visited.add(successor)
                     queue.append(successor)
 
+def successor_keys(key, size, tables):
+    """
+    Keys of the positions one ply after 'key' (bitboard move generation, no
+    Board objects). A side without a move passes; a finished game has none.
+    """
+    black, white, player = decode_key(key, size)
+    own, opp = (black, white) if player == 1 else (white, black)
+    moves = get_moves_mask(own, opp, tables)
+    if not moves:
+        if get_moves_mask(opp, own, tables):
+            return [encode_key(black, white, -player, size)]
+        return []
+
+    out = []
+    bits = tables.bits
+    while moves:
+        low = moves & -moves
+        moves ^= low
+        flips = get_flips_mask(own, opp, low.bit_length() - 1, tables)
+        new_own, new_opp = own | flips | low, opp & ~flips
+        if player == 1:
+            out.append(encode_key(new_own, new_opp, -player, size))
+        else:
+            out.append(encode_key(new_opp, new_own, -player, size))
+    return out
+
+def bfs_layers(start_state, max_depth, max_keys_in_memory=1_000_000, spill_dir=None):
+    """
+    Layered BFS over compact position keys (see model.position_keys).
+    Only one ply is held at a time: the next ply is deduplicated in a set of
+    ints, and when that set outgrows 'max_keys_in_memory' it is sorted and
+    spilled to a run file; the runs are merged into one sorted, memory-mapped
+    key file that becomes the next frontier. The previous ply is freed.
+
+    Yields one dict per ply, 0 to max_depth:
+        ply, unique (distinct positions reachable in exactly 'ply' plies,
+        a pass counting as a ply), runs (files spilled for this ply), seconds,
+        keys (ascending iterable of the ply's keys, valid until the next step)
+    """
+    size = start_state.board.SIZE
+    tables = get_bitboard_tables(size)
+    width = key_width(size)
+    own_dir = spill_dir is None
+    workdir = None
+
+    def spill_path(name):
+        nonlocal workdir
+        if workdir is None:
+            workdir = tempfile.mkdtemp(prefix='othello_bfs_') if own_dir else spill_dir
+            os.makedirs(workdir, exist_ok=True)
+        return os.path.join(workdir, name)
+
+    frontier = [key_from_state(start_state)]
+    frontier_file = None
+    t0 = time.perf_counter()
+    try:
+        for ply in range(max_depth + 1):
+            yield {'ply': ply, 'unique': len(frontier), 'runs': 0 if ply == 0 else runs,
+                   'seconds': time.perf_counter() - t0, 'keys': frontier}
+            if ply == max_depth:
+                break
+
+            t0 = time.perf_counter()
+            seen = set()
+            run_paths = []
+            for key in frontier:
+                seen.update(successor_keys(key, size, tables))
+                if len(seen) > max_keys_in_memory:
+                    path = spill_path(f"ply{ply + 1:03d}_run{len(run_paths):04d}.keys")
+                    write_key_file(path, sorted(seen), width)
+                    run_paths.append(path)
+                    seen = set()
+            runs = len(run_paths)
+
+            if frontier_file is not None:
+                frontier_file.close()
+                os.remove(frontier_file.path)
+                frontier_file = None
+            if run_paths:
+                path = spill_path(f"ply{ply + 1:03d}_run{len(run_paths):04d}.keys")
+                write_key_file(path, sorted(seen), width)
+                run_paths.append(path)
+                seen = None
+                merged = spill_path(f"ply{ply + 1:03d}.keys")
+                merge_key_files(run_paths, merged, width)
+                for path in run_paths:
+                    os.remove(path)
+                frontier_file = KeyFile(merged, width)
+                frontier = frontier_file
+            else:
+                frontier = sorted(seen)
+    finally:
+        if frontier_file is not None:
+            frontier_file.close()
+            os.remove(frontier_file.path)
+        if own_dir and workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
 def dfs_explore(start_state, max_depth=3):
     """
     Depth-First Search traversal generator.
@@ -72,45 +180,45 @@ def merge(left, right, key, reverse):
     result.extend(right[j:])
     return result
 
-def alpha_beta_generator(state, depth, alpha, beta, player, heuristic_func):
+def order_moves(moves, size):
+    """
+    Move ordering for GameState.iter_successors (Manual Merge Sort).
+    Works on the (r, c) moves themselves, so no child board has to be built
+    to sort them: the strongest squares for the side to move (corners, safe
+    edges) are searched first for better pruning.
+    """
+    return merge_sort(moves, key=lambda m: get_cell_weight(m[0], m[1], size), reverse=True)
+
+def alpha_beta_generator(state, depth, alpha, beta, player, heuristic_func, stats):
     """
     Generator version of Minimax with Alpha-Beta Pruning.
     Yields:
         {'type': 'search_node', ...} for visiting
         {'type': 'leaf', ...} for evaluation
-        {'type': 'prune', ...} for cutoff events
+        {'type': 'prune', ...} for cutoff events ('move' is the refuting move)
     """
     # Yield current state visiting
-    yield {'type': 'search_node', 'state': state, 'depth': depth, 'score': None, 'alpha': alpha, 'beta': beta}
+    stats.node(depth)
+    yield {'type': 'search_node', 'state': Snapshot.from_state(state), 'depth': depth, 'score': None, 'alpha': alpha, 'beta': beta}
 
     if depth == 0 or state.is_terminal():
         score = heuristic_func(state.board, player)
-        yield {'type': 'leaf', 'state': state, 'depth': depth, 'score': score}
+        stats.leaves += 1
+        yield {'type': 'leaf', 'state': Snapshot.from_state(state), 'depth': depth, 'score': score}
         return score, state
 
-    successors = state.get_successors()
-    if not successors:
-        # Pass turn
-        # Recurse with same alpha/beta
-        val = yield from alpha_beta_generator(state, depth-1, alpha, beta, player, heuristic_func)
-        return val
+    # Children are built lazily: a cutoff stops the iterator, so the boards
+    # of the remaining moves are never copied. A non-terminal state with no
+    # moves yields a single pass successor.
+    size = state.board.SIZE
+    successors = state.iter_successors(lambda moves: order_moves(moves, size))
 
     best_op = None
 
-    # --- Move Ordering (Manual Merge Sort) ---
-    # Sort successors to explore best moves first for better pruning.
-    if state.player == player: # Maximizer
-        # Sort by heuristic value appearing BEST for 'player' -> Descending
-        successors = merge_sort(successors, key=lambda s: heuristic_func(s.board, player), reverse=True)
-    else: # Minimizer
-        # Sort by heuristic value appearing WORST for 'player' (Best for opponent) -> Ascending
-        successors = merge_sort(successors, key=lambda s: heuristic_func(s.board, player), reverse=False)
-    # -----------------------------------------
-
     if state.player == player: # Maximizer
         value = float('-inf')
-        for successor in successors:
-            score, _ = yield from alpha_beta_generator(successor, depth - 1, alpha, beta, player, heuristic_func)
+        for index, (move, successor) in enumerate(successors):
+            score, _ = yield from alpha_beta_generator(successor, depth - 1, alpha, beta, player, heuristic_func, stats)
             
             if score > value:
                 value = score
@@ -119,14 +227,15 @@ def alpha_beta_generator(state, depth, alpha, beta, player, heuristic_func):
             alpha = max(alpha, value)
             if value >= beta:
                 # PRUNING
-                yield {'type': 'prune', 'state': successor, 'depth': depth, 'score': value}
+                stats.cutoff(depth, index)
+                yield {'type': 'prune', 'state': Snapshot.from_state(successor), 'depth': depth, 'score': value, 'move': move}
                 break # Beta Cutoff
         return value, best_op
     
     else: # Minimizer (Opponent)
         value = float('inf')
-        for successor in successors:
-            score, _ = yield from alpha_beta_generator(successor, depth - 1, alpha, beta, player, heuristic_func)
+        for index, (move, successor) in enumerate(successors):
+            score, _ = yield from alpha_beta_generator(successor, depth - 1, alpha, beta, player, heuristic_func, stats)
             
             if score < value:
                 value = score
@@ -135,29 +244,35 @@ def alpha_beta_generator(state, depth, alpha, beta, player, heuristic_func):
             beta = min(beta, value)
             if value <= alpha:
                  # PRUNING
-                yield {'type': 'prune', 'state': successor, 'depth': depth, 'score': value}
+                stats.cutoff(depth, index)
+                yield {'type': 'prune', 'state': Snapshot.from_state(successor), 'depth': depth, 'score': value, 'move': move}
                 break # Alpha Cutoff
         return value, best_op
 
-def get_best_move_generator(state, depth=3, scale_factor=1.0):
+def get_best_move_generator(state, depth=3, scale_factor=1.0, heuristic_func=weighted_heuristic, stats=None):
     """
     Generator wrapper.
+    heuristic_func can be any (board, player) evaluator, e.g. pattern_heuristic.
     Yields visualization data.
-    Finally yields {'type': 'result', 'state': best_state}
+    Finally yields {'type': 'result', 'state': best_state, 'stats': SearchStats}
     """
+    if stats is None:
+        stats = SearchStats()
     # Use yield from to capture the return value (best_score, best_op)
     # while propagating all visualization dicts up.
     # Start with full alpha-beta window [-inf, +inf]
-    best_score, best_op = yield from alpha_beta_generator(state, depth, float('-inf'), float('inf'), state.player, weighted_heuristic)
+    stats.begin_iteration(depth)
+    best_score, best_op = yield from alpha_beta_generator(state, depth, float('-inf'), float('inf'), state.player, heuristic_func, stats)
+    stats.end_iteration()
             
-    yield {'type': 'result', 'state': best_op, 'score': best_score}
+    yield {'type': 'result', 'state': best_op, 'score': best_score, 'stats': stats}
 
-def get_best_move(state, depth=3, scale_factor=1.0):
+def get_best_move(state, depth=3, scale_factor=1.0, heuristic_func=weighted_heuristic, stats=None):
     """
     Backward compatibility wrapper.
     Consumes the generator and returns the final result.
     """
-    gen = get_best_move_generator(state, depth)
+    gen = get_best_move_generator(state, depth, heuristic_func=heuristic_func, stats=stats)
     result_state = None
     for item in gen:
         if item['type'] == 'result':
@@ -1,4 +1,6 @@
 from model.game_state import GameState
+from algorithms.stats import SearchStats
+from model.snapshot import Snapshot
 
 def get_greedy_move(game_state):
     """
@@ -45,13 +47,20 @@ def get_greedy_move(game_state):
             
     return best_successor
 
-def get_greedy_move_generator(game_state):
+def get_greedy_move_generator(game_state, stats=None):
     """
     Generator wrapper for greedy to maintain interface parity with Minimax generators
     for visualization and benchmarking.
     """
-    yield {'type': 'search_node', 'state': game_state, 'depth': 1}
+    if stats is None:
+        stats = SearchStats()
+    stats.begin_iteration(1)
+    stats.node(1)
+    yield {'type': 'search_node', 'state': Snapshot.from_state(game_state), 'depth': 1}
     
     best_state = get_greedy_move(game_state)
+    # Every legal move is scored once by its flip count
+    stats.leaves += len(game_state.board.get_valid_moves(game_state.player))
+    stats.end_iteration()
     
-    yield {'type': 'result', 'state': best_state}
+    yield {'type': 'result', 'state': best_state, 'stats': stats}
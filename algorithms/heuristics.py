@@ -49,11 +49,12 @@ def weighted_heuristic(board, player):
     Dynamically handles different board sizes.
     """
     size = board.SIZE
+    grid = board.grid
     score = 0
     
     for r in range(size):
         for c in range(size):
-            cell = board.grid[r][c]
+            cell = grid[r][c]
             if cell == Board.EMPTY:
                 continue
                 
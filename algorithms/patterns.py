@@ -0,0 +1,277 @@
+"""
+Pattern (lookup-table) evaluation.
+
+Each corner is covered by two 2x4 patterns (one per edge leaving the corner):
+
+    A0 A1 A2 A3      A0 = corner, A1..A3 = edge cells moving away from it
+    B0 B1 B2 B3      B0..B3 = the same cells one line further in
+
+Every cell of a pattern is a base-3 digit (0 empty, 1 black, 2 white), so a
+pattern instance has an index in [0, 3^8). One shared table maps that index
+to a score for Black. Discs outside all patterns keep their static weight.
+Indices are kept up to date incrementally by PatternBoard.
+"""
+import os
+import sys
+import mmap
+import struct
+from array import array
+from model.board import Board
+from algorithms.heuristics import get_cell_weight
+
+
+PATTERN_LENGTH = 8
+TABLE_ENTRIES = 3 ** PATTERN_LENGTH
+
+# Binary file: header (magic, version, pattern length, entry count) + int16 LE table
+WEIGHTS_MAGIC = b'OTPT'
+WEIGHTS_VERSION = 1
+WEIGHTS_HEADER = struct.Struct('<4sHHI')
+WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'assets', 'patterns', 'corner_2x4.bin')
+
+# size -> PatternTables
+_TABLES = {}
+
+
+class PatternTables:
+    """
+    Per-size pattern layout.
+        instances: list of 8-cell tuples of (r, c), A0..A3 then B0..B3
+        cell_map:  [r][c] -> tuple of (instance, 3^position) for patterns covering it
+        rest_weight: [r][c] -> static weight if no pattern covers the cell, else 0
+    """
+
+    def __init__(self, size):
+        self.size = size
+        last = size - 1
+        self.instances = []
+
+        for cr, dr in ((0, 1), (last, -1)):
+            for cc, dc in ((0, 1), (last, -1)):
+                # Along the row from the corner, then along the column
+                self.instances.append(tuple([(cr, cc + k * dc) for k in range(4)] +
+                                            [(cr + dr, cc + k * dc) for k in range(4)]))
+                self.instances.append(tuple([(cr + k * dr, cc) for k in range(4)] +
+                                            [(cr + k * dr, cc + dc) for k in range(4)]))
+
+        cell_map = [[[] for _ in range(size)] for _ in range(size)]
+        for inst, cells in enumerate(self.instances):
+            for pos, (r, c) in enumerate(cells):
+                cell_map[r][c].append((inst, 3 ** pos))
+        self.cell_map = [[tuple(entry) for entry in row] for row in cell_map]
+
+        self.rest_weight = [[0 if self.cell_map[r][c] else get_cell_weight(r, c, size)
+                             for c in range(size)] for r in range(size)]
+
+
+def get_pattern_tables(size):
+    tables = _TABLES.get(size)
+    if tables is None:
+        tables = PatternTables(size)
+        _TABLES[size] = tables
+    return tables
+
+
+# --- Weight table construction ------------------------------------------------
+
+# Static weights of A0..A3, B0..B3 (same scale as get_cell_weight on 8x8)
+_STATIC = (100, -20, 10, 10, -20, -50, 1, 1)
+_STABLE_BONUS = 15
+
+def _side_value(cfg, s):
+    """
+    Value of one 2x4 configuration for side 's' (1 or -1).
+    Unlike the static weights, the X and C squares stop being a liability
+    once 's' owns the corner, and edge discs connected to an owned corner
+    (which can never be flipped) earn a stability bonus.
+    """
+    score = 0
+    for k in range(PATTERN_LENGTH):
+        if cfg[k] == s:
+            score += _STATIC[k]
+
+    if cfg[0] == s:
+        # Corner taken: adjacent squares are safe, refund their penalty
+        for k in (1, 4, 5):
+            if cfg[k] == s:
+                score -= _STATIC[k]
+                score += 10 if k != 5 else 1
+        # Edge run anchored on the corner is stable
+        for k in (1, 2, 3):
+            if cfg[k] != s:
+                break
+            score += _STABLE_BONUS
+    return score
+
+def build_pattern_weights():
+    """
+    Returns the Black-perspective weight table as an array('h') of 3^8 entries.
+    The table is antisymmetric (swapping colours negates the value), so the
+    White score is simply the negated Black score.
+    """
+    table = array('h', [0] * TABLE_ENTRIES)
+    cfg = [0] * PATTERN_LENGTH
+    for index in range(TABLE_ENTRIES):
+        n = index
+        for k in range(PATTERN_LENGTH):
+            digit = n % 3
+            cfg[k] = Board.BLACK if digit == 1 else Board.WHITE if digit == 2 else Board.EMPTY
+            n //= 3
+        value = _side_value(cfg, Board.BLACK) - _side_value(cfg, Board.WHITE)
+        table[index] = max(-32768, min(32767, value))
+    return table
+
+def save_pattern_weights(table, path=WEIGHTS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = array('h', table)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    with open(path, 'wb') as f:
+        f.write(WEIGHTS_HEADER.pack(WEIGHTS_MAGIC, WEIGHTS_VERSION, PATTERN_LENGTH, len(data)))
+        f.write(data.tobytes())
+
+def load_pattern_weights(path=WEIGHTS_PATH):
+    """
+    Memory-maps the weight file and returns an int16 view of the table.
+    Falls back to building the table in memory if the file is missing or invalid.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, length, count = WEIGHTS_HEADER.unpack_from(mm, 0)
+        if (magic != WEIGHTS_MAGIC or version != WEIGHTS_VERSION or length != PATTERN_LENGTH
+                or count != TABLE_ENTRIES or len(mm) < WEIGHTS_HEADER.size + 2 * count):
+            raise ValueError(f"unexpected header in {path}")
+        view = memoryview(mm)[WEIGHTS_HEADER.size:WEIGHTS_HEADER.size + 2 * count]
+        if sys.byteorder != 'little':
+            table = array('h', view.tobytes())
+            table.byteswap()
+            return table
+        return view.cast('h')
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Warning: Pattern weights unavailable ({e}), building them in memory")
+        return build_pattern_weights()
+
+# Loaded once at startup
+PATTERN_WEIGHTS = load_pattern_weights()
+
+
+# --- Evaluation ---------------------------------------------------------------
+
+def compute_pattern_state(grid, size):
+    """
+    Computes (pattern indices, rest score for Black) from scratch.
+    """
+    tables = get_pattern_tables(size)
+    indices = [0] * len(tables.instances)
+    for inst, cells in enumerate(tables.instances):
+        index = 0
+        p3 = 1
+        for r, c in cells:
+            index += (grid[r][c] % 3) * p3
+            p3 *= 3
+        indices[inst] = index
+
+    rest = 0
+    rest_weight = tables.rest_weight
+    for r in range(size):
+        row = grid[r]
+        for c in range(size):
+            if row[c]:
+                rest += row[c] * rest_weight[r][c]
+    return indices, rest
+
+def pattern_heuristic(board, player):
+    """
+    Pattern-table evaluation. Drop-in replacement for weighted_heuristic.
+    Uses the incrementally maintained indices of a PatternBoard, otherwise
+    computes them from the grid (works with any board backend).
+    """
+    indices = getattr(board, 'pattern_indices', None)
+    if indices is None:
+        indices, rest = compute_pattern_state(board.grid, board.SIZE)
+    else:
+        rest = board.rest_score
+
+    weights = PATTERN_WEIGHTS
+    score = rest
+    for index in indices:
+        score += weights[index]
+
+    if player == Board.WHITE:
+        score = -score
+    return score
+
+
+class PatternBoard(Board):
+    """
+    Board that keeps pattern indices up to date on every apply/undo,
+    so pattern_heuristic costs 8 table lookups instead of a board scan.
+    """
+
+    def __init__(self, grid=None, size=8):
+        super().__init__(grid, size)
+        self.pattern_tables = get_pattern_tables(self.SIZE)
+        self.pattern_indices, self.rest_score = compute_pattern_state(self.grid, self.SIZE)
+
+    def _touch(self, r, c, old, new):
+        """
+        Cell (r, c) changed from 'old' to 'new'.
+        Base-3 digits are value % 3, so each covering index moves by
+        ((new % 3) - (old % 3)) * 3^position.
+        """
+        entries = self.pattern_tables.cell_map[r][c]
+        if entries:
+            digit_delta = (new % 3) - (old % 3)
+            indices = self.pattern_indices
+            for inst, p3 in entries:
+                indices[inst] += digit_delta * p3
+        else:
+            self.rest_score += (new - old) * self.pattern_tables.rest_weight[r][c]
+
+    def apply_move(self, r, c, player):
+        new_board = PatternBoard.__new__(PatternBoard)
+        new_board.SIZE = self.SIZE
+        new_board.grid = [row[:] for row in self.grid]
+        new_board._undo_cells = None
+        new_board.pattern_tables = self.pattern_tables
+        new_board.pattern_indices = self.pattern_indices[:]
+        new_board.rest_score = self.rest_score
+        flipped = new_board.apply_move_in_place(r, c, player)
+        return new_board, flipped
+
+    def apply_move_in_place(self, r, c, player):
+        flipped = super().apply_move_in_place(r, c, player)
+        self._touch(r, c, self.EMPTY, player)
+        for fr, fc in flipped:
+            self._touch(fr, fc, -player, player)
+        return flipped
+
+    def undo_move(self, r, c, player, flipped_cells):
+        super().undo_move(r, c, player, flipped_cells)
+        self._touch(r, c, player, self.EMPTY)
+        for fr, fc in flipped_cells:
+            self._touch(fr, fc, player, -player)
+
+    def push_move(self, r, c, player):
+        n = super().push_move(r, c, player)
+        size = self.SIZE
+        cells = self._undo_cells
+        self._touch(r, c, self.EMPTY, player)
+        for i in range(self._undo_top - n, self._undo_top):
+            sq = cells[i]
+            self._touch(sq // size, sq % size, -player, player)
+        return n
+
+    def pop_move(self):
+        depth = self._undo_depth - 1
+        size = self.SIZE
+        cells = self._undo_cells
+        player = self._undo_players[depth]
+        sq = self._undo_moves[depth]
+        self._touch(sq // size, sq % size, player, self.EMPTY)
+        for i in range(self._undo_marks[depth], self._undo_top):
+            sq = cells[i]
+            self._touch(sq // size, sq % size, player, -player)
+        super().pop_move()
@@ -0,0 +1,84 @@
+"""
+Pondering: searching on the opponent's time.
+
+While the human is on move, a Ponderer runs the CPU's own search for the
+positions after the human's likely moves, most likely first, and keeps each
+finished result. When the human moves, take() stops the work in progress
+and hands back the precomputed reply for the position actually reached, if
+there is one. Searches that build on a persistent transposition table (the
+DP engine's 'memo') also leave it filled for the searches that follow, so
+even an unexpected move starts warm.
+
+The work runs as a generator advanced in time slices by step(), so the GUI
+stays single-threaded and cancelling is just closing the generator.
+"""
+import time
+from model.position_keys import key_from_state
+
+
+def likely_moves(state, heuristic_func):
+    """ Successors of 'state', best first for the side to move by 'heuristic_func'. """
+    successors = [child for _, child in state.iter_successors()]
+    successors.sort(key=lambda s: heuristic_func(s.board, state.player), reverse=True)
+    return successors
+
+
+class Ponderer:
+    """
+    Precomputes replies for the positions after the side to move in 'state'.
+        make_search(state): the engine generator (UI protocol) the CPU would run
+        heuristic_func:     ranks the opponent's moves (likely_moves)
+        max_replies:        how many of the likely moves to search (None: all)
+    """
+
+    def __init__(self, state, make_search, heuristic_func, max_replies=None):
+        self.root = state
+        self.make_search = make_search
+        self.heuristic_func = heuristic_func
+        self.max_replies = max_replies
+        self.replies = {}        # position key -> 'result' event
+        self.searching = None    # position key of the search in progress
+        self.events = 0
+        self.done = False
+        self._work = self._run()
+
+    def _run(self):
+        children = likely_moves(self.root, self.heuristic_func)
+        if self.max_replies is not None:
+            children = children[:self.max_replies]
+        for child in children:
+            if child.is_terminal():
+                continue
+            self.searching = key_from_state(child)
+            for evt in self.make_search(child):
+                if evt['type'] == 'result':
+                    self.replies[self.searching] = evt
+                yield evt
+        self.searching = None
+
+    def step(self, budget):
+        """ Runs for about 'budget' seconds; returns False once every reply is searched. """
+        if self.done:
+            return False
+        deadline = time.perf_counter() + budget
+        try:
+            while True:
+                next(self._work)
+                self.events += 1
+                if time.perf_counter() >= deadline:
+                    return True
+        except StopIteration:
+            self.done = True
+            return False
+
+    def take(self, state):
+        """ Stops pondering; the precomputed 'result' event for 'state', or None. """
+        self.cancel()
+        return self.replies.get(key_from_state(state))
+
+    def cancel(self):
+        if not self.done:
+            # Closing raises GeneratorExit inside the engine generator in progress
+            self._work.close()
+            self.done = True
+        self.searching = None
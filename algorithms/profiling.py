@@ -0,0 +1,219 @@
+"""
+Opt-in profiling of the engine hot paths.
+
+Enabled with the OTHELLO_PROFILE environment variable (checked when the
+algorithms package is first imported) or the --profile flag of
+main_pygame.py / main_terminal.py:
+
+    OTHELLO_PROFILE=1 python main_pygame.py          low-overhead timers
+    python main_terminal.py --profile=cprofile      full cProfile capture
+
+install() replaces the board methods (move generation, apply, undo), the
+heuristics and the DP memo table with timed versions, so it has to run
+before the engine modules are imported (their default heuristic_func is
+bound at import time). Each AI move then writes a report into profiles/.
+When profiling is off nothing is patched and nothing is wrapped.
+"""
+import os
+import sys
+import time
+import functools
+
+ENABLED = False
+MODE = None
+REPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profiles')
+
+# Report sections, in print order
+SECTIONS = ('move generation', 'apply', 'undo', 'evaluation', 'memo lookup', 'memo store')
+
+_BOARD_METHODS = {
+    'get_valid_moves': 'move generation',
+    'apply_move': 'apply',
+    'apply_move_in_place': 'apply',
+    'push_move': 'apply',
+    'undo_move': 'undo',
+    'pop_move': 'undo',
+}
+
+# section -> [calls, seconds]; reset at the start of every move
+_totals = {name: [0, 0.0] for name in SECTIONS}
+# True while inside a timed call, so nested calls (e.g. PatternBoard.push_move
+# calling Board.push_move) are only counted once, by the outermost wrapper
+_inside = [False]
+_move_number = [0]
+
+
+def _timed(section, func):
+    entry = _totals[section]
+    clock = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _inside[0]:
+            return func(*args, **kwargs)
+        _inside[0] = True
+        t0 = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            entry[0] += 1
+            entry[1] += clock() - t0
+            _inside[0] = False
+    return wrapper
+
+
+class TimedDict(dict):
+    """ DP memo table that times membership tests, reads and stores. """
+
+    def __contains__(self, key):
+        return _timed_memo(_totals['memo lookup'], dict.__contains__, self, key)
+
+    def __getitem__(self, key):
+        return _timed_memo(_totals['memo lookup'], dict.__getitem__, self, key)
+
+    def __setitem__(self, key, value):
+        t0 = time.perf_counter()
+        dict.__setitem__(self, key, value)
+        entry = _totals['memo store']
+        entry[0] += 1
+        entry[1] += time.perf_counter() - t0
+
+def _timed_memo(entry, func, table, key):
+    t0 = time.perf_counter()
+    try:
+        return func(table, key)
+    finally:
+        entry[0] += 1
+        entry[1] += time.perf_counter() - t0
+
+
+def parse_mode(value):
+    """ 'cprofile' selects cProfile capture, any other non-empty value the timers. """
+    if not value or value.lower() in ('0', 'off', 'false', 'no'):
+        return None
+    return 'cprofile' if value.lower() == 'cprofile' else 'timers'
+
+def install(mode='timers'):
+    """
+    Turns profiling on. In 'timers' mode the hot paths are patched;
+    in 'cprofile' mode every engine step runs under cProfile instead.
+    """
+    global ENABLED, MODE
+    if ENABLED:
+        return
+    ENABLED = True
+    MODE = mode
+
+    if mode != 'timers':
+        return
+
+    loaded = [m for m in ('algorithms.dp', 'algorithms.graph', 'algorithms.backtracking',
+                          'algorithms.engines', 'ui.pygame_gui') if m in sys.modules]
+    if loaded:
+        print(f"Warning: profiling installed after {', '.join(loaded)} was imported; "
+              "default heuristics of those modules are not timed")
+
+    from model.board import Board
+    from model.mailbox_board import MailboxBoard
+    from model.bitboard import BitBoard
+    from algorithms import heuristics, patterns, backtracknoheuristic, divide_and_conquer
+
+    for cls in (Board, MailboxBoard, BitBoard, patterns.PatternBoard):
+        for method, section in _BOARD_METHODS.items():
+            if method in cls.__dict__:
+                setattr(cls, method, _timed(section, cls.__dict__[method]))
+
+    heuristics.weighted_heuristic = _timed('evaluation', heuristics.weighted_heuristic)
+    patterns.pattern_heuristic = _timed('evaluation', patterns.pattern_heuristic)
+    backtracknoheuristic.scorer = _timed('evaluation', backtracknoheuristic.scorer)
+    divide_and_conquer.evalmove = _timed('evaluation', divide_and_conquer.evalmove)
+    divide_and_conquer.evalmove_masks = _timed('evaluation', divide_and_conquer.evalmove_masks)
+
+    from algorithms import dp
+    dp.MEMO_FACTORY = TimedDict
+
+def install_from_argv(argv):
+    """ Handles --profile / --profile=cprofile and removes it from argv. """
+    for arg in list(argv):
+        if arg == '--profile' or arg.startswith('--profile='):
+            argv.remove(arg)
+            install(parse_mode(arg.partition('=')[2] or 'timers') or 'timers')
+
+
+# --- Per-move capture ----------------------------------------------------------
+
+def profile_generator(gen, label):
+    """
+    Wraps an engine generator. Only the time spent inside its steps is
+    measured (not the frames the GUI draws in between); the report is
+    written when the 'result' event passes through.
+    """
+    for section in _totals.values():
+        section[0] = 0
+        section[1] = 0.0
+
+    profiler = None
+    if MODE == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+
+    elapsed = 0.0
+    reported = False
+    clock = time.perf_counter
+    while True:
+        t0 = clock()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            evt = next(gen)
+        except StopIteration:
+            evt = None
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            elapsed += clock() - t0
+
+        if not reported and (evt is None or evt['type'] == 'result'):
+            write_report(label, elapsed, evt, profiler)
+            reported = True
+        if evt is None:
+            return
+        yield evt
+
+def write_report(label, elapsed, result, profiler=None):
+    """ Writes profiles/move_NNNN_<label>.txt (and a .prof file in cProfile mode). """
+    _move_number[0] += 1
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    base = os.path.join(REPORT_DIR, f"move_{_move_number[0]:04d}_{label}")
+
+    lines = [f"Move {_move_number[0]}  engine={label}  mode={MODE}",
+             f"Search time: {elapsed * 1000:.2f} ms (engine steps only)"]
+    stats = result.get('stats') if result else None
+    if stats is not None:
+        lines.append(f"Nodes: {stats.nodes}  Leaves: {stats.leaves}  "
+                     f"TT hits: {stats.tt_hits}/{stats.tt_probes}")
+    lines.append("")
+
+    if profiler is None:
+        lines.append(f"{'Section':<18}{'Calls':>10}{'Total ms':>12}{'% move':>9}{'us/call':>10}")
+        accounted = 0.0
+        for name in SECTIONS:
+            calls, seconds = _totals[name]
+            accounted += seconds
+            lines.append(_report_row(name, calls, seconds, elapsed))
+        lines.append(_report_row('search logic', 0, max(elapsed - accounted, 0.0), elapsed))
+    else:
+        import io
+        import pstats
+        profiler.dump_stats(base + '.prof')
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(30)
+        lines.append(out.getvalue())
+
+    with open(base + '.txt', 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+def _report_row(name, calls, seconds, elapsed):
+    share = 100.0 * seconds / elapsed if elapsed > 0 else 0.0
+    per_call = f"{seconds * 1e6 / calls:>10.2f}" if calls else f"{'':>10}"
+    return f"{name:<18}{calls:>10}{seconds * 1000:>12.2f}{share:>8.1f}%{per_call}"
@@ -0,0 +1,204 @@
+"""
+Perfect-play tables for small boards, built by retrograde analysis.
+
+Positions are enumerated forward from a set of seeds (the start position by
+default) and grouped by their number of empty squares. A move always removes
+one empty square, so the groups are solved backwards, from the full board up
+to the seeds: a position's value only needs the values one group down. A
+pass keeps the discs and only swaps the side to move, so within a group the
+positions with a legal move are solved before those that must pass.
+
+Values are the final disc difference black - white under perfect play (the
+same score classical_backtracking uses). Positions are keyed by their
+canonical key (model.position_keys), since the 8 symmetric images of a
+position have the same value. A table is two files: a sorted key file read
+through mmap and a parallel array of signed bytes holding the values.
+"""
+import os
+import mmap
+from model.board import Board
+from model.bitboard import get_bitboard_tables, get_moves_mask, get_flips_mask, popcount
+from model.position_keys import (encode_key, decode_key, key_from_board, key_from_state,
+                                 key_width, canonical_key, write_key_file, KeyFile)
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tables')
+
+# (path prefix) -> SolvedTable, opened once
+_OPEN_TABLES = {}
+
+
+def table_path(size, name=None):
+    """ Path prefix (without .keys / .vals) of the table for 'size'. """
+    return os.path.join(TABLE_DIR, name or f"solved_{size}x{size}")
+
+
+def _children(key, size, tables):
+    """
+    (moves, pass child) of a position: canonical keys one empty square down,
+    and the canonical key after a pass (None unless the side must pass and
+    the opponent can move).
+    """
+    black, white, player = decode_key(key, size)
+    own, opp = (black, white) if player == Board.BLACK else (white, black)
+    moves = get_moves_mask(own, opp, tables)
+    if not moves:
+        if get_moves_mask(opp, own, tables):
+            return [], canonical_key(encode_key(black, white, -player, size), size)
+        return [], None
+
+    out = []
+    while moves:
+        low = moves & -moves
+        moves ^= low
+        flips = get_flips_mask(own, opp, low.bit_length() - 1, tables)
+        new_own, new_opp = own | flips | low, opp & ~flips
+        if player == Board.BLACK:
+            child = encode_key(new_own, new_opp, -player, size)
+        else:
+            child = encode_key(new_opp, new_own, -player, size)
+        out.append(canonical_key(child, size))
+    return out, None
+
+
+def enumerate_layers(seeds, size, progress=None):
+    """
+    Every position reachable from 'seeds' (canonical keys), grouped by the
+    number of empty squares: returns {empties: set of keys}.
+    """
+    tables = get_bitboard_tables(size)
+    n = size * size
+    layers = {}
+    for key in seeds:
+        black, white, _ = decode_key(key, size)
+        layers.setdefault(n - popcount(black | white), set()).add(key)
+
+    empties = max(layers)
+    while empties >= 0:
+        layer = layers.get(empties)
+        if layer:
+            below = layers.setdefault(empties - 1, set()) if empties > 0 else None
+            pending = list(layer)
+            while pending:
+                key = pending.pop()
+                moves, passed = _children(key, size, tables)
+                if passed is not None and passed not in layer:
+                    # A pass stays in this group and is expanded here as well
+                    layer.add(passed)
+                    pending.append(passed)
+                if moves:
+                    below.update(moves)
+            if progress:
+                progress('enumerate', empties, len(layer))
+        empties -= 1
+    return {e: keys for e, keys in layers.items() if keys}
+
+
+def solve_layers(layers, size, progress=None):
+    """
+    Retrograde pass over enumerate_layers' groups, fewest empties first.
+    Returns {key: value} for every position.
+    """
+    tables = get_bitboard_tables(size)
+    values = {}
+    for empties in sorted(layers):
+        passing = []
+        for key in layers[empties]:
+            moves, passed = _children(key, size, tables)
+            black, white, player = decode_key(key, size)
+            if moves:
+                child_values = [values[child] for child in moves]
+                values[key] = max(child_values) if player == Board.BLACK else min(child_values)
+            elif passed is not None:
+                passing.append((key, passed))
+            else:
+                values[key] = popcount(black) - popcount(white)
+        for key, passed in passing:
+            values[key] = values[passed]
+        if progress:
+            progress('solve', empties, len(layers[empties]))
+    return values
+
+
+def write_table(path, values, size):
+    """ Writes <path>.keys (sorted keys) and <path>.vals (one signed byte each). """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    keys = sorted(values)
+    write_key_file(path + '.keys', keys, key_width(size))
+    with open(path + '.vals', 'wb') as f:
+        f.write(bytes(values[k] & 0xFF for k in keys))
+    return len(keys)
+
+
+def build_table(size, seeds=None, path=None, progress=None):
+    """
+    Enumerates and solves everything reachable from 'seeds' (GameStates;
+    the start position if omitted) and writes the table. Returns
+    (path prefix, number of positions, values of the seeds).
+    """
+    if seeds is None:
+        from model.game_state import GameState
+        seeds = [GameState(Board(size=size), Board.BLACK)]
+    seed_keys = [canonical_key(key_from_state(s), size) for s in seeds]
+    values = solve_layers(enumerate_layers(seed_keys, size, progress), size, progress)
+    path = path or table_path(size)
+    count = write_table(path, values, size)
+    return path, count, [values[k] for k in seed_keys]
+
+
+class SolvedTable:
+    """ Read-only, memory-mapped perfect-play table. """
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self.keys = KeyFile(path + '.keys', key_width(size))
+        self._file = open(path + '.vals', 'rb')
+        self._vals = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if len(self.keys) else b''
+
+    def __len__(self):
+        return len(self.keys)
+
+    def value(self, key):
+        """ Perfect-play black - white of a position key, or None if it is not in the table. """
+        i = self.keys.find(canonical_key(key, self.size))
+        if i < 0:
+            return None
+        v = self._vals[i]
+        return v - 256 if v > 127 else v
+
+    def lookup(self, board, player):
+        return self.value(key_from_board(board, player))
+
+    def best_move(self, board, player):
+        """
+        (move, value) with the best table value for 'player' (Black maximises),
+        or None when the side to move has no move or a child is not in the table.
+        """
+        best = None
+        for r, c in board.get_valid_moves(player):
+            child, _ = board.apply_move(r, c, player)
+            v = self.lookup(child, -player)
+            if v is None:
+                return None
+            if best is None or (v > best[1] if player == Board.BLACK else v < best[1]):
+                best = ((r, c), v)
+        return best
+
+    def close(self):
+        if self._file is not None:
+            self.keys.close()
+            if len(self.keys):
+                self._vals.close()
+            self._file.close()
+            self._file = None
+
+
+def load_table(size, path=None):
+    """ The solved table for 'size' (opened once), or None if none was built. """
+    path = path or table_path(size)
+    table = _OPEN_TABLES.get(path)
+    if table is None:
+        if not os.path.exists(path + '.keys'):
+            return None
+        table = _OPEN_TABLES[path] = SolvedTable(path, size)
+    return table
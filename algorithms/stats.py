@@ -0,0 +1,163 @@
+"""
+Search statistics filled in directly by the engines.
+
+Engines take an optional 'stats' argument (a SearchStats is created when it
+is omitted) and return it in their final {'type': 'result', ...} event, so
+counting nodes no longer requires draining and counting visualization events.
+All counters are plain attributes and lists, cheap enough to update on every
+node.
+"""
+import time
+
+
+class SearchStats:
+    """
+    Counters for one move calculation.
+        nodes, leaves:     nodes visited / evaluated by the heuristic
+        ply_nodes:         [ply] -> nodes visited at that distance from the root
+        cutoffs:           [ply] -> alpha-beta cutoffs at that ply
+        cutoff_index:      [i] -> cutoffs caused by the i-th move tried (0 = first)
+        tt_probes, tt_hits, tt_stores: transposition table / memo traffic
+        tt_size:           entries in the table when the search finished
+        iterations:        list of (depth, nodes, seconds), one per search pass
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.leaves = 0
+        self.ply_nodes = []
+        self.cutoffs = []
+        self.cutoff_index = []
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_stores = 0
+        self.tt_size = 0
+        self.iterations = []
+        self.root_depth = 0
+        self._iter_start = None
+        self._iter_nodes = 0
+
+    # --- Recording (called from the engines) ---------------------------------
+
+    def begin_iteration(self, depth):
+        """ Starts a search pass of 'depth' plies from the root. """
+        self.root_depth = depth
+        self._iter_nodes = self.nodes
+        self._iter_start = time.perf_counter()
+
+    def end_iteration(self):
+        elapsed = time.perf_counter() - self._iter_start
+        self.iterations.append((self.root_depth, self.nodes - self._iter_nodes, elapsed))
+
+    def node(self, depth):
+        """ A node with 'depth' plies left to search. """
+        self.nodes += 1
+        ply = self.root_depth - depth
+        counts = self.ply_nodes
+        while len(counts) <= ply:
+            counts.append(0)
+        counts[ply] += 1
+
+    def cutoff(self, depth, index):
+        """ A cutoff at a node with 'depth' plies left, caused by move number 'index'. """
+        ply = self.root_depth - depth
+        cutoffs = self.cutoffs
+        while len(cutoffs) <= ply:
+            cutoffs.append(0)
+        cutoffs[ply] += 1
+        hist = self.cutoff_index
+        while len(hist) <= index:
+            hist.append(0)
+        hist[index] += 1
+
+    # --- Derived values -------------------------------------------------------
+
+    @property
+    def elapsed(self):
+        return sum(t for _, _, t in self.iterations)
+
+    @property
+    def nps(self):
+        elapsed = self.elapsed
+        return self.nodes / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def total_cutoffs(self):
+        return sum(self.cutoffs)
+
+    @property
+    def first_move_cutoff_rate(self):
+        """ Share of cutoffs produced by the first move tried (move ordering quality). """
+        total = self.total_cutoffs
+        return self.cutoff_index[0] / total if total else 0.0
+
+    def ebf(self, nodes=None, depth=None):
+        """
+        Effective branching factor: the b for which 1 + b + ... + b^depth
+        equals the node count of the last iteration, solved by bisection.
+        """
+        if nodes is None or depth is None:
+            if not self.iterations:
+                return 0.0
+            depth, nodes, _ = self.iterations[-1]
+        if depth <= 0 or nodes <= 1:
+            return 0.0
+
+        def tree_size(b):
+            total, term = 1.0, 1.0
+            for _ in range(depth):
+                term *= b
+                total += term
+            return total
+
+        lo, hi = 0.0, float(nodes)
+        for _ in range(100):
+            mid = (lo + hi) / 2
+            if tree_size(mid) < nodes:
+                lo = mid
+            else:
+                hi = mid
+        return (lo + hi) / 2
+
+    # --- Output ---------------------------------------------------------------
+
+    def as_dict(self):
+        return {
+            'nodes': self.nodes,
+            'leaves': self.leaves,
+            'ply_nodes': list(self.ply_nodes),
+            'cutoffs': self.total_cutoffs,
+            'ply_cutoffs': list(self.cutoffs),
+            'cutoff_index': list(self.cutoff_index),
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'tt_stores': self.tt_stores,
+            'tt_size': self.tt_size,
+            'iterations': [list(it) for it in self.iterations],
+            'ebf': self.ebf(),
+        }
+
+    def summary_lines(self):
+        """ Short lines for the GUI side panel. """
+        lines = [
+            f"Nodes: {self.nodes}  Leaves: {self.leaves}",
+            f"Time: {self.elapsed * 1000:.1f}ms  {self.nps:,.0f} n/s",
+            f"EBF: {self.ebf():.2f}  Cutoffs: {self.total_cutoffs}",
+        ]
+        if self.tt_probes:
+            lines.append(f"TT: {self.tt_hits}/{self.tt_probes} hits  {self.tt_stores} stores  {self.tt_size} entries")
+        if self.total_cutoffs:
+            lines.append(f"1st-move cutoffs: {self.first_move_cutoff_rate * 100:.0f}%")
+        return lines
+
+    def __str__(self):
+        lines = self.summary_lines()
+        if self.ply_nodes:
+            lines.append("Nodes/ply: " + " ".join(str(n) for n in self.ply_nodes))
+        if self.cutoffs:
+            lines.append("Cutoffs/ply: " + " ".join(str(n) for n in self.cutoffs))
+        if self.cutoff_index:
+            lines.append("Cutoff move index: " + " ".join(str(n) for n in self.cutoff_index))
+        for depth, nodes, seconds in self.iterations:
+            lines.append(f"  depth {depth}: {nodes} nodes in {seconds * 1000:.1f}ms")
+        return "\n".join(lines)
@@ -0,0 +1,216 @@
+"""
+Search-trace recording and replay.
+
+A trace is a line-oriented text file written while an engine generator runs:
+
+    #OTRACE 1 size=8 engine=dp depth=3       header
+    S 9f3a...                               root position (hash)
+    P 9f3a... X ---...XO...---              position table entry: hash, side to move, cells
+    E search_node 9f3a... 3 -               event: type, position hash, depth, score
+
+Events refer to positions by their Zobrist hash; each position is written
+to the table once, the first time it appears. A position of '-' means
+the event had no state (e.g. a result at game over). Lines are buffered
+and written in blocks.
+"""
+import os
+import time
+from model.board import Board
+from model.game_state import GameState
+from model.hashing import zobrist_hash
+from model.snapshot import Snapshot
+
+TRACE_MAGIC = '#OTRACE'
+TRACE_VERSION = 1
+TRACE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'traces')
+
+_CHAR_CELLS = {'-': Board.EMPTY, 'X': Board.BLACK, 'O': Board.WHITE}
+# Snapshot cell bytes (value % 3) <-> position table characters
+_SNAPSHOT_TO_TEXT = bytes.maketrans(b'\x00\x01\x02', b'-XO')
+_TEXT_TO_SNAPSHOT = bytes.maketrans(b'-XO', b'\x00\x01\x02')
+
+
+def _format_value(value):
+    return '-' if value is None else repr(value)
+
+def _parse_value(text):
+    if text == '-':
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+class TraceWriter:
+    """
+    Streams engine events to a trace file.
+    Use as a context manager, or call close() when the search is over.
+    """
+
+    def __init__(self, path, root_state, buffer_lines=4096, **meta):
+        self.path = path
+        self.buffer_lines = buffer_lines
+        self._seen = set()
+        self._lines = []
+        self.events = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'w')
+
+        size = root_state.board.SIZE
+        fields = " ".join(f"{k}={v}" for k, v in sorted(meta.items()))
+        self._lines.append(f"{TRACE_MAGIC} {TRACE_VERSION} size={size} {fields}".rstrip())
+        self._lines.append(f"S {self._position(root_state):016x}")
+
+    def _position(self, state):
+        """
+        Hash of 'state' (a Snapshot, or a GameState for the root and results),
+        adding it to the position table on first sight.
+        """
+        snapshot = state if isinstance(state, Snapshot) else Snapshot.from_state(state)
+        h = zobrist_hash(snapshot.grid, state.player)
+        if h not in self._seen:
+            self._seen.add(h)
+            cells = snapshot.cells.translate(_SNAPSHOT_TO_TEXT).decode('ascii')
+            side = 'X' if state.player == Board.BLACK else 'O'
+            self._lines.append(f"P {h:016x} {side} {cells}")
+        return h
+
+    def record(self, evt):
+        state = evt.get('state')
+        key = f"{self._position(state):016x}" if state is not None else '-'
+        self._lines.append(f"E {evt['type']} {key} "
+                           f"{_format_value(evt.get('depth'))} {_format_value(evt.get('score'))}")
+        self.events += 1
+        if len(self._lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._file.write("\n".join(self._lines) + "\n")
+            self._lines = []
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def new_trace_path(label):
+    """ traces/<timestamp>_<label>.trace, unique per call. """
+    stamp = time.strftime('%Y%m%d_%H%M%S')
+    base = os.path.join(TRACE_DIR, f"{stamp}_{label}")
+    path = base + '.trace'
+    n = 1
+    while os.path.exists(path):
+        n += 1
+        path = f"{base}_{n}.trace"
+    return path
+
+def record_generator(gen, writer):
+    """
+    Passes the events of 'gen' through unchanged while writing them to
+    'writer'. The file is closed when the generator finishes or is dropped.
+    """
+    try:
+        for evt in gen:
+            writer.record(evt)
+            yield evt
+    finally:
+        writer.close()
+
+
+class Trace:
+    """
+    A loaded trace.
+        meta:      header fields (size, engine, ...)
+        root:      hash of the position the search started from
+        positions: hash -> (cells string, player)
+        events:    list of {'type', 'hash', 'depth', 'score'}
+    """
+
+    def __init__(self, meta, root, positions, events):
+        self.meta = meta
+        self.root = root
+        self.positions = positions
+        self.events = events
+        self.size = int(meta.get('size', 8))
+        self._states = {}
+        self._snapshots = {}
+
+    def state(self, h):
+        """ GameState for a position hash (built once, then shared). """
+        if h is None:
+            return None
+        state = self._states.get(h)
+        if state is None:
+            cells, player = self.positions[h]
+            size = self.size
+            grid = [[_CHAR_CELLS[cells[r * size + c]] for c in range(size)] for r in range(size)]
+            state = GameState(Board(grid, size=size), player)
+            self._states[h] = state
+        return state
+
+    def snapshot(self, h):
+        """ Snapshot for a position hash (built once, then shared). """
+        if h is None:
+            return None
+        snapshot = self._snapshots.get(h)
+        if snapshot is None:
+            cells, player = self.positions[h]
+            snapshot = Snapshot(cells.encode('ascii').translate(_TEXT_TO_SNAPSHOT), self.size, player)
+            self._snapshots[h] = snapshot
+        return snapshot
+
+    def replay(self):
+        """
+        Yields the events again in UI protocol form: a Snapshot as 'state'
+        for visualization events, a GameState for the result.
+        """
+        for evt in self.events:
+            h = evt['hash']
+            state = self.state(h) if evt['type'] == 'result' else self.snapshot(h)
+            out = {'type': evt['type'], 'state': state}
+            if evt['depth'] is not None:
+                out['depth'] = evt['depth']
+            if evt['score'] is not None:
+                out['score'] = evt['score']
+            yield out
+
+
+def load_trace(path):
+    meta, root, positions, events = {}, None, {}, []
+    with open(path) as f:
+        header = f.readline().split()
+        if not header or header[0] != TRACE_MAGIC or int(header[1]) != TRACE_VERSION:
+            raise ValueError(f"{path} is not a version {TRACE_VERSION} trace file")
+        for field in header[2:]:
+            key, _, value = field.partition('=')
+            meta[key] = value
+
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            kind = parts[0]
+            if kind == 'E':
+                events.append({
+                    'type': parts[1],
+                    'hash': None if parts[2] == '-' else int(parts[2], 16),
+                    'depth': _parse_value(parts[3]),
+                    'score': _parse_value(parts[4]),
+                })
+            elif kind == 'P':
+                player = Board.BLACK if parts[2] == 'X' else Board.WHITE
+                positions[int(parts[1], 16)] = (parts[3], player)
+            elif kind == 'S':
+                root = int(parts[1], 16)
+    return Trace(meta, root, positions, events)
@@ -0,0 +1,114 @@
+"""
+Search-tree cache kept between consecutive moves.
+
+After the CPU and the human have each moved, most of the new root's
+subtree was already searched by the previous move's search. A TreeCache
+records, for every interior node, the bounds its value was proven within,
+the depth they hold for and the best move found. The next search looks the
+node up before expanding it:
+
+    - the cached best move is searched first (the previous principal
+      variation leads each node it passes through), which gives earlier
+      cutoffs;
+    - bounds searched at least as deep as needed settle the node outright
+      when they are exact or outside the alpha-beta window.
+
+advance() is called with the position actually reached and drops every
+entry that can no longer occur below it, so the cache only holds the
+subtree under the moves that were played.
+
+Values are scored for the root player by one heuristic: a cache must not be
+shared between sides or evaluators.
+"""
+from model.position_keys import decode_key, key_from_board
+
+INF = float('inf')
+
+
+class TreeCache:
+    """
+    Position key -> (depth, lower, upper, best move).
+        depth:  remaining depth the node was searched with
+        lower, upper: bounds on its value (equal when exact)
+        best_move: (r, c) that produced the value, or None (pass / no cutoff move)
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def key(state):
+        return key_from_board(state.board, state.player)
+
+    def probe(self, key):
+        return self.entries.get(key)
+
+    def store(self, key, depth, value, alpha, beta, best_move):
+        """
+        Records a fail-soft alpha-beta result: a value at or below alpha is an
+        upper bound, at or above beta a lower bound, otherwise exact.
+        A deeper entry is not replaced by a shallower one.
+        """
+        old = self.entries.get(key)
+        if old is not None and old[0] > depth:
+            return
+        lower = value if value > alpha else -INF
+        upper = value if value < beta else INF
+        if old is not None and old[0] == depth:
+            # Same depth: combine the bounds of both searches
+            lower, upper = max(lower, old[1]), min(upper, old[2])
+            if best_move is None:
+                best_move = old[3]
+        self.entries[key] = (depth, lower, upper, best_move)
+
+    @staticmethod
+    def cutoff(entry, depth, alpha, beta):
+        """ The value 'entry' settles for a search of 'depth' in (alpha, beta), or None. """
+        stored_depth, lower, upper = entry[0], entry[1], entry[2]
+        if stored_depth < depth:
+            return None
+        if lower == upper or lower >= beta:
+            return lower
+        if upper <= alpha:
+            return upper
+        return None
+
+    def pv(self, state, max_length=20):
+        """ The principal variation from 'state' by following cached best moves. """
+        from model.game_state import GameState
+        line = []
+        seen = set()
+        while len(line) < max_length:
+            key = self.key(state)
+            entry = self.entries.get(key)
+            if entry is None or entry[3] is None or key in seen:
+                break
+            seen.add(key)
+            r, c = entry[3]
+            line.append((r, c))
+            board, _ = state.board.apply_move(r, c, state.player)
+            state = GameState(board, -state.player)
+        return line
+
+    def advance(self, state):
+        """
+        Keeps only the entries that can still occur below 'state': discs are
+        never removed, so a position below it covers at least its squares.
+        Returns the number of entries kept.
+        """
+        size = state.board.SIZE
+        root_black, root_white, _ = decode_key(self.key(state), size)
+        root = root_black | root_white
+        kept = {}
+        for key, entry in self.entries.items():
+            black, white, _ = decode_key(key, size)
+            if root & ~(black | white) == 0:
+                kept[key] = entry
+        self.entries = kept
+        return len(kept)
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,340 @@
+"""
+Othello AI – Unified Benchmark Suite
+Run:  python3 benchmark.py --depth 3 --repeat 3 --out results.json
+      python3 benchmark.py --baseline results.json      (fails on regressions)
+      python3 benchmark.py --memory --memory-depths 2 3 4 --out results.json
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import platform
+import statistics
+import tracemalloc
+
+from model.board import Board
+from model.game_state import GameState
+from algorithms.engines import ENGINES, get_move_generator
+from algorithms.stats import SearchStats
+
+# ── Position suite ────────────────────────────────────────────────────────────
+# 8x8 positions, row-major: X = Black, O = White, - = empty; then side to move.
+
+SUITE = [
+    ("opening",  "---------------------------OX------XO---------------------------", 'X'),
+    ("early",    "----------X--------X------XXX-----OXO----O-O----O---O-----------", 'X'),
+    ("midgame1", "-------X------X--XXXXX----XXXX--OOXOXO----OXOX---OXXX------X----", 'X'),
+    ("midgame2", "--O-O-----OOOO--XXO-OOOO-OXXOO--OXXXOO--X-X-OX-----XXOX-------OX", 'X'),
+    ("endgame1", "--OOO-OXOOOOOOXX-OXXOXOXXXXOXOOXOOOOOOO--OOXX---OOOOOX-----OOOOO", 'X'),
+    ("endgame2", "OXXX--O-XOXXXOOX--OXOOOXOOOOXXOXOOOXXXXXOOOOOOXXXXOOOXXX--OOX-XO", 'X'),
+]
+
+def parse_position(text, side):
+    size = int(len(text) ** 0.5)
+    values = {'X': Board.BLACK, 'O': Board.WHITE, '-': Board.EMPTY}
+    grid = [[values[text[r * size + c]] for c in range(size)] for r in range(size)]
+    return GameState(Board(grid, size=size), values[side])
+
+def suite_states():
+    return [(name, parse_position(text, side)) for name, text, side in SUITE]
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def run_once(name, state, depth):
+    """
+    Runs one search and returns (seconds, counters).
+    Counters come from the SearchStats the engine fills in.
+    """
+    stats = SearchStats()
+    t0 = time.perf_counter()
+    for _ in get_move_generator(name, state, depth, stats):
+        pass
+    elapsed = time.perf_counter() - t0
+    return elapsed, {
+        'nodes': stats.nodes,
+        'leaves': stats.leaves,
+        'tt_probes': stats.tt_probes,
+        'tt_hits': stats.tt_hits,
+        'tt_stores': stats.tt_stores,
+        'tt_size': stats.tt_size,
+        'cutoffs': stats.total_cutoffs,
+        'ply_nodes': list(stats.ply_nodes),
+        'cutoff_index': list(stats.cutoff_index),
+        'ebf': stats.ebf(),
+    }
+
+# Every entry is timed in 'repeat' rounds spread over the whole suite (so a
+# burst of load on the machine hits one round, not every run of one entry);
+# short searches are repeated until their runs add up to this many seconds.
+MIN_MEASURE_TIME = 0.2
+MAX_RUNS = 200
+
+def timed_runs(name, state, depth, min_time):
+    """ Runs until 'min_time' seconds have passed (at least once); returns (times, counters). """
+    times = []
+    counters = None
+    while not times or (sum(times) < min_time and len(times) < MAX_RUNS):
+        elapsed, counters = run_once(name, state, depth)
+        times.append(elapsed)
+    return times, counters
+
+def time_entry(times, counters, depth):
+    median = statistics.median(times)
+    entry = dict(counters)
+    entry.update({
+        'depth': depth,
+        'time_min': min(times),
+        'time_median': median,
+        'runs': len(times),
+        'nps': counters['nodes'] / median if median > 0 else 0.0,
+    })
+    return entry
+
+def measure(name, state, depth, repeat):
+    times = []
+    counters = None
+    for _ in range(repeat):
+        batch, counters = timed_runs(name, state, depth, MIN_MEASURE_TIME / repeat)
+        times.extend(batch)
+    return time_entry(times, counters, depth)
+
+def run_suite(engines, depth, repeat):
+    states = suite_states()
+    times = {(name, pos_name): [] for name in engines for pos_name, _ in states}
+    counters = {}
+    for _ in range(repeat):
+        for name in engines:
+            for pos_name, state in states:
+                batch, counters[name, pos_name] = timed_runs(name, state, depth, MIN_MEASURE_TIME / repeat)
+                times[name, pos_name].extend(batch)
+
+    results = {}
+    for name in engines:
+        results[name] = {}
+        for pos_name, _ in states:
+            e = results[name][pos_name] = time_entry(times[name, pos_name], counters[name, pos_name], depth)
+            print(f"  {name:<10} {pos_name:<9} {e['time_median']*1000:>9.2f}ms "
+                  f"{e['nodes']:>8} nodes {e['nps']:>10,.0f} n/s "
+                  f"{e['tt_hits']:>6} tt {e['cutoffs']:>6} cut  ebf {e['ebf']:.2f}")
+    return results
+
+# ── Memory ────────────────────────────────────────────────────────────────────
+
+def run_memory(name, state, depth):
+    """
+    Runs one search under tracemalloc. Returns the peak traced memory and
+    the blocks still live when the engine yields its result (its memo table,
+    boards and stack are all reachable then), relative to the start; for a
+    generator that ends without a result, the blocks live at its end.
+    """
+    stats = SearchStats()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base_bytes, _ = tracemalloc.get_traced_memory()
+        diff = None
+        for evt in get_move_generator(name, state, depth, stats):
+            if evt['type'] == 'result':
+                diff = tracemalloc.take_snapshot().compare_to(before, 'filename')
+        if diff is None:
+            # Generator ended without a result: what is still live at the end
+            diff = tracemalloc.take_snapshot().compare_to(before, 'filename')
+        live_blocks = sum(d.count_diff for d in diff)
+        live_bytes = sum(d.size_diff for d in diff)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    nodes = max(stats.nodes, 1)
+    peak_bytes = peak - base_bytes
+    return {
+        'depth': depth,
+        'nodes': stats.nodes,
+        'peak_bytes': peak_bytes,
+        'peak_bytes_per_node': peak_bytes / nodes,
+        'live_blocks': live_blocks,
+        'live_bytes': live_bytes,
+        'blocks_per_node': live_blocks / nodes,
+        'tt_size': stats.tt_size,
+    }
+
+def run_memory_suite(engines, depths):
+    """ engine -> position -> str(depth) -> memory entry """
+    results = {}
+    states = suite_states()
+    for name in engines:
+        results[name] = {}
+        for pos_name, state in states:
+            results[name][pos_name] = {}
+            for depth in depths:
+                e = run_memory(name, state, depth)
+                results[name][pos_name][str(depth)] = e
+                print(f"  {name:<10} {pos_name:<9} d={depth} {e['peak_bytes']/1024:>9.1f} KiB peak "
+                      f"{e['peak_bytes_per_node']:>7.1f} B/node {e['live_blocks']:>7} blocks "
+                      f"{e['blocks_per_node']:>6.2f} blk/node {e['tt_size']:>7} tt")
+    return results
+
+def code_version():
+    """
+    Short hash of the engine and board sources. Cached results keyed by it
+    are invalidated automatically when the search code changes.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha1()
+    for package in ('algorithms', 'model'):
+        folder = os.path.join(root, package)
+        for name in sorted(os.listdir(folder)):
+            if name.endswith('.py'):
+                digest.update(name.encode())
+                with open(os.path.join(folder, name), 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+def analysis_task(task):
+    """
+    Process-pool entry point used by interactive_analysis.py.
+    task = (engine name, depth, position name); returns
+    (engine name, depth, position name, seconds, nodes) for one timed run.
+    """
+    name, depth, pos_name = task
+    _, text, side = next(entry for entry in SUITE if entry[0] == pos_name)
+    elapsed, counters = run_once(name, parse_position(text, side), depth)
+    return name, depth, pos_name, max(elapsed, 1e-4), max(counters['nodes'], 1)
+
+# ── Baseline comparison ───────────────────────────────────────────────────────
+
+def time_regressions(results, baseline, tolerance, time_floor=0.005):
+    """
+    (engine, position, baseline seconds, seconds) of every entry whose fastest
+    run (the least disturbed by other load) grew by more than 'tolerance'
+    (fraction). Differences under 'time_floor' seconds never count: they are
+    within timer and scheduler noise.
+    """
+    slow = []
+    for name, positions in results.items():
+        for pos_name, e in positions.items():
+            base = baseline.get('results', {}).get(name, {}).get(pos_name)
+            if base is None or base.get('depth') != e['depth']:
+                continue
+            base_time = base.get('time_min', base['time_median'])
+            if base_time > 0 and e['time_min'] - base_time >= time_floor:
+                if e['time_min'] / base_time - 1.0 > tolerance:
+                    slow.append((name, pos_name, base_time, e['time_min']))
+    return slow
+
+def compare(results, baseline, tolerance, time_floor=0.005):
+    """
+    Returns a list of problems found against the baseline.
+    Node counts must match exactly (the searches are deterministic); times
+    are checked by time_regressions.
+    """
+    problems = []
+    for name, positions in results.items():
+        for pos_name, e in positions.items():
+            base = baseline.get('results', {}).get(name, {}).get(pos_name)
+            if base is None or base.get('depth') != e['depth']:
+                continue
+            if base['nodes'] != e['nodes']:
+                problems.append(f"{name}/{pos_name}: nodes {base['nodes']} -> {e['nodes']}")
+    for name, pos_name, base_time, new_time in time_regressions(results, baseline, tolerance, time_floor):
+        growth = new_time / base_time - 1.0
+        problems.append(f"{name}/{pos_name}: time +{growth*100:.0f}% "
+                        f"({base_time*1000:.2f}ms -> {new_time*1000:.2f}ms)")
+    return problems
+
+def remeasure_slow(results, baseline, tolerance, time_floor, repeat):
+    """
+    Times the entries time_regressions flags once more and keeps the faster
+    result, so a single disturbed measurement does not fail the gate.
+    """
+    states = dict(suite_states())
+    for name, pos_name, _, _ in time_regressions(results, baseline, tolerance, time_floor):
+        e = measure(name, states[pos_name], results[name][pos_name]['depth'], repeat)
+        if e['time_min'] < results[name][pos_name]['time_min']:
+            results[name][pos_name] = e
+
+def compare_memory(memory, baseline, tolerance):
+    """
+    Memory regressions: the memo / TT size must match exactly, and the peak
+    may not grow by more than 'tolerance' (fraction).
+    """
+    problems = []
+    for name, positions in memory.items():
+        for pos_name, depths in positions.items():
+            for depth, e in depths.items():
+                base = baseline.get('memory', {}).get(name, {}).get(pos_name, {}).get(depth)
+                if base is None:
+                    continue
+                where = f"{name}/{pos_name}/d{depth}"
+                if base['tt_size'] != e['tt_size']:
+                    problems.append(f"{where}: tt size {base['tt_size']} -> {e['tt_size']}")
+                if base['peak_bytes'] > 0:
+                    growth = e['peak_bytes'] / base['peak_bytes'] - 1.0
+                    if growth > tolerance:
+                        problems.append(f"{where}: peak memory +{growth*100:.0f}% "
+                                        f"({base['peak_bytes']/1024:.1f} KiB -> {e['peak_bytes']/1024:.1f} KiB)")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every registered engine on a fixed position suite.")
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per engine and position")
+    parser.add_argument('--out', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="compare against a stored JSON result file")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed fastest-run time / peak memory growth against the baseline (0.25 = 25%%)")
+    parser.add_argument('--time-floor', type=float, default=5.0,
+                        help="time differences below this many milliseconds are never regressions")
+    parser.add_argument('--memory', action='store_true',
+                        help="also measure peak memory, live blocks per node and TT size with tracemalloc")
+    parser.add_argument('--memory-depths', nargs='+', type=int, default=[2, 3, 4])
+    args = parser.parse_args()
+
+    print(f"[Benchmark  depth={args.depth}  repeat={args.repeat}]")
+    results = run_suite(args.engines, args.depth, args.repeat)
+
+    memory = None
+    if args.memory:
+        print(f"\n[Memory  depths={args.memory_depths}]")
+        memory = run_memory_suite(args.engines, args.memory_depths)
+
+    data = {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'depth': args.depth,
+            'repeat': args.repeat,
+            'code_version': code_version(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    if memory is not None:
+        data['memory'] = memory
+        data['meta']['memory_depths'] = args.memory_depths
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        remeasure_slow(results, baseline, args.tolerance, args.time_floor / 1000, args.repeat)
+        problems = compare(results, baseline, args.tolerance, args.time_floor / 1000)
+        if memory is not None:
+            problems += compare_memory(memory, baseline, args.tolerance)
+        if problems:
+            print(f"\n{len(problems)} regression(s) against {args.baseline}:")
+            for p in problems:
+                print(f"  - {p}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import time
+import random
+from model.board import Board
+from model.mailbox_board import MailboxBoard
+from model.bitboard import BitBoard
+
+SIZES = [4, 6, 8, 10, 12, 16]
+BACKENDS = [("Board", Board), ("Mailbox", MailboxBoard), ("BitBoard", BitBoard)]
+
+def playout_moves(board_cls, size, duration, seed=0):
+    """
+    Plays seeded random games on a fresh 'board_cls' until 'duration' seconds
+    have passed. Every ply generates the legal moves and applies one in-place,
+    and each finished game is unwound with pop_move.
+    Returns (moves applied, elapsed seconds).
+    """
+    rng = random.Random(seed)
+    moves = 0
+    start_time = time.perf_counter()
+    elapsed = 0.0
+
+    while elapsed < duration:
+        board = board_cls(size=size)
+        player = Board.BLACK
+        played = 0
+        while True:
+            valid = board.get_valid_moves(player)
+            if not valid:
+                if not board.get_valid_moves(-player):
+                    break
+                player = -player
+                continue
+            r, c = valid[rng.randrange(len(valid))]
+            board.push_move(r, c, player)
+            played += 1
+            player = -player
+        for _ in range(played):
+            board.pop_move()
+        moves += played
+        elapsed = time.perf_counter() - start_time
+
+    return moves, elapsed
+
+def run_benchmark(duration=1.0):
+    print(f"Moves per second by board size ({duration:.1f}s of random playouts per cell)\n")
+    header = f"{'Size':<8}" + "".join(f"{name:>14}" for name, _ in BACKENDS) + f"{'Bit/Board':>12}"
+    print(header)
+    print("-" * len(header))
+
+    for size in SIZES:
+        rates = []
+        for _, board_cls in BACKENDS:
+            moves, elapsed = playout_moves(board_cls, size, duration)
+            rates.append(moves / elapsed)
+        speedup = rates[-1] / rates[0] if rates[0] > 0 else 0.0
+        label = f"{size}x{size}"
+        row = f"{label:<8}" + "".join(f"{rate:>14,.0f}" for rate in rates) + f"{speedup:>11.2f}x"
+        print(row)
+
+if __name__ == "__main__":
+    run_benchmark()
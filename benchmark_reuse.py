@@ -0,0 +1,129 @@
+"""
+Othello – Subtree Reuse Benchmark
+Plays full games with the backtracking engine on both sides and searches
+every position twice: cold, and with the side's TreeCache kept from its
+previous moves (algorithms/tree_cache.py). Reports nodes and time per move
+and over the game, and checks that both searches agree on the score.
+Run:  python3 benchmark_reuse.py --depth 4
+      python3 benchmark_reuse.py --depth 5 --games 3 --random-plies 4 --out reuse.json
+"""
+
+import json
+import time
+import random
+import argparse
+
+from model.board import Board
+from model.game_state import GameState
+from algorithms.backtracking import get_backtracking_move_generator
+from algorithms.tree_cache import TreeCache
+from algorithms.stats import SearchStats
+
+def search(state, depth, cache=None):
+    """ (result event, seconds) of one backtracking search on a copy of 'state'. """
+    board = Board(state.board.grid, size=state.board.SIZE)
+    stats = SearchStats()
+    t0 = time.perf_counter()
+    result = None
+    for evt in get_backtracking_move_generator(GameState(board, state.player), depth, stats=stats, cache=cache):
+        if evt['type'] == 'result':
+            result = evt
+    return result, time.perf_counter() - t0
+
+def play_game(depth, size, random_plies, rng, verbose):
+    """ One game; returns the per-move records. """
+    state = GameState(Board(size=size), Board.BLACK)
+    caches = {Board.BLACK: TreeCache(), Board.WHITE: TreeCache()}
+    moves = []
+    ply = 0
+    while not state.is_terminal():
+        legal = state.board.get_valid_moves(state.player)
+        if not legal:
+            state = GameState(state.board, -state.player)
+            continue
+        if ply < random_plies:
+            # Varied openings
+            r, c = rng.choice(legal)
+            board, _ = state.board.apply_move(r, c, state.player)
+            state = GameState(board, -state.player)
+            ply += 1
+            continue
+
+        cache = caches[state.player]
+        kept = cache.advance(state)
+        cold, cold_time = search(state, depth)
+        warm, warm_time = search(state, depth, cache)
+        record = {
+            'ply': ply,
+            'kept': kept,
+            'cold_nodes': cold['stats'].nodes,
+            'warm_nodes': warm['stats'].nodes,
+            'cold_time': cold_time,
+            'warm_time': warm_time,
+            'tt_hits': warm['stats'].tt_hits,
+            'same_score': cold['score'] == warm['score'],
+            'same_move': cold['state'].board.grid == warm['state'].board.grid,
+        }
+        moves.append(record)
+        if verbose:
+            print(f"  ply {ply:>3} {record['cold_nodes']:>8} -> {record['warm_nodes']:>8} nodes "
+                  f"{cold_time * 1000:>8.1f} -> {warm_time * 1000:>8.1f}ms  kept {kept:>6} "
+                  f"hits {record['tt_hits']:>6}{'' if record['same_score'] else '  SCORE DIFFERS'}")
+        state = warm['state']
+        ply += 1
+    return moves
+
+def summarize(moves):
+    cold_nodes = sum(m['cold_nodes'] for m in moves)
+    warm_nodes = sum(m['warm_nodes'] for m in moves)
+    cold_time = sum(m['cold_time'] for m in moves)
+    warm_time = sum(m['warm_time'] for m in moves)
+    return {
+        'moves': len(moves),
+        'cold_nodes': cold_nodes,
+        'warm_nodes': warm_nodes,
+        'node_saving': 1 - warm_nodes / cold_nodes if cold_nodes else 0.0,
+        'cold_time': cold_time,
+        'warm_time': warm_time,
+        'time_saving': 1 - warm_time / cold_time if cold_time else 0.0,
+        'score_mismatches': sum(not m['same_score'] for m in moves),
+        'move_mismatches': sum(not m['same_move'] for m in moves),
+    }
+
+def report(label, s):
+    print(f"{label}: {s['moves']} searched moves  nodes {s['cold_nodes']:,} -> {s['warm_nodes']:,} "
+          f"({s['node_saving']:.1%} fewer)  time {s['cold_time']:.2f}s -> {s['warm_time']:.2f}s "
+          f"({s['time_saving']:.1%} less)  score mismatches {s['score_mismatches']}  "
+          f"different (equal-score) moves {s['move_mismatches']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure node savings from reusing the search tree between moves.")
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--size', type=int, default=8)
+    parser.add_argument('--games', type=int, default=1)
+    parser.add_argument('--random-plies', type=int, default=0, help="random opening plies per game")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--quiet', action='store_true', help="only print the summaries")
+    parser.add_argument('--out', help="write the per-move records as JSON to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"[Subtree reuse  backtracking depth={args.depth}  size={args.size}  games={args.games}]")
+    games = []
+    for g in range(args.games):
+        if not args.quiet:
+            print(f"Game {g + 1}")
+        moves = play_game(args.depth, args.size, args.random_plies, rng, not args.quiet)
+        games.append({'moves': moves, 'summary': summarize(moves)})
+        report(f"Game {g + 1}", games[-1]['summary'])
+
+    total = summarize([m for game in games for m in game['moves']])
+    if args.games > 1:
+        report("Total", total)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'depth': args.depth, 'size': args.size, 'games': games, 'total': total}, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+if __name__ == "__main__":
+    main()
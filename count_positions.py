@@ -0,0 +1,207 @@
+"""
+Othello – Unique Positions per Ply
+Counts the distinct positions reachable in exactly N plies (a pass counts
+as a ply), the layered BFS of algorithms.graph.bfs_layers spread over a
+process pool. Each ply is split into partitions by crc32 of the position
+key; a worker expands one partition and buckets the children by their
+partition, then one worker per partition merges the buckets (sorted key
+files, see model.position_keys). --symmetry counts positions up to the 8
+rotations / reflections of the board.
+
+Completed plies are checkpointed in --dir with a manifest.json; running
+again with the same --dir resumes after the last completed ply.
+Run:  python3 count_positions.py --depth 9 --workers 4
+      python3 count_positions.py --depth 11 --size 6 --symmetry --dir counts_6x6
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import zlib
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from model.board import Board
+from model.game_state import GameState
+from model.bitboard import get_bitboard_tables
+from model.position_keys import (key_from_state, key_width, canonical_key, write_key_file,
+                                 merge_key_files, KeyFile)
+from algorithms.graph import successor_keys
+
+MANIFEST = 'manifest.json'
+
+def partition_of(key, width, partitions):
+    return zlib.crc32(key.to_bytes(width, 'big')) % partitions
+
+def ply_dir(root, ply):
+    return os.path.join(root, f"ply{ply:03d}")
+
+def part_path(root, ply, part):
+    return os.path.join(ply_dir(root, ply), f"part{part:03d}.keys")
+
+# ── Workers ───────────────────────────────────────────────────────────────────
+
+def expand_task(task):
+    """
+    Expands partition 'part' of 'ply': children are bucketed by partition
+    and written as sorted run files, several chunks if they outgrow
+    'max_keys'. Returns (part, parents, children generated, run paths).
+    """
+    root, size, ply, part, partitions, symmetry, max_keys = task
+    tables = get_bitboard_tables(size)
+    width = key_width(size)
+    out_dir = ply_dir(root, ply + 1)
+    buckets = [set() for _ in range(partitions)]
+    held = 0
+    chunk = 0
+    runs = []
+    parents = children = 0
+
+    def flush():
+        nonlocal chunk, held
+        for target, bucket in enumerate(buckets):
+            if bucket:
+                path = os.path.join(out_dir, f"run_{part:03d}_{target:03d}_{chunk:04d}.keys")
+                write_key_file(path, sorted(bucket), width)
+                runs.append((target, path))
+                bucket.clear()
+        chunk += 1
+        held = 0
+
+    with KeyFile(part_path(root, ply, part), width) as keys:
+        for key in keys:
+            parents += 1
+            for child in successor_keys(key, size, tables):
+                if symmetry:
+                    child = canonical_key(child, size)
+                bucket = buckets[partition_of(child, width, partitions)]
+                if child not in bucket:
+                    bucket.add(child)
+                    held += 1
+                children += 1
+            if held > max_keys:
+                flush()
+    flush()
+    return part, parents, children, runs
+
+def merge_task(task):
+    """ Merges the runs of one target partition into its part file; returns its count. """
+    root, size, ply, part, run_paths = task
+    width = key_width(size)
+    count = merge_key_files(run_paths, part_path(root, ply, part), width)
+    for path in run_paths:
+        os.remove(path)
+    return count
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_manifest(root, manifest):
+    tmp = os.path.join(root, MANIFEST + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, os.path.join(root, MANIFEST))
+
+def start_layer(root, state, partitions, symmetry):
+    """ Writes ply 0 (the start position) and returns a fresh manifest. """
+    size = state.board.SIZE
+    width = key_width(size)
+    key = key_from_state(state)
+    if symmetry:
+        key = canonical_key(key, size)
+    os.makedirs(ply_dir(root, 0), exist_ok=True)
+    target = partition_of(key, width, partitions)
+    for part in range(partitions):
+        write_key_file(part_path(root, 0, part), [key] if part == target else [], width)
+    return {'size': size, 'partitions': partitions, 'symmetry': symmetry,
+            'start': format(key, 'x'), 'plies': [{'ply': 0, 'unique': 1, 'seconds': 0.0,
+                                                  'parents': 0, 'children': 0}]}
+
+def step(pool, root, manifest, max_keys):
+    """ Computes the ply after the last completed one and checkpoints it. """
+    size, partitions, symmetry = manifest['size'], manifest['partitions'], manifest['symmetry']
+    ply = manifest['plies'][-1]['ply']
+    out_dir = ply_dir(root, ply + 1)
+    # Leftovers of an interrupted run of this ply
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+
+    t0 = time.perf_counter()
+    tasks = [(root, size, ply, part, partitions, symmetry, max_keys) for part in range(partitions)]
+    by_target = [[] for _ in range(partitions)]
+    parents = children = 0
+    for _, n_parents, n_children, runs in pool.map(expand_task, tasks):
+        parents += n_parents
+        children += n_children
+        for target, path in runs:
+            by_target[target].append(path)
+
+    merges = [(root, size, ply + 1, part, by_target[part]) for part in range(partitions)]
+    unique = sum(pool.map(merge_task, merges))
+    elapsed = time.perf_counter() - t0
+
+    manifest['plies'].append({'ply': ply + 1, 'unique': unique, 'seconds': elapsed,
+                              'parents': parents, 'children': children})
+    save_manifest(root, manifest)
+    # The checkpoint is the new ply; the one before it is no longer needed
+    shutil.rmtree(ply_dir(root, ply), ignore_errors=True)
+    return manifest['plies'][-1]
+
+def report(entry):
+    seconds = max(entry['seconds'], 1e-9)
+    print(f"  ply {entry['ply']:>3} {entry['unique']:>16,} positions "
+          f"{entry['seconds']:>9.2f}s {entry['parents'] / seconds:>12,.0f} expanded/s "
+          f"{entry['children'] / seconds:>12,.0f} children/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Count unique Othello positions per ply.")
+    parser.add_argument('--depth', type=int, default=8)
+    parser.add_argument('--size', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--partitions', type=int, default=16, help="crc32 partitions per ply")
+    parser.add_argument('--symmetry', action='store_true', help="count positions up to rotation / reflection")
+    parser.add_argument('--max-keys', type=int, default=500_000,
+                        help="keys a worker holds before spilling a sorted run")
+    parser.add_argument('--dir', help="checkpoint directory (kept, and resumed from when it exists)")
+    args = parser.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix='othello_count_')
+    os.makedirs(root, exist_ok=True)
+    manifest = load_manifest(root)
+    if manifest is not None:
+        if (manifest['size'], manifest['partitions'], manifest['symmetry']) != \
+                (args.size, args.partitions, args.symmetry):
+            print(f"{root} holds a run with size={manifest['size']} partitions={manifest['partitions']} "
+                  f"symmetry={manifest['symmetry']}; use another --dir")
+            sys.exit(1)
+        print(f"Resuming {root} after ply {manifest['plies'][-1]['ply']}")
+    else:
+        manifest = start_layer(root, GameState(Board(size=args.size), Board.BLACK),
+                               args.partitions, args.symmetry)
+        save_manifest(root, manifest)
+
+    print(f"[Unique positions  size={args.size}  depth={args.depth}  partitions={args.partitions}  "
+          f"symmetry={'on' if args.symmetry else 'off'}]")
+    for entry in manifest['plies'][:args.depth + 1]:
+        report(entry)
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            while manifest['plies'][-1]['ply'] < args.depth:
+                if manifest['plies'][-1]['unique'] == 0:
+                    break
+                report(step(pool, root, manifest, args.max_keys))
+    finally:
+        if args.dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+import os
+from algorithms.patterns import build_pattern_weights, save_pattern_weights, WEIGHTS_PATH, TABLE_ENTRIES
+
+if __name__ == "__main__":
+    table = build_pattern_weights()
+    save_pattern_weights(table)
+    print(f"Wrote {TABLE_ENTRIES} pattern weights to {os.path.relpath(WEIGHTS_PATH)} "
+          f"({os.path.getsize(WEIGHTS_PATH)} bytes)")
@@ -1,10 +1,21 @@
 """
 Othello AI – Interactive Algorithm Analysis
 Run:  python3 interactive_analysis.py
+
+Benchmarks run in a background process pool and the charts update as each
+result arrives. Results are cached on disk (analysis_cache.json) per
+algorithm, depth, position and code version, so revisiting a depth is instant;
+the button re-measures the current depth.
+
+'Scaling' sweeps depths over the benchmark suite (see scaling.py), plots the
+measured node growth against the theoretical curves and writes the fitted
+exponents into the Time Complexity column.
 """
 
-import time
+import os
+import json
 import subprocess, sys
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib
 matplotlib.use('TkAgg')
 import matplotlib.pyplot as plt
@@ -15,42 +26,19 @@ from matplotlib.widgets import Slider, Button
 plt.rcParams['font.family']     = 'Arial'
 plt.rcParams['font.sans-serif'] = ['Arial', 'Helvetica Neue', 'DejaVu Sans']
 
-from model.game_state import GameState
-from algorithms.greedy          import get_greedy_move_generator
-from algorithms.divide_and_conquer import choosebestmovevisual
-from algorithms.dp              import get_dp_move_generator
-from algorithms.backtracking    import get_backtracking_move_generator
-from algorithms.backtracknoheuristic import choosebestmovevisual as bt_noheur_visual
-
-# ── Benchmark ─────────────────────────────────────────────────────────────────
-
-COUNTED = {'search_node', 'leaf', 'dp_hit'}
-
-def benchmark(func, depth, is_greedy=False, is_dnc=False, is_bnoheur=False):
-    state = GameState()
-    if is_greedy:
-        gen = func(state)
-    elif is_dnc:
-        gen = func(state.board, state.player) # No depth argument for new D&C
-    elif is_bnoheur:
-        gen = func(state.board, state.player, depth)
-    else:
-        gen = func(state, depth=depth)
-    
-    n, t0 = 0, time.perf_counter()
-    for evt in gen:
-        if evt['type'] in COUNTED:
-            n += 1
-    return max(time.perf_counter() - t0, 1e-4), max(n, 1)
+from benchmark import SUITE, analysis_task, code_version
+from algorithms.engines import ENGINES
+import scaling
 
 # ── Algorithm table ───────────────────────────────────────────────────────────
 
+# (label, engine name in algorithms.engines, time complexity, space complexity)
 ALGOS = [
-    ("Greedy",          get_greedy_move_generator,       True,  False, False, "O(b)",              "O(1)"),
-    ("Divide & Conquer",choosebestmovevisual,             False, True,  False, "O(b)",              "O(1)"),
-    ("DP",              get_dp_move_generator,           False, False, False, "O(|S|)",             "O(|S|)"),
-    ("BT (No Heur)",    bt_noheur_visual,                False, False, True,  "O(b^d)",             "O(d) in-place"),
-    ("Backtracking",    get_backtracking_move_generator, False, False, False, "O(b^d/2)–O(b^d)",   "O(d) in-place"),
+    ("Greedy",          'greedy',    "O(b)",              "O(1)"),
+    ("Divide & Conquer",'dnc',       "O(b)",              "O(1)"),
+    ("DP",              'dp',        "O(|S|)",             "O(|S|)"),
+    ("BT (No Heur)",    'bt_noheur', "O(b^d)",             "O(d) in-place"),
+    ("Backtracking",    'bt',        "O(b^d/2)–O(b^d)",   "O(d) in-place"),
 ]
 
 NAMES  = [a[0] for a in ALGOS]
@@ -65,64 +53,99 @@ COMPLEXITY_ROWS = [
     ("Backtracking",     "O(b^d/2) – O(b^d)",    "O(d)  [in-place]", "Single board; undo/redo; highly optimal space"),
 ]
 
+# Benchmark position (from the benchmark suite: the standard start position)
+POSITION = 'opening'
+
+# ── Result cache ──────────────────────────────────────────────────────────────
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'analysis_cache.json')
+CODE_VERSION = code_version()
+
+def cache_key(engine, depth, position=POSITION):
+    return f"{engine}|{depth}|{position}|{CODE_VERSION}"
+
+def load_cache():
+    try:
+        with open(CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    tmp = CACHE_PATH + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp, CACHE_PATH)
+
 # ── Figure ────────────────────────────────────────────────────────────────────
 
-plt.style.use('seaborn-v0_8-whitegrid')
-fig = plt.figure(figsize=(16, 9), facecolor='#f5f5f5')
-fig.suptitle("Othello AI  ·  Algorithm Analysis",
-             fontsize=17, fontweight='bold', color='#222', y=0.97)
-
-gs = gridspec.GridSpec(3, 2, figure=fig,
-                       left=0.07, right=0.96, top=0.91, bottom=0.04,
-                       hspace=0.55, wspace=0.30,
-                       height_ratios=[4, 0.55, 1.8])
-
-ax_time  = fig.add_subplot(gs[0, 0])
-ax_nodes = fig.add_subplot(gs[0, 1])
-ax_ctrl  = fig.add_subplot(gs[1, :])
-ax_table = fig.add_subplot(gs[2, :])
-ax_ctrl.set_axis_off()
-ax_table.set_axis_off()
-
-for ax in (ax_time, ax_nodes):
-    ax.set_facecolor('white')
-    for sp in ax.spines.values():
-        sp.set_color('#ccc')
-
-# ── Controls ──────────────────────────────────────────────────────────────────
-
-ax_s = plt.axes([0.15, 0.385, 0.50, 0.025], facecolor='#e8e8e8')
-slider = Slider(ax_s, 'Depth  d =', valmin=1, valmax=5,
-                valinit=3, valstep=1, color='#4a90d9')
-slider.label.set_color('#333')
-slider.valtext.set_color('#1a6bb5')
-slider.valtext.set_fontsize(13)
-slider.valtext.set_fontweight('bold')
-
-ax_b = plt.axes([0.70, 0.373, 0.14, 0.045])
-btn = Button(ax_b, 'Run Benchmark', color='#4a90d9', hovercolor='#357abd')
-btn.label.set_fontsize(12)
-btn.label.set_color('white')
-
-# ── Complexity table ──────────────────────────────────────────────────────────
-
-col_x      = [0.01, 0.23, 0.46, 0.65, 0.82]
-row_y      = [0.88, 0.72, 0.56, 0.40, 0.24, 0.08]
-hdr_color  = '#1a6bb5'
-row_colors = ['#c0392b', '#d35400', '#27ae60', '#8e44ad', '#2980b9']
-
-for ci, (txt, x) in enumerate(zip(COMPLEXITY_ROWS[0], col_x)):
-    ax_table.text(x, row_y[0], txt, transform=ax_table.transAxes,
-                  fontsize=10, fontweight='bold', color=hdr_color, va='top')
-
-for ri, row in enumerate(COMPLEXITY_ROWS[1:], 1):
-    for ci, (cell, x) in enumerate(zip(row, col_x)):
-        ax_table.text(x, row_y[ri], cell, transform=ax_table.transAxes,
-                      fontsize=9.5, va='top', fontfamily='monospace',
-                      color=row_colors[ri-1] if ci == 0 else '#333')
-
-ax_table.plot([0, 1], [0.955, 0.955], color='#ccc', linewidth=1,
-              transform=ax_table.transAxes, clip_on=False)
+def build_figure():
+    global fig, ax_time, ax_nodes, slider, btn, btn_scaling, time_cells
+
+    plt.style.use('seaborn-v0_8-whitegrid')
+    fig = plt.figure(figsize=(16, 9), facecolor='#f5f5f5')
+    fig.suptitle("Othello AI  ·  Algorithm Analysis",
+                 fontsize=17, fontweight='bold', color='#222', y=0.97)
+
+    gs = gridspec.GridSpec(3, 2, figure=fig,
+                           left=0.07, right=0.96, top=0.91, bottom=0.04,
+                           hspace=0.55, wspace=0.30,
+                           height_ratios=[4, 0.55, 1.8])
+
+    ax_time  = fig.add_subplot(gs[0, 0])
+    ax_nodes = fig.add_subplot(gs[0, 1])
+    ax_ctrl  = fig.add_subplot(gs[1, :])
+    ax_table = fig.add_subplot(gs[2, :])
+    ax_ctrl.set_axis_off()
+    ax_table.set_axis_off()
+
+    for ax in (ax_time, ax_nodes):
+        ax.set_facecolor('white')
+        for sp in ax.spines.values():
+            sp.set_color('#ccc')
+
+    # ── Controls ──────────────────────────────────────────────────────────────
+
+    ax_s = plt.axes([0.15, 0.385, 0.50, 0.025], facecolor='#e8e8e8')
+    slider = Slider(ax_s, 'Depth  d =', valmin=1, valmax=5,
+                    valinit=3, valstep=1, color='#4a90d9')
+    slider.label.set_color('#333')
+    slider.valtext.set_color('#1a6bb5')
+    slider.valtext.set_fontsize(13)
+    slider.valtext.set_fontweight('bold')
+
+    ax_b = plt.axes([0.70, 0.373, 0.14, 0.045])
+    btn = Button(ax_b, 'Run Benchmark', color='#4a90d9', hovercolor='#357abd')
+    btn.label.set_fontsize(12)
+    btn.label.set_color('white')
+
+    ax_sc = plt.axes([0.855, 0.373, 0.10, 0.045])
+    btn_scaling = Button(ax_sc, 'Scaling', color='#27ae60', hovercolor='#1e8449')
+    btn_scaling.label.set_fontsize(12)
+    btn_scaling.label.set_color('white')
+
+    # ── Complexity table ──────────────────────────────────────────────────────
+
+    col_x      = [0.01, 0.23, 0.46, 0.65, 0.82]
+    row_y      = [0.88, 0.72, 0.56, 0.40, 0.24, 0.08]
+    hdr_color  = '#1a6bb5'
+    row_colors = ['#c0392b', '#d35400', '#27ae60', '#8e44ad', '#2980b9']
+
+    for ci, (txt, x) in enumerate(zip(COMPLEXITY_ROWS[0], col_x)):
+        ax_table.text(x, row_y[0], txt, transform=ax_table.transAxes,
+                      fontsize=10, fontweight='bold', color=hdr_color, va='top')
+
+    time_cells = []     # Time Complexity text per algorithm, updated by the scaling fit
+    for ri, row in enumerate(COMPLEXITY_ROWS[1:], 1):
+        for ci, (cell, x) in enumerate(zip(row, col_x)):
+            text = ax_table.text(x, row_y[ri], cell, transform=ax_table.transAxes,
+                                 fontsize=9.5, va='top', fontfamily='monospace',
+                                 color=row_colors[ri-1] if ci == 0 else '#333')
+            if ci == 1:
+                time_cells.append(text)
+
+    ax_table.plot([0, 1], [0.955, 0.955], color='#ccc', linewidth=1,
+                  transform=ax_table.transAxes, clip_on=False)
 
 # ── Chart draw ────────────────────────────────────────────────────────────────
 
@@ -162,59 +185,173 @@ def draw_charts(disp_t, disp_n, depth, final=False):
                  bbox=dict(facecolor='white', edgecolor='#1a5276', alpha=0.8, pad=4))
     fig.canvas.draw_idle()
 
-# ── Benchmark callback ────────────────────────────────────────────────────────
+# ── Background benchmark runs ─────────────────────────────────────────────────
 
 num_algos = len(ALGOS)
-prev = {'t': [0.0]*num_algos, 'n': [0.0]*num_algos}
-
-def run_benchmark(_event=None):
-    depth = int(slider.val)
-    btn.label.set_text('Computing...')
-    btn.color = '#888'
-    fig.canvas.draw_idle()
-    
-    # Try using root update if TkAgg, otherwise plt.pause
-    try:
-        fig.canvas.manager.window.update()
-    except Exception:
-        plt.pause(0.02)
+TICK_MS = 40        # polling / animation interval
+EASE = 0.35         # fraction of the remaining distance covered per tick
+
+view = {
+    'depth': 3,
+    'shown_t': [0.0]*num_algos, 'shown_n': [0.0]*num_algos,   # values on screen
+    'target_t': [0.0]*num_algos, 'target_n': [0.0]*num_algos, # latest results
+    'pending': {},      # future -> algorithm index
+    'settled': True,    # animation finished and final labels drawn
+}
+
+def set_result(i, seconds, nodes):
+    view['target_t'][i] = seconds
+    view['target_n'][i] = float(nodes)
+    view['settled'] = False
+
+def request_depth(depth, force=False):
+    """
+    Shows 'depth': cached results appear at once, the rest is queued on the
+    pool. force=True ignores the cache and re-measures everything.
+    """
+    view['depth'] = depth
+    for future in view['pending']:
+        future.cancel()
+    view['pending'] = {}
 
     print(f"\n[Benchmark  depth={depth}]")
-    times, nodes = [], []
-    for name, func, gr, dnc, bno, *_ in ALGOS:
-        t, n = benchmark(func, depth, is_greedy=gr, is_dnc=dnc, is_bnoheur=bno)
-        times.append(t); nodes.append(float(n))
-        print(f"  {name:<20} {t:.5f}s   {int(n)} nodes")
-
-    FRAMES = 25
-    pt, pn = list(prev['t']), list(prev['n'])
-    
-    # Pre-clear axes for performance
-    ax_time.clear()
-    ax_nodes.clear()
-    
-    for frame in range(FRAMES):
-        a = (frame + 1) / FRAMES
-        disp_t = [pt[i] + (times[i] - pt[i]) * a for i in range(num_algos)]
-        disp_n = [pn[i] + (nodes[i] - pn[i]) * a for i in range(num_algos)]
-        draw_charts(disp_t, disp_n, depth, final=(frame == FRAMES - 1))
-        
-        try:
-            fig.canvas.manager.window.update()
-            time.sleep(0.015)
-        except Exception:
-            plt.pause(0.018)
-
-    prev['t'] = list(times)
-    prev['n'] = list(nodes)
-
-    btn.label.set_text('Run Benchmark')
-    btn.color = '#4a90d9'
+    for i, (name, engine, *_) in enumerate(ALGOS):
+        entry = None if force else cache.get(cache_key(engine, depth))
+        if entry is not None:
+            set_result(i, entry['time'], entry['nodes'])
+            print(f"  {name:<20} {entry['time']:.5f}s   {entry['nodes']} nodes (cached)")
+        else:
+            future = pool.submit(analysis_task, (engine, depth, POSITION))
+            view['pending'][future] = i
+
+    if view['pending']:
+        btn.label.set_text('Computing...')
+        btn.color = '#888'
     fig.canvas.draw_idle()
 
-btn.on_clicked(run_benchmark)
-slider.on_changed(run_benchmark)
+# ── Scaling sweep ─────────────────────────────────────────────────────────────
+
+SCALING_DEPTHS = [1, 2, 3, 4]
+SCALING_POSITIONS = [name for name, _, _ in SUITE]
+
+sweep = {'pending': set(), 'runs': {}}
+
+def scaling_engines():
+    return [engine for _, engine, *_ in ALGOS if ENGINES[engine][2]]
+
+def add_sweep_run(engine, depth, position, seconds, nodes):
+    sweep['runs'].setdefault(engine, []).append((depth, position, seconds, nodes))
+
+def request_scaling():
+    """ Queues every (engine, depth, position) of the sweep not already cached. """
+    if sweep['pending']:
+        return
+    sweep['runs'] = {}
+    print(f"\n[Scaling  depths={SCALING_DEPTHS}  positions={len(SCALING_POSITIONS)}]")
+    for engine in scaling_engines():
+        for depth in SCALING_DEPTHS:
+            for position in SCALING_POSITIONS:
+                entry = cache.get(cache_key(engine, depth, position))
+                if entry is not None:
+                    add_sweep_run(engine, depth, position, entry['time'], entry['nodes'])
+                else:
+                    sweep['pending'].add(pool.submit(analysis_task, (engine, depth, position)))
+
+    if sweep['pending']:
+        btn_scaling.label.set_text('Sweeping...')
+        btn_scaling.color = '#888'
+        fig.canvas.draw_idle()
+    else:
+        finish_scaling()
+
+def finish_scaling():
+    fits = scaling.analyse(sweep['runs'], SCALING_POSITIONS)
+    scaling.report(fits)
+
+    for i, (_, engine, *_) in enumerate(ALGOS):
+        fit = fits.get(engine)
+        if fit is not None:
+            time_cells[i].set_text(f"{COMPLEXITY_ROWS[i + 1][1]}  ~b^{fit['exponent']:.2f}d")
+            time_cells[i].set_fontweight('bold')
+
+    btn_scaling.label.set_text('Scaling')
+    btn_scaling.color = '#27ae60'
+    fig.canvas.draw_idle()
+    scaling.plot_scaling(fits).show()
+
+def poll_scaling():
+    done = [f for f in sweep['pending'] if f.done()]
+    if not done:
+        return
+    for future in done:
+        sweep['pending'].discard(future)
+        if future.cancelled():
+            continue
+        engine, depth, position, seconds, nodes = future.result()
+        cache[cache_key(engine, depth, position)] = {'time': seconds, 'nodes': nodes}
+        add_sweep_run(engine, depth, position, seconds, nodes)
+    save_cache(cache)
+    if not sweep['pending']:
+        finish_scaling()
+
+def poll():
+    """ Timer callback: collect finished runs, then ease the bars toward them. """
+    poll_scaling()
+    for future in [f for f in view['pending'] if f.done()]:
+        i = view['pending'].pop(future)
+        if future.cancelled():
+            continue
+        engine, depth, _, seconds, nodes = future.result()
+        cache[cache_key(engine, depth)] = {'time': seconds, 'nodes': nodes}
+        save_cache(cache)
+        print(f"  {ALGOS[i][0]:<20} {seconds:.5f}s   {nodes} nodes")
+        if depth == view['depth']:
+            set_result(i, seconds, nodes)
+
+    if not view['pending'] and btn.label.get_text() != 'Run Benchmark':
+        btn.label.set_text('Run Benchmark')
+        btn.color = '#4a90d9'
+        fig.canvas.draw_idle()
+
+    if view['settled']:
+        return
+
+    moving = False
+    for shown, target in ((view['shown_t'], view['target_t']), (view['shown_n'], view['target_n'])):
+        for i in range(num_algos):
+            gap = target[i] - shown[i]
+            if abs(gap) > 1e-3 * max(abs(target[i]), 1e-9):
+                shown[i] += gap * EASE
+                moving = True
+            else:
+                shown[i] = target[i]
+
+    final = not moving and not view['pending']
+    draw_charts(view['shown_t'], view['shown_n'], view['depth'], final=final)
+    view['settled'] = final
+
+def main():
+    global pool, cache
+    cache = load_cache()
+    pool = ProcessPoolExecutor()
+    build_figure()
+
+    btn.on_clicked(lambda _event: request_depth(int(slider.val), force=True))
+    slider.on_changed(lambda val: request_depth(int(val)))
+    btn_scaling.on_clicked(lambda _event: request_scaling())
+
+    timer = fig.canvas.new_timer(interval=TICK_MS)
+    timer.add_callback(poll)
+    timer.start()
+
+    # Initialize
+    draw_charts(view['shown_t'], view['shown_n'], view['depth'])
+    request_depth(int(slider.val))
+    try:
+        plt.show()
+    finally:
+        timer.stop()
+        pool.shutdown(wait=False, cancel_futures=True)
 
-# Initialize
-run_benchmark()
-plt.show()
+if __name__ == "__main__":
+    main()
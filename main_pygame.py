@@ -1,3 +1,9 @@
+import sys
+from algorithms import profiling
+
+# --profile must be handled before the engines are imported
+profiling.install_from_argv(sys.argv)
+
 from ui.pygame_gui import PyGameUI
 
 if __name__ == "__main__":
@@ -1,3 +1,9 @@
+import sys
+from algorithms import profiling
+
+# --profile must be handled before the engines are imported
+profiling.install_from_argv(sys.argv)
+
 from ui.terminal import TerminalUI
 
 if __name__ == "__main__":
@@ -0,0 +1,303 @@
+from model.board import Board, DIRECTIONS
+
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:  # Python < 3.10
+    def popcount(x):
+        return bin(x).count('1')
+
+# size -> BitboardTables, built once per board size
+_TABLES = {}
+
+
+class BitboardTables:
+    """
+    Precomputed masks for one board size. Square (r, c) is bit r * size + c.
+        full:   every square on the board
+        shifts: (amount, mask) per direction, in DIRECTIONS order. Shifting by
+                'amount' (left if positive) and AND-ing with 'mask' moves every
+                disc one step without wrapping around a row edge.
+        bits:   square -> single-bit mask
+        index:  [r][c] -> square
+        coords: square -> (r, c)
+        rays:   square -> tuple of rays, each a tuple of single-bit masks walking
+                outwards (only rays long enough to flank are kept)
+    """
+
+    def __init__(self, size):
+        self.size = size
+        n = size * size
+        self.full = (1 << n) - 1
+
+        first_col = 0
+        last_col = 0
+        for r in range(size):
+            first_col |= 1 << (r * size)
+            last_col |= 1 << (r * size + size - 1)
+        # After a step east nothing may land in column 0, after a step west
+        # nothing may land in the last column (that would be a wrapped disc).
+        not_first_col = self.full & ~first_col
+        not_last_col = self.full & ~last_col
+
+        self.shifts = []
+        for dr, dc in DIRECTIONS:
+            mask = not_first_col if dc == 1 else not_last_col if dc == -1 else self.full
+            self.shifts.append((dr * size + dc, mask))
+
+        self.bits = [1 << sq for sq in range(n)]
+        self.index = [[r * size + c for c in range(size)] for r in range(size)]
+        self.coords = [(sq // size, sq % size) for sq in range(n)]
+
+        self.rays = []
+        for r in range(size):
+            for c in range(size):
+                rays = []
+                for dr, dc in DIRECTIONS:
+                    ray = []
+                    nr, nc = r + dr, c + dc
+                    while 0 <= nr < size and 0 <= nc < size:
+                        ray.append(1 << (nr * size + nc))
+                        nr += dr
+                        nc += dc
+                    if len(ray) >= 2:
+                        rays.append(tuple(ray))
+                self.rays.append(tuple(rays))
+
+
+def get_bitboard_tables(size):
+    """
+    Returns the cached BitboardTables for 'size', building them on first use.
+    """
+    tables = _TABLES.get(size)
+    if tables is None:
+        tables = BitboardTables(size)
+        _TABLES[size] = tables
+    return tables
+
+
+def get_moves_mask(own, opp, tables):
+    """
+    Bitmask of every legal move for the side owning 'own'.
+    Shift-and-mask flood fill along all 8 directions at once per direction.
+    """
+    empty = tables.full & ~(own | opp)
+    steps = tables.size - 3
+    moves = 0
+    for amount, mask in tables.shifts:
+        inner = opp & mask
+        if amount > 0:
+            x = (own << amount) & inner
+            for _ in range(steps):
+                x |= (x << amount) & inner
+            moves |= (x << amount) & mask & empty
+        else:
+            amount = -amount
+            x = (own >> amount) & inner
+            for _ in range(steps):
+                x |= (x >> amount) & inner
+            moves |= (x >> amount) & mask & empty
+    return moves
+
+
+def get_flips_mask(own, opp, sq, tables):
+    """
+    Bitmask of the discs flipped when the side owning 'own' plays square 'sq'.
+    0 means the move is not legal (or the square is taken).
+    """
+    flips = 0
+    for ray in tables.rays[sq]:
+        f = 0
+        for b in ray:
+            if b & opp:
+                f |= b
+            else:
+                if b & own:
+                    flips |= f
+                break
+    return flips
+
+
+class BitBoard:
+    """
+    Othello board stored as two Python ints (one bit per square per colour).
+    Python ints are arbitrary precision, so every size up to 16x16 and beyond
+    works with the same code; the per-size masks come from get_bitboard_tables.
+
+    Same public interface as Board. The flipped value returned by
+    apply_move_in_place is a bitmask, only meant to be handed back to undo_move.
+    """
+    EMPTY = Board.EMPTY
+    BLACK = Board.BLACK
+    WHITE = Board.WHITE
+
+    def __init__(self, grid=None, size=8):
+        if grid:
+            size = len(grid)
+        self.SIZE = size
+        self.tables = get_bitboard_tables(size)
+        self.black = 0
+        self.white = 0
+
+        # Make/unmake history, allocated on the first push_move()
+        self._undo_flips = None
+
+        index = self.tables.index
+        if grid:
+            for r in range(size):
+                for c in range(size):
+                    if grid[r][c] == self.BLACK:
+                        self.black |= 1 << index[r][c]
+                    elif grid[r][c] == self.WHITE:
+                        self.white |= 1 << index[r][c]
+        else:
+            # Initial setup: Center 4 discs
+            mid = size // 2
+            self.white |= 1 << index[mid-1][mid-1]
+            self.white |= 1 << index[mid][mid]
+            self.black |= 1 << index[mid-1][mid]
+            self.black |= 1 << index[mid][mid-1]
+
+    @classmethod
+    def from_board(cls, board):
+        return cls(board.grid)
+
+    @property
+    def grid(self):
+        """
+        2-D list view of the board (a fresh copy, writes are not reflected).
+        """
+        black, white = self.black, self.white
+        return [[self.BLACK if black >> sq & 1 else self.WHITE if white >> sq & 1 else self.EMPTY
+                 for sq in row] for row in self.tables.index]
+
+    def copy(self):
+        new_board = BitBoard.__new__(BitBoard)
+        new_board.SIZE = self.SIZE
+        new_board.tables = self.tables
+        new_board.black = self.black
+        new_board.white = self.white
+        new_board._undo_flips = None
+        return new_board
+
+    def _sides(self, player):
+        if player == self.BLACK:
+            return self.black, self.white
+        return self.white, self.black
+
+    def _set_sides(self, player, own, opp):
+        if player == self.BLACK:
+            self.black, self.white = own, opp
+        else:
+            self.white, self.black = own, opp
+
+    def is_on_board(self, r, c):
+        return 0 <= r < self.SIZE and 0 <= c < self.SIZE
+
+    def get_moves_mask(self, player):
+        own, opp = self._sides(player)
+        return get_moves_mask(own, opp, self.tables)
+
+    def get_valid_moves(self, player):
+        """
+        Returns a list of (r, c) tuples where 'player' can legally place a disc.
+        """
+        own, opp = self._sides(player)
+        m = get_moves_mask(own, opp, self.tables)
+        coords = self.tables.coords
+        moves = []
+        while m:
+            low = m & -m
+            moves.append(coords[low.bit_length() - 1])
+            m ^= low
+        return moves
+
+    def is_valid_move(self, r, c, player, return_debug=False):
+        """
+        Check if placing a disc at (r, c) is valid for 'player'.
+        The return_debug ray log is produced by the reference Board.
+        """
+        if return_debug:
+            return Board(self.grid).is_valid_move(r, c, player, return_debug=True)
+        if not self.is_on_board(r, c):
+            return False
+        sq = self.tables.index[r][c]
+        own, opp = self._sides(player)
+        if (own | opp) >> sq & 1:
+            return False
+        return get_flips_mask(own, opp, sq, self.tables) != 0
+
+    def apply_move(self, r, c, player):
+        """
+        Returns (new_board, flipped_cells)
+        flipped_cells is a list of (r, c) tuples that changed color.
+        """
+        new_board = self.copy()
+        flips = new_board.apply_move_in_place(r, c, player)
+        coords = self.tables.coords
+        flipped = []
+        while flips:
+            low = flips & -flips
+            flipped.append(coords[low.bit_length() - 1])
+            flips ^= low
+        return new_board, flipped
+
+    def apply_move_in_place(self, r, c, player):
+        """
+        Applies a move directly to this board instance without copying.
+        Returns the flipped discs as a bitmask to allow undoing.
+        """
+        sq = self.tables.index[r][c]
+        own, opp = self._sides(player)
+        flips = get_flips_mask(own, opp, sq, self.tables)
+        self._set_sides(player, own | flips | self.tables.bits[sq], opp & ~flips)
+        return flips
+
+    def undo_move(self, r, c, player, flipped_cells):
+        """
+        Reverts a move that was applied in-place.
+        """
+        bit = self.tables.bits[self.tables.index[r][c]]
+        own, opp = self._sides(player)
+        self._set_sides(player, own & ~(flipped_cells | bit), opp | flipped_cells)
+
+    def _init_undo_stack(self):
+        n = self.SIZE * self.SIZE + 1
+        self._undo_flips = [0] * n
+        self._undo_moves = [0] * n
+        self._undo_players = [0] * n
+        self._undo_depth = 0
+
+    def push_move(self, r, c, player):
+        """
+        Applies a move in-place and records its flip bitmask on the internal
+        undo stack. Returns the number of flipped discs. Undo with pop_move().
+        """
+        if self._undo_flips is None:
+            self._init_undo_stack()
+        depth = self._undo_depth
+        sq = self.tables.index[r][c]
+        own, opp = self._sides(player)
+        flips = get_flips_mask(own, opp, sq, self.tables)
+        self._set_sides(player, own | flips | self.tables.bits[sq], opp & ~flips)
+        self._undo_flips[depth] = flips
+        self._undo_moves[depth] = sq
+        self._undo_players[depth] = player
+        self._undo_depth = depth + 1
+        return popcount(flips)
+
+    def pop_move(self):
+        """
+        Reverts the most recent push_move().
+        """
+        depth = self._undo_depth - 1
+        self._undo_depth = depth
+        flips = self._undo_flips[depth]
+        player = self._undo_players[depth]
+        own, opp = self._sides(player)
+        self._set_sides(player, own & ~(flips | self.tables.bits[self._undo_moves[depth]]), opp | flips)
+
+    def get_counts(self):
+        return popcount(self.black), popcount(self.white)
+
+    def is_full(self):
+        return (self.black | self.white) == self.tables.full
@@ -1,3 +1,9 @@
+# The 8 ray directions, in the order every move generator scans them
+DIRECTIONS = (
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1)
+)
 
 class Board:
     """
@@ -29,6 +35,9 @@ class Board:
             self.grid[mid-1][mid] = self.BLACK
             self.grid[mid][mid-1] = self.BLACK
 
+        # Make/unmake history, allocated on the first push_move()
+        self._undo_cells = None
+
     def is_on_board(self, r, c):
         return 0 <= r < self.SIZE and 0 <= c < self.SIZE
 
@@ -168,6 +177,90 @@ class Board:
         for fr, fc in flipped_cells:
             self.grid[fr][fc] = opponent
 
+    def _init_undo_stack(self):
+        """
+        Preallocates the make/unmake history as flat int arrays.
+            _undo_cells:   flipped cells as r * SIZE + c, one run per move
+            _undo_marks:   start of each move's run in _undo_cells
+            _undo_moves:   placed cell as r * SIZE + c
+            _undo_players: player who made each move
+        """
+        n = self.SIZE * self.SIZE
+        self._undo_cells = [0] * (n * 4)
+        self._undo_marks = [0] * (n + 1)
+        self._undo_moves = [0] * (n + 1)
+        self._undo_players = [0] * (n + 1)
+        self._undo_top = 0
+        self._undo_depth = 0
+
+    def push_move(self, r, c, player):
+        """
+        Applies a move in-place and records it on the internal undo stack.
+        Unlike apply_move_in_place, no flip list is built: the flipped cells
+        go into the preallocated history and pop_move() restores them.
+        Returns the number of flipped discs.
+        """
+        if self._undo_cells is None:
+            self._init_undo_stack()
+
+        grid = self.grid
+        size = self.SIZE
+        opponent = -player
+        cells = self._undo_cells
+        depth = self._undo_depth
+        top = self._undo_top
+        start = top
+
+        self._undo_marks[depth] = start
+        self._undo_moves[depth] = r * size + c
+        self._undo_players[depth] = player
+        grid[r][c] = player
+
+        for dr, dc in DIRECTIONS:
+            nr, nc = r + dr, c + dc
+            n = 0
+            while 0 <= nr < size and 0 <= nc < size and grid[nr][nc] == opponent:
+                nr += dr
+                nc += dc
+                n += 1
+
+            # If we sandwich opponent pieces with our own
+            if n and 0 <= nr < size and 0 <= nc < size and grid[nr][nc] == player:
+                if top + n > len(cells):
+                    cells.extend([0] * len(cells))
+                nr, nc = r + dr, c + dc
+                while n:
+                    grid[nr][nc] = player
+                    cells[top] = nr * size + nc
+                    top += 1
+                    nr += dr
+                    nc += dc
+                    n -= 1
+
+        self._undo_top = top
+        self._undo_depth = depth + 1
+        return top - start
+
+    def pop_move(self):
+        """
+        Reverts the most recent push_move().
+        """
+        depth = self._undo_depth - 1
+        self._undo_depth = depth
+        size = self.SIZE
+        grid = self.grid
+        cells = self._undo_cells
+        start = self._undo_marks[depth]
+        opponent = -self._undo_players[depth]
+
+        sq = self._undo_moves[depth]
+        grid[sq // size][sq % size] = self.EMPTY
+
+        for i in range(start, self._undo_top):
+            sq = cells[i]
+            grid[sq // size][sq % size] = opponent
+        self._undo_top = start
+
     def get_counts(self):
         black = sum(row.count(self.BLACK) for row in self.grid)
         white = sum(row.count(self.WHITE) for row in self.grid)
@@ -38,6 +38,30 @@ class GameState:
         
         return successors
 
+    def iter_successors(self, order_moves=None):
+        """
+        Lazy version of get_successors().
+        Yields (move, GameState) pairs, building each child board only when the
+        caller asks for it, so a search that cuts off early never pays for the
+        children it skips. A pass yields (None, state with the player swapped).
+
+        order_moves: optional hook that receives the list of (r, c) moves and
+        returns them in the order they should be visited.
+        """
+        moves = self.board.get_valid_moves(self.player)
+
+        if not moves:
+            if self.board.get_valid_moves(-self.player):
+                yield None, GameState(self.board, -self.player)
+            return
+
+        if order_moves is not None:
+            moves = order_moves(moves)
+
+        for r, c in moves:
+            new_board, _ = self.board.apply_move(r, c, self.player)
+            yield (r, c), GameState(new_board, -self.player)
+
     def has_any_valid_moves(self):
         # Quick check without generating all moves
         return len(self.board.get_valid_moves(self.player)) > 0
@@ -45,8 +69,11 @@ class GameState:
     def is_terminal(self):
         """
         Check if this node is a terminal node (leaf) in the game tree.
+        Same answer as 'not get_successors()', without building any child boards.
         """
-        return not self.get_successors()
+        if self.board.get_valid_moves(self.player):
+            return False
+        return not self.board.get_valid_moves(-self.player)
 
     def get_winner(self):
         """
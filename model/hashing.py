@@ -0,0 +1,54 @@
+import random
+from model.board import Board
+
+# Fixed seed so hashes are stable across runs (traces refer to them)
+ZOBRIST_SEED = 0x07E110
+
+# size -> ZobristTables, built once per board size
+_TABLES = {}
+
+
+class ZobristTables:
+    """
+    Random 64-bit keys for one board size.
+        black, white: [r][c] -> key xored in when the cell holds that colour
+        side:         key xored in when White is to move
+    """
+
+    def __init__(self, size):
+        rng = random.Random(ZOBRIST_SEED * 31 + size)
+        self.size = size
+        self.black = [[rng.getrandbits(64) for _ in range(size)] for _ in range(size)]
+        self.white = [[rng.getrandbits(64) for _ in range(size)] for _ in range(size)]
+        self.side = rng.getrandbits(64)
+
+
+def get_zobrist_tables(size):
+    """
+    Returns the cached ZobristTables for 'size', building them on first use.
+    """
+    tables = _TABLES.get(size)
+    if tables is None:
+        tables = ZobristTables(size)
+        _TABLES[size] = tables
+    return tables
+
+
+def zobrist_hash(grid, player):
+    """
+    64-bit Zobrist hash of a position (grid plus side to move).
+    """
+    size = len(grid)
+    tables = get_zobrist_tables(size)
+    h = tables.side if player == Board.WHITE else 0
+    for r in range(size):
+        row = grid[r]
+        black = tables.black[r]
+        white = tables.white[r]
+        for c in range(size):
+            cell = row[c]
+            if cell == Board.BLACK:
+                h ^= black[c]
+            elif cell == Board.WHITE:
+                h ^= white[c]
+    return h
@@ -0,0 +1,322 @@
+from model.board import Board, DIRECTIONS
+
+# Value stored in the sentinel border around the playable area.
+# It is neither EMPTY nor a player colour, so every ray walk stops on it.
+BORDER = 2
+
+# size -> MailboxTables, built once per board size
+_TABLES = {}
+
+
+class MailboxTables:
+    """
+    Precomputed lookup tables for one board size.
+        width:   row stride of the padded array (size + 2)
+        offsets: index offset for each of the 8 directions
+        squares: playable indices in row-major order
+        coords:  padded index -> (r, c), None on the border
+        rays:    padded index -> offsets worth scanning from that square
+                 (directions with at least two cells before the border)
+        template: initial cell array (empty board with sentinel border)
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.width = size + 2
+        w = self.width
+
+        self.offsets = [dr * w + dc for dr, dc in DIRECTIONS]
+
+        self.index = [[(r + 1) * w + (c + 1) for c in range(size)] for r in range(size)]
+        self.squares = [i for row in self.index for i in row]
+
+        self.coords = [None] * (w * w)
+        for r in range(size):
+            for c in range(size):
+                self.coords[self.index[r][c]] = (r, c)
+
+        self.rays = [()] * (w * w)
+        for r in range(size):
+            for c in range(size):
+                ray = []
+                for (dr, dc), off in zip(DIRECTIONS, self.offsets):
+                    # A flank needs an opponent disc and then our own disc
+                    if 0 <= r + 2 * dr < size and 0 <= c + 2 * dc < size:
+                        ray.append(off)
+                self.rays[self.index[r][c]] = tuple(ray)
+
+        self.template = [BORDER] * (w * w)
+        for i in self.squares:
+            self.template[i] = Board.EMPTY
+
+
+def get_mailbox_tables(size):
+    """
+    Returns the cached MailboxTables for 'size', building them on first use.
+    """
+    tables = _TABLES.get(size)
+    if tables is None:
+        tables = MailboxTables(size)
+        _TABLES[size] = tables
+    return tables
+
+
+class MailboxBoard:
+    """
+    Alternative Othello board backed by a flat 1-D list with a sentinel border.
+
+    Same public interface as Board, but ray walks never need a bounds check:
+    they simply stop when they reach a BORDER cell.
+    The flipped list returned by apply_move_in_place holds padded indices
+    and is only meant to be handed back to undo_move.
+    """
+    EMPTY = Board.EMPTY
+    BLACK = Board.BLACK
+    WHITE = Board.WHITE
+
+    def __init__(self, grid=None, size=8):
+        if grid:
+            size = len(grid)
+        self.SIZE = size
+        self.tables = get_mailbox_tables(size)
+        self.cells = self.tables.template[:]
+
+        # Make/unmake history, allocated on the first push_move()
+        self._undo_cells = None
+
+        if grid:
+            index = self.tables.index
+            for r in range(size):
+                for c in range(size):
+                    self.cells[index[r][c]] = grid[r][c]
+        else:
+            # Initial setup: Center 4 discs
+            mid = size // 2
+            index = self.tables.index
+            self.cells[index[mid-1][mid-1]] = self.WHITE
+            self.cells[index[mid][mid]] = self.WHITE
+            self.cells[index[mid-1][mid]] = self.BLACK
+            self.cells[index[mid][mid-1]] = self.BLACK
+
+    @classmethod
+    def from_board(cls, board):
+        return cls(board.grid)
+
+    @property
+    def grid(self):
+        """
+        2-D list view of the board (a fresh copy, writes are not reflected).
+        """
+        cells = self.cells
+        return [[cells[i] for i in row] for row in self.tables.index]
+
+    def copy(self):
+        new_board = MailboxBoard.__new__(MailboxBoard)
+        new_board.SIZE = self.SIZE
+        new_board.tables = self.tables
+        new_board.cells = self.cells[:]
+        new_board._undo_cells = None
+        return new_board
+
+    def is_on_board(self, r, c):
+        return 0 <= r < self.SIZE and 0 <= c < self.SIZE
+
+    def get_valid_moves(self, player):
+        """
+        Returns a list of (r, c) tuples where 'player' can legally place a disc.
+        """
+        cells = self.cells
+        rays = self.tables.rays
+        coords = self.tables.coords
+        opponent = -player
+        moves = []
+
+        for i in self.tables.squares:
+            if cells[i] != self.EMPTY:
+                continue
+            for d in rays[i]:
+                j = i + d
+                if cells[j] != opponent:
+                    continue
+                j += d
+                while cells[j] == opponent:
+                    j += d
+                if cells[j] == player:
+                    moves.append(coords[i])
+                    break
+        return moves
+
+    def is_valid_move(self, r, c, player, return_debug=False):
+        """
+        Check if placing a disc at (r, c) is valid for 'player'.
+        Mirrors Board.is_valid_move, including the return_debug ray log.
+        """
+        if not self.is_on_board(r, c) or self.cells[self.tables.index[r][c]] != self.EMPTY:
+            return (False, []) if return_debug else False
+
+        cells = self.cells
+        coords = self.tables.coords
+        i = self.tables.index[r][c]
+        opponent = -player
+
+        has_valid_flank = False
+        debug_log = []
+
+        for (dr, dc), d in zip(DIRECTIONS, self.tables.offsets):
+            j = i + d
+            ray_valid = False
+
+            if cells[j] == opponent:
+                while cells[j] == opponent:
+                    j += d
+                if cells[j] == player:
+                    ray_valid = True
+                    has_valid_flank = True
+
+            if return_debug:
+                # Log the last on-board cell of the ray
+                end = coords[j] if cells[j] != BORDER else coords[j - d]
+                debug_log.append({
+                    'start': (r, c),
+                    'dir': (dr, dc),
+                    'end': end,
+                    'valid': ray_valid
+                })
+            elif has_valid_flank:
+                return True
+
+        if return_debug:
+            return has_valid_flank, debug_log
+
+        return has_valid_flank
+
+    def _flip(self, i, player):
+        """
+        Places 'player' at padded index i and flips every flanked run.
+        Returns the padded indices of the flipped discs.
+        """
+        cells = self.cells
+        opponent = -player
+        cells[i] = player
+
+        all_flipped = []
+        for d in self.tables.rays[i]:
+            j = i + d
+            if cells[j] != opponent:
+                continue
+            j += d
+            while cells[j] == opponent:
+                j += d
+            if cells[j] == player:
+                k = i + d
+                while k != j:
+                    cells[k] = player
+                    all_flipped.append(k)
+                    k += d
+        return all_flipped
+
+    def apply_move(self, r, c, player):
+        """
+        Returns (new_board, flipped_cells)
+        flipped_cells is a list of (r, c) tuples that changed color.
+        """
+        new_board = self.copy()
+        flipped = new_board._flip(self.tables.index[r][c], player)
+        coords = self.tables.coords
+        return new_board, [coords[j] for j in flipped]
+
+    def apply_move_in_place(self, r, c, player):
+        """
+        Applies a move directly to this board instance without copying.
+        Returns the flipped padded indices to allow undoing.
+        """
+        return self._flip(self.tables.index[r][c], player)
+
+    def undo_move(self, r, c, player, flipped_cells):
+        """
+        Reverts a move that was applied in-place.
+        """
+        cells = self.cells
+        cells[self.tables.index[r][c]] = self.EMPTY
+        opponent = -player
+        for j in flipped_cells:
+            cells[j] = opponent
+
+    def _init_undo_stack(self):
+        """
+        Preallocates the make/unmake history as flat int arrays
+        (same layout as Board, but holding padded indices).
+        """
+        n = self.SIZE * self.SIZE
+        self._undo_cells = [0] * (n * 4)
+        self._undo_marks = [0] * (n + 1)
+        self._undo_moves = [0] * (n + 1)
+        self._undo_players = [0] * (n + 1)
+        self._undo_top = 0
+        self._undo_depth = 0
+
+    def push_move(self, r, c, player):
+        """
+        Applies a move in-place and records it on the internal undo stack.
+        Returns the number of flipped discs. Undo with pop_move().
+        """
+        if self._undo_cells is None:
+            self._init_undo_stack()
+
+        cells = self.cells
+        stack = self._undo_cells
+        opponent = -player
+        i = self.tables.index[r][c]
+        depth = self._undo_depth
+        top = self._undo_top
+        start = top
+
+        self._undo_marks[depth] = start
+        self._undo_moves[depth] = i
+        self._undo_players[depth] = player
+        cells[i] = player
+
+        for d in self.tables.rays[i]:
+            j = i + d
+            if cells[j] != opponent:
+                continue
+            j += d
+            while cells[j] == opponent:
+                j += d
+            if cells[j] == player:
+                if top + (j - i) // d > len(stack):
+                    stack.extend([0] * len(stack))
+                k = i + d
+                while k != j:
+                    cells[k] = player
+                    stack[top] = k
+                    top += 1
+                    k += d
+
+        self._undo_top = top
+        self._undo_depth = depth + 1
+        return top - start
+
+    def pop_move(self):
+        """
+        Reverts the most recent push_move().
+        """
+        depth = self._undo_depth - 1
+        self._undo_depth = depth
+        cells = self.cells
+        stack = self._undo_cells
+        start = self._undo_marks[depth]
+        opponent = -self._undo_players[depth]
+
+        cells[self._undo_moves[depth]] = self.EMPTY
+        for n in range(start, self._undo_top):
+            cells[stack[n]] = opponent
+        self._undo_top = start
+
+    def get_counts(self):
+        black = self.cells.count(self.BLACK)
+        white = self.cells.count(self.WHITE)
+        return black, white
+
+    def is_full(self):
+        return self.cells.count(self.EMPTY) == 0
@@ -0,0 +1,218 @@
+"""
+Compact position keys and sorted, memory-mapped key files.
+
+A position key packs a whole position into one int:
+
+    key = ((black << n) | white) << 1 | side      n = size * size, side 1 = White to move
+
+black / white are BitBoard masks (square r * size + c). Keys are exact (no
+hashing), and on disk each one takes key_width(size) big-endian bytes, so
+sorting the records sorts the keys. An 8x8 key is 17 bytes instead of a
+GameState with a list-of-lists board.
+"""
+import os
+import mmap
+from heapq import merge
+from model.board import Board
+
+
+def key_width(size):
+    return (2 * size * size + 1 + 7) // 8
+
+def encode_key(black, white, player, size):
+    n = size * size
+    return (((black << n) | white) << 1) | (player == Board.WHITE)
+
+def decode_key(key, size):
+    """ (black, white, player) of a position key. """
+    n = size * size
+    player = Board.WHITE if key & 1 else Board.BLACK
+    key >>= 1
+    return key >> n, key & ((1 << n) - 1), player
+
+def key_from_board(board, player):
+    black = white = 0
+    bit = 1
+    for row in board.grid:
+        for v in row:
+            if v == Board.BLACK:
+                black |= bit
+            elif v == Board.WHITE:
+                white |= bit
+            bit <<= 1
+    return encode_key(black, white, player, board.SIZE)
+
+def key_from_state(state):
+    return key_from_board(state.board, state.player)
+
+
+def write_key_file(path, keys, width):
+    """
+    Writes 'keys' (ascending, no duplicates) as fixed-width records.
+    Returns the number of keys written.
+    """
+    count = 0
+    buf = []
+    with open(path, 'wb') as f:
+        for key in keys:
+            buf.append(key.to_bytes(width, 'big'))
+            count += 1
+            if len(buf) >= 65536:
+                f.write(b''.join(buf))
+                buf = []
+        f.write(b''.join(buf))
+    return count
+
+
+class KeyFile:
+    """
+    Read-only view of a sorted key file through mmap: len(), indexing,
+    ascending iteration and binary search, without loading it into memory.
+    """
+
+    def __init__(self, path, width):
+        self.path = path
+        self.width = width
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._count = size // width
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        start = i * self.width
+        return int.from_bytes(self._map[start:start + self.width], 'big')
+
+    def __iter__(self):
+        data, width = self._map, self.width
+        for start in range(0, self._count * width, width):
+            yield int.from_bytes(data[start:start + width], 'big')
+
+    def find(self, key):
+        """ Index of 'key', or -1 if it is not in the file. """
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k = self[mid]
+            if k < key:
+                lo = mid + 1
+            elif k > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def close(self):
+        if self._file is not None:
+            if self._count:
+                self._map.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def unique_sorted(keys):
+    """ Drops repeats from an ascending iterable of keys. """
+    last = None
+    for key in keys:
+        if key != last:
+            yield key
+            last = key
+
+def merge_key_files(paths, out_path, width):
+    """
+    External merge of sorted key files into one sorted file without
+    duplicates. Returns the number of keys written.
+    """
+    files = [KeyFile(p, width) for p in paths]
+    try:
+        return write_key_file(out_path, unique_sorted(merge(*files)), width)
+    finally:
+        for f in files:
+            f.close()
+
+
+# ── Board symmetry ────────────────────────────────────────────────────────────
+
+# size -> SymmetryTables
+_SYMMETRY = {}
+
+
+class SymmetryTables:
+    """
+    The 8 symmetries of the square board (rotations and reflections) as
+    byte lookup tables: maps[t][i][b] is the image under symmetry t of the
+    squares set in byte i of a mask having the value b, so transforming a
+    mask costs one lookup per byte instead of one step per square.
+    """
+
+    def __init__(self, size):
+        n = size * size
+        self.nbytes = (n + 7) // 8
+        self.maps = []
+        for t in range(8):
+            image = []
+            for sq in range(n):
+                r, c = divmod(sq, size)
+                if t & 4:
+                    r, c = c, r
+                if t & 2:
+                    r = size - 1 - r
+                if t & 1:
+                    c = size - 1 - c
+                image.append(r * size + c)
+            tables = []
+            for i in range(self.nbytes):
+                table = [0] * 256
+                for b in range(256):
+                    mask = 0
+                    for bit in range(8):
+                        sq = i * 8 + bit
+                        if b >> bit & 1 and sq < n:
+                            mask |= 1 << image[sq]
+                    table[b] = mask
+                tables.append(table)
+            self.maps.append(tables)
+
+
+def get_symmetry_tables(size):
+    tables = _SYMMETRY.get(size)
+    if tables is None:
+        tables = _SYMMETRY[size] = SymmetryTables(size)
+    return tables
+
+def transform_mask(mask, tables):
+    """ Images of 'mask' under all 8 symmetries. """
+    out = []
+    for maps in tables.maps:
+        image = 0
+        m = mask
+        for table in maps:
+            image |= table[m & 255]
+            m >>= 8
+        out.append(image)
+    return out
+
+def canonical_key(key, size):
+    """
+    Smallest key among the 8 symmetric images of a position. Symmetric
+    positions share it, and it commutes with move generation, so it can
+    stand for the whole class when counting positions.
+    """
+    tables = get_symmetry_tables(size)
+    n = size * size
+    side = key & 1
+    key >>= 1
+    blacks = transform_mask(key >> n, tables)
+    whites = transform_mask(key & ((1 << n) - 1), tables)
+    return min((((b << n) | w) << 1) | side for b, w in zip(blacks, whites))
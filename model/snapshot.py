@@ -0,0 +1,55 @@
+from collections import namedtuple
+from model.board import Board
+from model.game_state import GameState
+
+# Cell byte -> Board value (bytes store value % 3: 0 empty, 1 black, 2 white)
+_DECODE = (Board.EMPTY, Board.BLACK, Board.WHITE)
+
+
+class Snapshot(namedtuple('Snapshot', 'cells size player')):
+    """
+    Immutable, compact copy of a position for visualization events.
+        cells:  bytes of size*size cells in row-major order, each value % 3
+                (0 empty, 1 black, 2 white)
+        size:   board size
+        player: side to move
+    Unlike a GameState it cannot change after the event is yielded (the
+    in-place engines keep mutating their board), so events are safe to
+    buffer, and it takes a fraction of the memory.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_board(cls, board, player):
+        return cls(bytes([v % 3 for row in board.grid for v in row]), board.SIZE, player)
+
+    @classmethod
+    def from_masks(cls, black, white, size, player):
+        """ From BitBoard-style masks (square r*size+c), without building a grid. """
+        cells = bytearray(size * size)
+        for mask, value in ((black, 1), (white, 2)):
+            while mask:
+                low = mask & -mask
+                cells[low.bit_length() - 1] = value
+                mask ^= low
+        return cls(bytes(cells), size, player)
+
+    @classmethod
+    def from_state(cls, state):
+        return cls.from_board(state.board, state.player)
+
+    def cell(self, r, c):
+        return _DECODE[self.cells[r * self.size + c]]
+
+    @property
+    def grid(self):
+        """ Fresh 2-D list of Board values. """
+        size = self.size
+        cells = self.cells
+        return [[_DECODE[v] for v in cells[r * size:(r + 1) * size]] for r in range(size)]
+
+    def to_board(self):
+        return Board(self.grid, size=self.size)
+
+    def to_state(self):
+        return GameState(self.to_board(), self.player)
@@ -0,0 +1,139 @@
+"""
+Othello move-generator verification and speed test (perft).
+Run:  python3 perft.py --depth 8                      (all backends, checked against reference)
+      python3 perft.py --depth 9 --backend bitboard --workers 4 --divide
+"""
+
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from model.board import Board
+from model.mailbox_board import MailboxBoard
+from model.bitboard import BitBoard
+from benchmark import SUITE, parse_position
+
+BACKENDS = {'board': Board, 'mailbox': MailboxBoard, 'bitboard': BitBoard}
+
+# Known leaf counts from the standard 8x8 start position (Black to move).
+# A pass counts as a ply; a finished game counts as one leaf.
+REFERENCE_8X8 = {
+    1: 4, 2: 12, 3: 56, 4: 244, 5: 1396, 6: 8200, 7: 55092,
+    8: 390216, 9: 3005288, 10: 24571284, 11: 212258800,
+}
+
+def perft(board, player, depth, passed=False):
+    """
+    Counts the leaf positions 'depth' plies below the current one.
+    Uses push_move / pop_move, so it runs on any Board backend.
+    """
+    moves = board.get_valid_moves(player)
+    if not moves:
+        if passed or depth == 1:
+            # Game over (both sides stuck), or a pass into the last ply
+            return 1
+        return perft(board, -player, depth - 1, True)
+
+    if depth == 1:
+        # Bulk count: every legal move is one leaf
+        return len(moves)
+
+    nodes = 0
+    for r, c in moves:
+        board.push_move(r, c, player)
+        nodes += perft(board, -player, depth - 1)
+        board.pop_move()
+    return nodes
+
+def divide(backend, grid, player, depth):
+    """
+    Leaf count below each root move: [(move, nodes)], move None for a pass.
+    """
+    board = BACKENDS[backend](grid)
+    moves = board.get_valid_moves(player)
+    if not moves:
+        return [(None, perft(board, player, depth))]
+    out = []
+    for move in moves:
+        out.append((move, _subtree((backend, grid, player, move, depth))))
+    return out
+
+def _subtree(task):
+    """ Worker entry point: perft below one root move. """
+    backend, grid, player, move, depth = task
+    board = BACKENDS[backend](grid)
+    if depth == 1:
+        return 1
+    board.push_move(move[0], move[1], player)
+    return perft(board, -player, depth - 1)
+
+def run(backend, grid, player, depth, workers):
+    """
+    Returns ([(move, nodes)], seconds). With workers > 1 the root moves are
+    split across a process pool.
+    """
+    t0 = time.perf_counter()
+    board = BACKENDS[backend](grid)
+    moves = board.get_valid_moves(player)
+
+    if workers > 1 and moves and depth > 1:
+        tasks = [(backend, grid, player, move, depth) for move in moves]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(_subtree, tasks))
+        result = list(zip(moves, counts))
+    else:
+        result = divide(backend, grid, player, depth)
+    return result, time.perf_counter() - t0
+
+def main():
+    sys.setrecursionlimit(10000)
+    parser = argparse.ArgumentParser(description="Perft: count leaf nodes to a fixed depth.")
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--backend', choices=list(BACKENDS) + ['all'], default='all')
+    parser.add_argument('--position', default='start',
+                        help="'start' or a name from the benchmark suite: " + ", ".join(n for n, _, _ in SUITE))
+    parser.add_argument('--size', type=int, default=8, help="board size for the start position")
+    parser.add_argument('--workers', type=int, default=1, help="split the root moves over N processes")
+    parser.add_argument('--divide', action='store_true', help="print the count below each root move")
+    args = parser.parse_args()
+
+    if args.position == 'start':
+        state_board, player = Board(size=args.size), Board.BLACK
+    else:
+        entry = next((e for e in SUITE if e[0] == args.position), None)
+        if entry is None:
+            parser.error(f"unknown position {args.position!r}")
+        state = parse_position(entry[1], entry[2])
+        state_board, player = state.board, state.player
+    grid = state_board.grid
+
+    expected = None
+    if args.position == 'start' and args.size == 8:
+        expected = REFERENCE_8X8.get(args.depth)
+
+    backends = list(BACKENDS) if args.backend == 'all' else [args.backend]
+    print(f"[Perft  position={args.position}  size={len(grid)}  depth={args.depth}  workers={args.workers}]")
+    failed = False
+    for backend in backends:
+        result, elapsed = run(backend, grid, player, args.depth, args.workers)
+        total = sum(n for _, n in result)
+        status = ""
+        if expected is None:
+            # No reference: the first backend is the reference for the others
+            expected = total
+            status = "(reference)"
+        elif total == expected:
+            status = "OK"
+        else:
+            status = f"MISMATCH (expected {expected})"
+            failed = True
+        print(f"  {backend:<9} {total:>12,} leaves {elapsed:>9.3f}s {total / max(elapsed, 1e-9):>12,.0f} leaves/s  {status}")
+        if args.divide:
+            for move, n in result:
+                print(f"      {'pass' if move is None else move}: {n}")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
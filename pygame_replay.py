@@ -0,0 +1,146 @@
+"""
+Othello – Search Trace Replay
+Plays back traces recorded in the GUI (press R while playing) without re-running the search.
+Run:  python3 pygame_replay.py traces/20261019_120000_dp.trace
+      python3 pygame_replay.py traces/            (every trace in the folder, in name order)
+Keys: SPACE pause · UP / DOWN speed x2 / ÷2 · RIGHT single step · A algo view · H heatmap · F fullscreen
+"""
+
+import os
+import sys
+import pygame
+from ui.pygame_gui import PyGameUI, STATE_PLAYING, MODE_PvCPU
+from algorithms.trace import load_trace
+
+MIN_SPEED = 1 / 32
+MAX_SPEED = 4096
+
+
+class ReplayUI(PyGameUI):
+    def __init__(self, paths):
+        super().__init__()
+        pygame.display.set_caption("Othello - Search Trace Replay")
+        self.paths = paths
+        self.trace_index = -1
+        self.trace = None
+        self.events = None
+        self.event_number = 0
+
+        self.speed = 1.0    # events per frame
+        self.pending = 0.0
+        self.paused = False
+
+        self.algo_mode = True
+        self.game_mode = MODE_PvCPU
+        self.app_state = STATE_PLAYING
+        self.load_next()
+
+    def load_next(self):
+        """ Starts the next trace file; returns False after the last one. """
+        self.trace_index += 1
+        if self.trace_index >= len(self.paths):
+            self.events = None
+            self.paused = True
+            return False
+
+        self.trace = load_trace(self.paths[self.trace_index])
+        self.grid_size = self.trace.size
+        self.calculate_layout(self.screen_width, self.screen_height)
+        self.game_state = self.trace.state(self.trace.root)
+        self.events = self.trace.replay()
+        self.event_number = 0
+        self.current_vis_data = None
+        return True
+
+    def step(self):
+        if self.events is None:
+            return
+        try:
+            vis = next(self.events)
+        except StopIteration:
+            self.load_next()
+            return
+
+        self.event_number += 1
+        if vis['type'] == 'result':
+            if vis['state'] is not None:
+                self.game_state = vis['state']
+            self.current_vis_data = None
+            self.play_sound('move')
+        else:
+            self.current_vis_data = vis
+
+    def _draw_replay_status(self):
+        if self.trace is None:
+            return
+        engine = self.trace.meta.get('engine', '?')
+        speed = f"x{self.speed:g}" if self.speed >= 1 else f"1/{1 / self.speed:g}"
+        status = (f"REPLAY {engine}  trace {min(self.trace_index + 1, len(self.paths))}/{len(self.paths)}  "
+                  f"event {self.event_number}/{len(self.trace.events)}  {speed}")
+        if self.events is None:
+            status += "  [END]"
+        elif self.paused:
+            status += "  [PAUSED]"
+        txt = self.small_font.render(status, True, (255, 255, 100), (40, 40, 40))
+        self.screen.blit(txt, (10, self.board_area_size - txt.get_height() - 10))
+
+    def run(self):
+        while self.running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+
+                if event.type == pygame.VIDEORESIZE:
+                    self.calculate_layout(event.w, event.h)
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_f:
+                        pygame.display.toggle_fullscreen()
+                    elif event.key == pygame.K_SPACE:
+                        self.paused = not self.paused
+                    elif event.key == pygame.K_UP:
+                        self.speed = min(MAX_SPEED, self.speed * 2)
+                    elif event.key == pygame.K_DOWN:
+                        self.speed = max(MIN_SPEED, self.speed / 2)
+                    elif event.key == pygame.K_RIGHT and self.paused:
+                        self.step()
+                    elif event.key == pygame.K_a:
+                        self.algo_mode = not self.algo_mode
+                    elif event.key == pygame.K_h:
+                        self.heatmap_mode = not self.heatmap_mode
+
+            if not self.paused:
+                # Fractional speeds accumulate until a whole event is due
+                self.pending += self.speed
+                while self.pending >= 1 and self.events is not None:
+                    self.pending -= 1
+                    self.step()
+                if self.events is None:
+                    self.pending = 0.0
+
+            self.draw_board()
+            self._draw_replay_status()
+            pygame.display.flip()
+            self.clock.tick(30)
+
+        pygame.quit()
+
+
+def collect_paths(args):
+    paths = []
+    for arg in args:
+        if os.path.isdir(arg):
+            paths.extend(os.path.join(arg, name) for name in sorted(os.listdir(arg))
+                         if name.endswith('.trace'))
+        else:
+            paths.append(arg)
+    return paths
+
+
+if __name__ == "__main__":
+    paths = collect_paths(sys.argv[1:])
+    if not paths:
+        print("Usage: python pygame_replay.py <trace file or folder> [...]")
+        sys.exit(1)
+    app = ReplayUI(paths)
+    app.run()
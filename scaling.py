@@ -0,0 +1,220 @@
+"""
+Othello AI – Scaling Analysis
+Sweeps search depths over a sample of suite positions for every depth-limited
+engine and fits the observed growth of nodes and time per extra ply.
+Run:  python3 scaling.py --depths 1 2 3 4 --workers 4
+      python3 scaling.py --engines dp bt alphabeta --plot --out scaling.json
+"""
+
+import json
+import math
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark import SUITE, parse_position, analysis_task
+from algorithms.engines import ENGINES
+from algorithms.stats import SearchStats
+
+# Two-sided 95% Student t quantiles, by degrees of freedom (conservative lookup)
+_T_975 = [(1, 12.706), (2, 4.303), (3, 3.182), (4, 2.776), (5, 2.571), (6, 2.447),
+          (7, 2.365), (8, 2.306), (9, 2.262), (10, 2.228), (12, 2.179), (15, 2.131),
+          (20, 2.086), (25, 2.060), (30, 2.042), (40, 2.021), (60, 2.000), (120, 1.980)]
+
+def t_quantile(df):
+    if df < 1:
+        return float('inf')
+    if df > 120:
+        return 1.960
+    for bound, t in reversed(_T_975):
+        if df >= bound:
+            return t
+
+# ── Fitting ───────────────────────────────────────────────────────────────────
+
+def fit_growth(points):
+    """
+    Least-squares fit of log(y) = a_position + k * depth with one intercept
+    per position (positions differ in size, not in growth rate).
+    points: list of (depth, position, y). Returns (k, standard error, df).
+    """
+    by_pos = {}
+    for depth, pos, y in points:
+        by_pos.setdefault(pos, []).append((depth, math.log(max(y, 1e-12))))
+
+    sxx = sxy = 0.0
+    centred = []
+    for rows in by_pos.values():
+        mean_x = sum(x for x, _ in rows) / len(rows)
+        mean_y = sum(y for _, y in rows) / len(rows)
+        for x, y in rows:
+            dx, dy = x - mean_x, y - mean_y
+            sxx += dx * dx
+            sxy += dx * dy
+            centred.append((dx, dy))
+    if sxx == 0:
+        return 0.0, float('inf'), 0
+
+    k = sxy / sxx
+    sse = sum((dy - k * dx) ** 2 for dx, dy in centred)
+    df = len(centred) - len(by_pos) - 1
+    se = math.sqrt(sse / df / sxx) if df > 0 else float('inf')
+    return k, se, df
+
+def growth_interval(k, se, df):
+    """ Growth factor per ply exp(k) with its 95% confidence interval. """
+    half = t_quantile(df) * se if df > 0 else float('inf')
+    return math.exp(k), _safe_exp(k - half), _safe_exp(k + half)
+
+def _safe_exp(x):
+    return math.exp(min(x, 700.0)) if x != float('inf') else float('inf')
+
+def mean_mobility(positions):
+    """ Geometric mean of the number of legal moves at the sampled roots. """
+    logs = []
+    for name, text, side in SUITE:
+        if name in positions:
+            state = parse_position(text, side)
+            logs.append(math.log(max(len(state.board.get_valid_moves(state.player)), 1)))
+    return math.exp(sum(logs) / len(logs)) if logs else 1.0
+
+def theoretical_nodes(b, depth):
+    """
+    (full minimax tree, best-case alpha-beta) node counts for branching b:
+    1 + b + ... + b^d, and the Knuth-Moore minimal tree b^ceil(d/2) + b^floor(d/2) - 1.
+    """
+    full = sum(b ** i for i in range(depth + 1))
+    best = b ** math.ceil(depth / 2) + b ** (depth // 2) - 1
+    return full, best
+
+def analyse(runs, positions):
+    """
+    runs: engine -> list of (depth, position, seconds, nodes).
+    Returns engine -> fit summary (growth per ply with CI, exponent of b, EBF).
+    """
+    b = mean_mobility(positions)
+    log_b = math.log(b) if b > 1 else 1.0
+    fits = {}
+    for engine, rows in runs.items():
+        k, se, df = fit_growth([(d, p, n) for d, p, _, n in rows])
+        growth, lo, hi = growth_interval(k, se, df)
+        tk, tse, tdf = fit_growth([(d, p, t) for d, p, t, _ in rows])
+        t_growth, t_lo, t_hi = growth_interval(tk, tse, tdf)
+
+        depths = sorted({d for d, *_ in rows})
+        ebf = SearchStats()
+        per_depth = []
+        for depth in depths:
+            at = [(t, n) for d, _, t, n in rows if d == depth]
+            geo_nodes = math.exp(sum(math.log(n) for _, n in at) / len(at))
+            geo_time = math.exp(sum(math.log(t) for t, _ in at) / len(at))
+            per_depth.append({'depth': depth, 'nodes': geo_nodes, 'time': geo_time,
+                              'ebf': ebf.ebf(nodes=geo_nodes, depth=depth)})
+
+        fits[engine] = {
+            'growth': growth, 'growth_ci': (lo, hi),
+            'exponent': math.log(growth) / log_b,
+            'exponent_ci': (math.log(lo) / log_b if lo > 0 else float('-inf'),
+                            math.log(hi) / log_b if hi < float('inf') else float('inf')),
+            'time_growth': t_growth, 'time_growth_ci': (t_lo, t_hi),
+            'per_depth': per_depth,
+            'mobility': b,
+        }
+    return fits
+
+# ── Sweep ─────────────────────────────────────────────────────────────────────
+
+def sweep(engines, depths, positions, workers=None):
+    """ Times every (engine, depth, position) on a process pool. """
+    tasks = [(e, d, p) for e in engines for d in depths for p in positions]
+    runs = {e: [] for e in engines}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for engine, depth, pos, seconds, nodes in pool.map(analysis_task, tasks):
+            runs[engine].append((depth, pos, seconds, nodes))
+    return runs
+
+def depth_engines():
+    return [name for name, (_, _, uses_depth) in ENGINES.items() if uses_depth]
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def report(fits):
+    b = next(iter(fits.values()))['mobility'] if fits else 0.0
+    print(f"\nMean root mobility b = {b:.2f}   (minimax ~ b^1.00d, best-case alpha-beta ~ b^0.50d)")
+    print(f"{'Engine':<11}{'nodes/ply [95% CI]':>26}{'exponent of b [95% CI]':>28}"
+          f"{'time/ply [95% CI]':>28}{'EBF':>7}")
+    for engine, f in fits.items():
+        lo, hi = f['growth_ci']
+        elo, ehi = f['exponent_ci']
+        tlo, thi = f['time_growth_ci']
+        print(f"{engine:<11}{f['growth']:>9.2f} [{lo:>6.2f}, {hi:>6.2f}]"
+              f"{f['exponent']:>13.2f} [{elo:>5.2f}, {ehi:>5.2f}]"
+              f"{f['time_growth']:>11.2f} [{tlo:>6.2f}, {thi:>6.2f}]"
+              f"{f['per_depth'][-1]['ebf']:>7.2f}")
+
+def plot_scaling(fits, fig=None):
+    """
+    Measured node counts per depth (geometric mean over positions) against
+    the fitted curve and the theoretical minimax / best-case alpha-beta trees.
+    """
+    import matplotlib.pyplot as plt
+    if fig is None:
+        fig = plt.figure(figsize=(12, 7), facecolor='#f5f5f5')
+    fig.suptitle("Othello AI  ·  Measured Scaling vs Theory", fontsize=15, fontweight='bold', color='#222')
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_yscale('log')
+    ax.set_xlabel("Depth d")
+    ax.set_ylabel("Nodes (log scale)")
+
+    depths = sorted({p['depth'] for f in fits.values() for p in f['per_depth']})
+    if fits:
+        b = next(iter(fits.values()))['mobility']
+        ax.plot(depths, [theoretical_nodes(b, d)[0] for d in depths], 'k--', linewidth=1.5,
+                label=f"minimax  Σ b^i  (b={b:.1f})")
+        ax.plot(depths, [theoretical_nodes(b, d)[1] for d in depths], 'k:', linewidth=1.5,
+                label="best-case alpha-beta  b^⌈d/2⌉ + b^⌊d/2⌋ − 1")
+
+    for engine, f in fits.items():
+        xs = [p['depth'] for p in f['per_depth']]
+        ys = [p['nodes'] for p in f['per_depth']]
+        line, = ax.plot(xs, ys, marker='o', linewidth=2,
+                        label=f"{engine}: ×{f['growth']:.2f}/ply  (b^{f['exponent']:.2f}d)")
+        # Fitted growth through the geometric mean of the measured points
+        mid = sum(math.log(y) for y in ys) / len(ys)
+        mid_x = sum(xs) / len(xs)
+        k = math.log(f['growth'])
+        ax.plot(xs, [math.exp(mid + k * (x - mid_x)) for x in xs], color=line.get_color(),
+                linewidth=1, alpha=0.5)
+
+    ax.set_xticks(depths)
+    ax.grid(True, which='both', linestyle='--', color='#e0e0e0', linewidth=0.8)
+    ax.legend(fontsize=9)
+    fig.canvas.draw_idle()
+    return fig
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit node and time growth per ply for each engine.")
+    parser.add_argument('--engines', nargs='+', default=depth_engines(), choices=depth_engines())
+    parser.add_argument('--depths', nargs='+', type=int, default=[1, 2, 3, 4])
+    parser.add_argument('--positions', nargs='+', default=[n for n, _, _ in SUITE],
+                        choices=[n for n, _, _ in SUITE])
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--out', help="write raw runs and fits as JSON to this file")
+    parser.add_argument('--plot', action='store_true', help="show measured vs theoretical curves")
+    args = parser.parse_args()
+
+    print(f"[Scaling  depths={args.depths}  positions={len(args.positions)}  engines={len(args.engines)}]")
+    runs = sweep(args.engines, args.depths, args.positions, args.workers)
+    fits = analyse(runs, args.positions)
+    report(fits)
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'runs': runs, 'fits': fits}, f, indent=2)
+        print(f"\nResults written to {args.out}")
+    if args.plot:
+        import matplotlib.pyplot as plt
+        plot_scaling(fits)
+        plt.show()
+
+if __name__ == "__main__":
+    main()
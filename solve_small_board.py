@@ -0,0 +1,71 @@
+"""
+Othello – Small-Board Solver
+Builds perfect-play tables by retrograde analysis (algorithms/small_board.py).
+4x4 is solved completely from the start position. Larger boards are solved
+below a sample of positions with --empties empty squares, reached by random
+playouts from the start: every position reachable from them is in the table.
+Run:  python3 solve_small_board.py --size 4
+      python3 solve_small_board.py --size 6 --empties 10 --seeds 20
+"""
+
+import time
+import random
+import argparse
+
+from model.board import Board
+from model.game_state import GameState
+from algorithms.small_board import build_table
+
+def playout_seeds(size, empties, count, rng):
+    """ Up to 'count' distinct positions with 'empties' empty squares, from random games. """
+    seeds = {}
+    attempts = 0
+    while len(seeds) < count and attempts < count * 20:
+        attempts += 1
+        state = GameState(Board(size=size), Board.BLACK)
+        while True:
+            black, white = state.board.get_counts()
+            if size * size - black - white <= empties:
+                key = (tuple(map(tuple, state.board.grid)), state.player)
+                seeds.setdefault(key, state)
+                break
+            moves = state.board.get_valid_moves(state.player)
+            if not moves:
+                if not state.board.get_valid_moves(-state.player):
+                    break  # game over before reaching the target
+                state = GameState(state.board, -state.player)
+                continue
+            r, c = rng.choice(moves)
+            board, _ = state.board.apply_move(r, c, state.player)
+            state = GameState(board, -state.player)
+    return list(seeds.values())
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve small Othello boards by retrograde analysis.")
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--empties', type=int, default=None,
+                        help="solve below positions with this many empty squares (default: from the start)")
+    parser.add_argument('--seeds', type=int, default=20, help="number of seed positions with --empties")
+    parser.add_argument('--seed', type=int, default=1, help="random seed for the playouts")
+    parser.add_argument('--out', help="table path prefix (default: tables/solved_NxN)")
+    args = parser.parse_args()
+
+    seeds = None
+    if args.empties is not None:
+        seeds = playout_seeds(args.size, args.empties, args.seeds, random.Random(args.seed))
+        print(f"[Solve  size={args.size}  {len(seeds)} seeds with {args.empties} empties]")
+    else:
+        print(f"[Solve  size={args.size}  from the start position]")
+
+    def progress(phase, empties, count):
+        print(f"  {phase:<9} empties={empties:>3} {count:>12,} positions")
+
+    t0 = time.perf_counter()
+    path, count, values = build_table(args.size, seeds, args.out, progress)
+    elapsed = time.perf_counter() - t0
+    print(f"\n{count:,} positions solved in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f}/s) -> {path}.keys/.vals")
+    if seeds is None:
+        print(f"Perfect play from the start: black - white = {values[0]:+d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Headless round-robin tournament between the engines in algorithms/.
+Run:  python3 tournament.py --engines greedy dnc dp bt --depths 2 3 --sizes 6 8 --workers 4
+"""
+
+import math
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from model.board import Board
+from model.game_state import GameState
+from algorithms.engines import ENGINES, play_move
+
+# ── Openings ──────────────────────────────────────────────────────────────────
+
+def random_openings(size, plies, count, seed):
+    """
+    'count' openings made of 'plies' seeded random moves each. Games that end
+    within 'plies' moves are discarded; if too few openings survive
+    count * 20 attempts, the ones found are cycled.
+    Raises ValueError when no game lasts 'plies' moves.
+    """
+    rng = random.Random(seed)
+    openings = []
+    attempts = 0
+    while len(openings) < count and attempts < count * 20:
+        attempts += 1
+        state = GameState(Board(size=size), Board.BLACK)
+        for _ in range(plies):
+            successors = state.get_successors()
+            if not successors:
+                break
+            state = rng.choice(successors)
+        if not state.is_terminal():
+            openings.append((state.board.grid, state.player))
+    if not openings:
+        raise ValueError(f"no random {size}x{size} game lasted {plies} plies; use fewer --opening-plies")
+    return [openings[i % len(openings)] for i in range(count)]
+
+def book_openings(size, plies, count):
+    """
+    Deterministic book: every distinct position reachable in exactly 'plies'
+    moves, in a fixed order, cycled to 'count' entries.
+    Raises ValueError when every game is over by then.
+    """
+    layer = {GameState(Board(size=size), Board.BLACK)}
+    for _ in range(plies):
+        layer = {s for state in layer for s in state.get_successors()}
+    book = sorted(((s.board.grid, s.player) for s in layer if not s.is_terminal()),
+                  key=lambda entry: (entry[1], entry[0]))
+    if not book:
+        raise ValueError(f"no {size}x{size} game lasts {plies} plies; use fewer --opening-plies")
+    return [book[i % len(book)] for i in range(count)]
+
+# ── Games ─────────────────────────────────────────────────────────────────────
+
+def play_game(task):
+    """
+    Plays one game and returns its record. Runs inside a worker process.
+    task = (size, opening grid, opening player, black participant, white participant)
+    where a participant is (engine name, depth).
+    """
+    size, grid, player, black, white = task
+    state = GameState(Board(grid, size=size), player)
+    sides = {Board.BLACK: black, Board.WHITE: white}
+    think = {Board.BLACK: 0.0, Board.WHITE: 0.0}
+    moves = {Board.BLACK: 0, Board.WHITE: 0}
+
+    while not state.is_terminal():
+        name, depth = sides[state.player]
+        mover = state.player
+        t0 = time.perf_counter()
+        result = play_move(name, state, depth)
+        think[mover] += time.perf_counter() - t0
+        moves[mover] += 1
+        state = result['state']
+        if state is None:
+            break
+
+    b, w = state.board.get_counts() if state else (0, 0)
+    return {
+        'size': size, 'black': black, 'white': white,
+        'winner': Board.BLACK if b > w else Board.WHITE if w > b else 0,
+        'discs': (b, w),
+        'time': (think[Board.BLACK], think[Board.WHITE]),
+        'moves': (moves[Board.BLACK], moves[Board.WHITE]),
+    }
+
+# ── Ratings ───────────────────────────────────────────────────────────────────
+
+def estimate_elo(players, games, iterations=500):
+    """
+    Bradley-Terry fit (MM algorithm) turned into Elo, mean 1500.
+    games: list of (player a, player b, score of a) with score in {1, 0.5, 0}.
+    Every player also gets one virtual draw against an average opponent so
+    that unbeaten or winless players still get a finite rating.
+    """
+    wins = {p: 0.5 for p in players}
+    pairs = {p: [] for p in players}
+    for a, b, score in games:
+        wins[a] += score
+        wins[b] += 1 - score
+        pairs[a].append(b)
+        pairs[b].append(a)
+
+    gamma = {p: 1.0 for p in players}
+    for _ in range(iterations):
+        new = {}
+        for p in players:
+            denom = 1.0 / (gamma[p] + 1.0)
+            for q in pairs[p]:
+                denom += 1.0 / (gamma[p] + gamma[q])
+            new[p] = wins[p] / denom
+        mean_log = sum(math.log(g) for g in new.values()) / len(new)
+        gamma = {p: g / math.exp(mean_log) for p, g in new.items()}
+
+    return {p: 1500 + 400 * math.log10(g) for p, g in gamma.items()}
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def label(participant):
+    name, depth = participant
+    return f"{name}@{depth}" if ENGINES[name][2] else name
+
+def report(size, records, wall_time):
+    players = sorted({r['black'] for r in records} | {r['white'] for r in records}, key=label)
+    stats = {p: {'w': 0, 'd': 0, 'l': 0, 'time': 0.0, 'moves': 0} for p in players}
+    rated = []
+
+    for r in records:
+        black, white = r['black'], r['white']
+        stats[black]['time'] += r['time'][0]
+        stats[white]['time'] += r['time'][1]
+        stats[black]['moves'] += r['moves'][0]
+        stats[white]['moves'] += r['moves'][1]
+        if r['winner'] == Board.BLACK:
+            stats[black]['w'] += 1; stats[white]['l'] += 1
+            rated.append((black, white, 1.0))
+        elif r['winner'] == Board.WHITE:
+            stats[white]['w'] += 1; stats[black]['l'] += 1
+            rated.append((black, white, 0.0))
+        else:
+            stats[black]['d'] += 1; stats[white]['d'] += 1
+            rated.append((black, white, 0.5))
+
+    elo = estimate_elo(players, rated)
+
+    print(f"\n=== {size}x{size}: {len(records)} games in {wall_time:.1f}s "
+          f"({len(records) / max(wall_time, 1e-9):.2f} games/s) ===")
+    print(f"{'Engine':<16}{'Games':>7}{'W':>6}{'D':>6}{'L':>6}{'Win %':>8}{'Elo':>8}{'ms/move':>10}")
+    for p in sorted(players, key=lambda p: -elo[p]):
+        s = stats[p]
+        games = s['w'] + s['d'] + s['l']
+        win_rate = 100.0 * (s['w'] + 0.5 * s['d']) / games if games else 0.0
+        per_move = 1000.0 * s['time'] / s['moves'] if s['moves'] else 0.0
+        print(f"{label(p):<16}{games:>7}{s['w']:>6}{s['d']:>6}{s['l']:>6}"
+              f"{win_rate:>7.1f}%{elo[p]:>8.0f}{per_move:>10.2f}")
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+
+def build_tasks(args, size):
+    participants = []
+    for name in args.engines:
+        if ENGINES[name][2]:
+            participants.extend((name, d) for d in args.depths)
+        else:
+            participants.append((name, 0))
+
+    if args.openings == 'book':
+        openings = book_openings(size, args.opening_plies, args.games)
+    else:
+        openings = random_openings(size, args.opening_plies, args.games, args.seed + size)
+
+    tasks = []
+    for i, a in enumerate(participants):
+        for b in participants[i + 1:]:
+            for grid, player in openings:
+                # Same opening with colours swapped, to cancel first-move bias
+                tasks.append((size, grid, player, a, b))
+                tasks.append((size, grid, player, b, a))
+    return tasks
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless round-robin tournament between Othello engines.")
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--depths', nargs='+', type=int, default=[2],
+                        help="search depths for engines that take one (each depth is a separate entrant)")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[8])
+    parser.add_argument('--games', type=int, default=2,
+                        help="openings per pairing (each is played with both colours)")
+    parser.add_argument('--openings', choices=['random', 'book'], default='random')
+    parser.add_argument('--opening-plies', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for size in args.sizes:
+            try:
+                tasks = build_tasks(args, size)
+            except ValueError as e:
+                parser.error(str(e))
+            print(f"[{size}x{size}] {len(tasks)} games queued...")
+            t0 = time.perf_counter()
+            records = []
+            for future in as_completed([pool.submit(play_game, t) for t in tasks]):
+                records.append(future.result())
+            report(size, records, time.perf_counter() - t0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Event-rate control between an engine generator and the GUI.
+
+A deep search yields tens of thousands of visualization events; drawing one
+per frame makes a visualized turn take minutes. EventRateController drains
+as many events as fit in a per-frame time slice and keeps only what is worth
+drawing: the latest event, the line currently being searched and how often
+each square produced a cutoff. Once the wall-clock limit has passed,
+visualization stops (visualizing turns False) and the search continues in
+longer slices, still one per frame, so the window keeps handling events
+while the engine finishes with little drawing overhead.
+"""
+import time
+
+FRAME_BUDGET = 0.012   # seconds of search per frame
+TIME_LIMIT = 5.0       # seconds of visualized search per turn
+LATE_FRAME_BUDGET = 0.1   # seconds of search per frame after TIME_LIMIT
+
+# Snapshot cell bytes -> 1 for an occupied square
+_OCCUPIED = bytes.maketrans(b'\x02', b'\x01')
+
+
+class EventRateController:
+    """
+    Wraps an engine generator (UI generator protocol).
+        last:    latest non-result event (None before the first one)
+        path:    snapshots from the root to the node being searched
+        heat:    cutoffs caused by each square (row-major), from 'prune' events
+        events:  events drained so far
+        visualizing: False once the time limit has passed (nothing new to draw)
+    pump() is called once per frame and returns the 'result' event when the
+    search is over.
+    """
+
+    def __init__(self, generator, root, frame_budget=FRAME_BUDGET, time_limit=TIME_LIMIT,
+                 late_frame_budget=LATE_FRAME_BUDGET):
+        self.generator = generator
+        self.frame_budget = frame_budget
+        self.time_limit = time_limit
+        self.late_frame_budget = late_frame_budget
+        self.visualizing = True
+        self.size = root.size
+        self.last = None
+        self.result = None
+        self.done = False
+        self.events = 0
+        self.cutoffs = 0
+        self.heat = [0] * (root.size * root.size)
+        self.max_heat = 0
+        self.started = None
+        self.elapsed = 0.0
+        # (occupancy mask, disc count, occupancy bytes, snapshot); the root is never popped
+        self.path = [self._path_entry(root)]
+
+    @staticmethod
+    def _path_entry(snapshot):
+        occupied = snapshot.cells.translate(_OCCUPIED)
+        return int.from_bytes(occupied, 'big'), occupied.count(1), occupied, snapshot
+
+    def _follow(self, snapshot):
+        """ Moves the search path to 'snapshot': drops every entry that is not its ancestor. """
+        entry = self._path_entry(snapshot)
+        mask, count = entry[0], entry[1]
+        path = self.path
+        while len(path) > 1:
+            top_mask, top_count = path[-1][0], path[-1][1]
+            if top_count < count and top_mask & ~mask == 0:
+                break
+            path.pop()
+        path.append(entry)
+
+    def pump(self):
+        """ Drains events for one frame; the 'result' event once the search has finished, else None. """
+        if self.done:
+            return self.result
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        if now - self.started >= self.time_limit:
+            # Past the limit: longer slices and no aggregation, but never the whole search at once
+            self.visualizing = False
+            deadline = now + self.late_frame_budget
+        else:
+            deadline = now + self.frame_budget
+        visualizing = self.visualizing
+        generator = self.generator
+        try:
+            while True:
+                evt = next(generator)
+                self.events += 1
+                kind = evt['type']
+                if kind == 'result':
+                    self.result = evt
+                    self.done = True
+                    break
+                if kind == 'prune':
+                    self.cutoffs += 1
+                    move = evt.get('move')
+                    if visualizing and move is not None:
+                        i = move[0] * self.size + move[1]
+                        self.heat[i] += 1
+                        if self.heat[i] > self.max_heat:
+                            self.max_heat = self.heat[i]
+                elif visualizing and evt.get('state') is not None:
+                    self._follow(evt['state'])
+                self.last = evt
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            self.done = True
+        self.elapsed = time.perf_counter() - self.started
+        return self.result
+
+    def line(self):
+        """
+        Squares played along the current search path, in order, as
+        (r, c, player) with player the Board value of the disc placed.
+        """
+        out = []
+        for parent, child in zip(self.path, self.path[1:]):
+            before, after, snapshot = parent[2], child[2], child[3]
+            for i in range(len(after)):
+                if after[i] and not before[i]:
+                    r, c = divmod(i, self.size)
+                    out.append((r, c, snapshot.cell(r, c)))
+        return out
@@ -6,16 +6,25 @@ from model.board import Board
 from model.game_state import GameState
 from algorithms.graph import get_best_move_generator, weighted_heuristic
 from algorithms.heuristics import get_cell_weight
-from algorithms.greedy import get_greedy_move, get_greedy_move_generator
-from algorithms.divide_and_conquer import choosebestmovevisual
+from algorithms.patterns import pattern_heuristic, PatternBoard
+from algorithms.greedy import get_greedy_move_generator
+from algorithms.divide_and_conquer import choosebestmovevisual, get_dnc_lookahead_generator
 from algorithms.dp import get_dp_move_generator
 from algorithms.backtracking import get_backtracking_move_generator
-from algorithms.backtracknoheuristic import evaluatemovevisual as noheur_evaluatemovevisual
+from algorithms.backtracknoheuristic import evaluatemovevisual_memo as noheur_evaluatemovevisual
+from algorithms.stats import SearchStats
+from algorithms import profiling
+from algorithms.trace import TraceWriter, new_trace_path, record_generator
+from model.snapshot import Snapshot
+from ui.event_rate import EventRateController, FRAME_BUDGET, TIME_LIMIT
+from algorithms.ponder import Ponderer
+from algorithms.tree_cache import TreeCache
+from model.position_keys import key_from_state
 
 import os
 
 
-def get_backtracking_move_generator_noheur(game_state, depth=4):
+def get_backtracking_move_generator_noheur(game_state, depth=4, stats=None):
     player = game_state.player
     board = game_state.board
     
@@ -25,7 +34,11 @@ def get_backtracking_move_generator_noheur(game_state, depth=4):
         yield {'type': 'result', 'state': game_state}
         return
         
-    scoredmoves = yield from noheur_evaluatemovevisual(board, moves, depth, player, player, True)
+    if stats is None:
+        stats = SearchStats()
+    stats.begin_iteration(depth)
+    scoredmoves = yield from noheur_evaluatemovevisual(board, moves, depth, player, stats)
+    stats.end_iteration()
     
     scoredmoves.sort(key=lambda x: x[0], reverse=True)
     bestscore, bestmove = scoredmoves[0]
@@ -34,7 +47,7 @@ def get_backtracking_move_generator_noheur(game_state, depth=4):
     nextplayer = -player
     
     resultstate = GameState(newboard, nextplayer)
-    yield {'type': 'result', 'state': resultstate, 'score': bestscore}
+    yield {'type': 'result', 'state': resultstate, 'score': bestscore, 'stats': stats}
 
 
 # Enums
@@ -52,6 +65,19 @@ STRAT_DNC = 1
 STRAT_DP = 2
 STRAT_BT = 3
 STRAT_BT_NO_HEURISTIC = 4
+STRAT_DNC_DEEP = 5
+
+# Seconds of search (not wall-clock time) the anytime D&C lookahead may spend per move
+DNC_BUDGET = 1.0
+
+# Entries the DP transposition table kept between moves may hold before it is cleared
+PONDER_MEMO_LIMIT = 100_000
+
+# Engine names used in profiling reports and trace file names
+STRATEGY_NAMES = {
+    STRAT_GREEDY: 'greedy', STRAT_DNC: 'dnc', STRAT_DP: 'dp',
+    STRAT_BT: 'bt', STRAT_BT_NO_HEURISTIC: 'bt_noheur', STRAT_DNC_DEEP: 'dnc_deep',
+}
 
 
 class PyGameUI:
@@ -151,13 +177,35 @@ class PyGameUI:
         
         self.algo_mode = False
         self.heatmap_mode = False
+        self.use_pattern_eval = False
+        self.record_trace = False
+        self.ponder_mode = False
+        self.ponderer = None
+        self.ponder_reply = None
+        self.ponder_memo = {}
+        self.tree_cache = TreeCache()
+        self.last_stats = None
         self.ai_generator = None
+        self.ai_stream = None
         self.current_vis_data = None
+        # Search time per frame and visualized time per turn (see ui/event_rate.py)
+        self.vis_frame_budget = FRAME_BUDGET
+        self.vis_time_limit = TIME_LIMIT
         self.is_comparing = False
         self.defer_benchmark = False
         self.dropdown_open = False
         self.dropdown_rect = pygame.Rect(0, 0, 0, 0)
         self.show_eval_bar = True
+
+        # Cached board rendering (see draw_board)
+        self.board_surface = None
+        self.heatmap_surface = None
+        self.board_layer = None
+        self._layer_key = None
+        self._drawn_cells = None
+        self._screen_valid = False
+        self._clean_frame = False
+        self.dirty_rects = None
         
         self.running = True
 
@@ -207,7 +255,10 @@ class PyGameUI:
         self.app_state = STATE_PLAYING
         self.current_vis_data = None
         self.ai_generator = None
+        self.ai_stream = None
+        self.reset_ponder()
         self.last_eval_score = 0
+        self.last_stats = None
         self.play_sound('move')
         
         self.calculate_layout(self.screen_width, self.screen_height)
@@ -251,7 +302,7 @@ class PyGameUI:
         lbl_strat = self.font.render("2. Select CPU Strategy (If 1 Player):", True, lbl_color)
         self.screen.blit(lbl_strat, (center_x - lbl_strat.get_width()//2, 300))
         
-        self.strats = [("Greedy", STRAT_GREEDY), ("Divide & Conquer", STRAT_DNC), ("DP", STRAT_DP), ("Backtracking", STRAT_BT), ("Backtracking (No Heur)", STRAT_BT_NO_HEURISTIC)]
+        self.strats = [("Greedy", STRAT_GREEDY), ("Divide & Conquer", STRAT_DNC), ("D&C Lookahead", STRAT_DNC_DEEP), ("DP", STRAT_DP), ("Backtracking", STRAT_BT), ("Backtracking (No Heur)", STRAT_BT_NO_HEURISTIC)]
         
         # Dropdown closed state rendering
         dd_width = 250
@@ -374,28 +425,31 @@ class PyGameUI:
                 pass
 
     def draw_board(self):
-        self.screen.fill(self.COLOR_BG)
-        
-        # Grid
-        for i in range(self.grid_size + 1):
-            pos = i * self.cell_size
-            pygame.draw.line(self.screen, self.COLOR_LINE, (pos, 0), (pos, self.board_area_size), 2)
-            pygame.draw.line(self.screen, self.COLOR_LINE, (0, pos), (self.board_area_size, pos), 2)
+        """
+        Draws the board from cached layers. After a frame shown by present()
+        with nothing drawn over the board, only the cells whose disc changed
+        are copied to the screen and listed in self.dirty_rects; otherwise the
+        whole screen is redrawn and dirty_rects is None.
+        """
+        full = not self._screen_valid
+        self._screen_valid = False
+        changed, rebuilt = self._update_board_layer()
 
-        # Heatmap Overlay
-        if self.heatmap_mode:
-            self._draw_heatmap()
-            
-        # Discs
-        for r in range(self.grid_size):
-            for c in range(self.grid_size):
-                cell = self.game_state.board.grid[r][c]
-                if cell != Board.EMPTY:
-                    self._draw_disc(r, c, cell, 255)
+        if full or rebuilt:
+            self.screen.fill(self.COLOR_BG)
+            self.screen.blit(self.board_layer, (0, 0))
+            rects = None
+        else:
+            for rect in changed:
+                self.screen.blit(self.board_layer, rect, rect)
+            rects = changed
+
+        overlay = False
 
         # Visualization: CPU
         if self.algo_mode and self.current_vis_data and self.game_mode == MODE_PvCPU:
             self._draw_ai_visualization()
+            overlay = True
 
         # Visualization: Raycasting (User)
         # Show for current player if it's a human turn logic
@@ -407,12 +461,44 @@ class PyGameUI:
             
         if self.algo_mode and is_human_turn:
             self._draw_user_visualization()
+            overlay = True
             
         # Side Panel
         self._draw_side_panel()
-        
-    def _draw_heatmap(self):
-        s = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+
+        self._clean_frame = not overlay
+        if rects is None or overlay:
+            self.dirty_rects = None
+        else:
+            panel = pygame.Rect(self.board_area_size, 0, self.screen_width - self.board_area_size, self.screen_height)
+            self.dirty_rects = rects + [panel]
+
+    def present(self):
+        """ Shows the frame: only the dirty rects after a partial draw_board, else a full flip. """
+        if self.dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty_rects)
+        self._screen_valid = self._clean_frame and self.app_state == STATE_PLAYING
+        self._clean_frame = False
+        self.dirty_rects = None
+
+    def invalidate_screen(self):
+        """ Forces the next draw_board to redraw everything (e.g. after drawing over the board). """
+        self._screen_valid = False
+        self._clean_frame = False
+
+    def _build_static_surfaces(self):
+        """ Board background (felt and grid) and heatmap, rendered once per layout. """
+        size = self.board_area_size
+        self.board_surface = pygame.Surface((size, size))
+        self.board_surface.fill(self.COLOR_BG)
+        for i in range(self.grid_size + 1):
+            pos = i * self.cell_size
+            pygame.draw.line(self.board_surface, self.COLOR_LINE, (pos, 0), (pos, size), 2)
+            pygame.draw.line(self.board_surface, self.COLOR_LINE, (0, pos), (size, pos), 2)
+
+        self.heatmap_surface = pygame.Surface((size, size), pygame.SRCALPHA)
         for r in range(self.grid_size):
             for c in range(self.grid_size):
                 w = get_cell_weight(r, c, self.grid_size)
@@ -424,11 +510,51 @@ class PyGameUI:
                      color = (255, 0, 0, 150) if w == -50 else (255, 100, 100, 50)
                 else:
                      continue
-                
-                pygame.draw.rect(s, color, s.get_rect())
-                self.screen.blit(s, (c*self.cell_size, r*self.cell_size))
+                pygame.draw.rect(self.heatmap_surface, color, self._cell_rect(r, c))
 
-    def _draw_disc(self, r, c, player, alpha):
+    def _cell_rect(self, r, c):
+        return pygame.Rect(c * self.cell_size, r * self.cell_size, self.cell_size, self.cell_size)
+
+    def _update_board_layer(self):
+        """
+        Brings self.board_layer (background, heatmap and discs) up to date with
+        the board. Returns (rects of the cells redrawn, whether it was rebuilt).
+        """
+        static_key = (self.grid_size, self.cell_size, self.board_area_size)
+        rebuilt = False
+        if self._layer_key is None or self._layer_key[0] != static_key:
+            self._build_static_surfaces()
+            self._layer_key = None
+        if self._layer_key != (static_key, self.heatmap_mode):
+            self.board_layer = self.board_surface.copy()
+            if self.heatmap_mode:
+                self.board_layer.blit(self.heatmap_surface, (0, 0))
+            self._layer_key = (static_key, self.heatmap_mode)
+            self._drawn_cells = [[Board.EMPTY] * self.grid_size for _ in range(self.grid_size)]
+            rebuilt = True
+
+        changed = []
+        grid = self.game_state.board.grid
+        for r in range(self.grid_size):
+            drawn = self._drawn_cells[r]
+            row = grid[r]
+            for c in range(self.grid_size):
+                cell = row[c]
+                if cell == drawn[c]:
+                    continue
+                rect = self._cell_rect(r, c)
+                self.board_layer.blit(self.board_surface, rect, rect)
+                if self.heatmap_mode:
+                    self.board_layer.blit(self.heatmap_surface, rect, rect)
+                if cell != Board.EMPTY:
+                    self._draw_disc(r, c, cell, 255, self.board_layer)
+                drawn[c] = cell
+                changed.append(rect)
+        return changed, rebuilt
+
+    def _draw_disc(self, r, c, player, alpha, surface=None):
+        if surface is None:
+            surface = self.screen
         x = c * self.cell_size + self.cell_size // 2
         y = r * self.cell_size + self.cell_size // 2
         radius = self.cell_size // 2 - 5
@@ -436,17 +562,17 @@ class PyGameUI:
         
         if alpha == 255:
             # Draw shadow
-            pygame.draw.circle(self.screen, (10, 40, 20), (x + 3, y + 3), radius)
+            pygame.draw.circle(surface, (10, 40, 20), (x + 3, y + 3), radius)
         
         if alpha < 255:
             s = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
             pygame.draw.circle(s, color + (alpha,), (self.cell_size//2, self.cell_size//2), radius)
-            self.screen.blit(s, (c*self.cell_size, r*self.cell_size))
+            surface.blit(s, (c*self.cell_size, r*self.cell_size))
         else:
-            pygame.draw.circle(self.screen, color, (x, y), radius)
+            pygame.draw.circle(surface, color, (x, y), radius)
             # Add highlight for 3D effect
             highlight = (60, 60, 60) if player == Board.BLACK else (255, 255, 255)
-            pygame.draw.circle(self.screen, highlight, (int(x - radius*0.3), int(y - radius*0.3)), int(radius*0.2))
+            pygame.draw.circle(surface, highlight, (int(x - radius*0.3), int(y - radius*0.3)), int(radius*0.2))
 
     def draw_game_over(self):
         # Draw the base board first under the overlay
@@ -534,12 +660,13 @@ class PyGameUI:
         
         data = self.current_vis_data
         if data['type'] in ('search_node', 'leaf'):
-             state = data['state']
-             if state:
+             snapshot = data['state']
+             if snapshot:
+                 grid = snapshot.grid
                  for r in range(self.grid_size):
                     for c in range(self.grid_size):
-                        if state.board.grid[r][c] != Board.EMPTY:
-                             self._draw_disc(r, c, state.board.grid[r][c], 100)
+                        if grid[r][c] != Board.EMPTY:
+                             self._draw_disc(r, c, grid[r][c], 100)
                              
         colors = [(255, 0, 0), (255, 165, 0), (255, 255, 0), (0, 255, 0)]
         depth = data.get('depth', 0)
@@ -548,6 +675,10 @@ class PyGameUI:
         txt = self.font.render(f"SIMULATING DEPTH {depth}", True, col)
         self.screen.blit(txt, (20, 20))
         
+        if self.ai_stream is not None:
+            self._draw_search_summary(self.ai_stream)
+            return
+
         # Pruning Visualization
         if data['type'] == 'prune':
             p_state = data['state']
@@ -557,6 +688,32 @@ class PyGameUI:
                  t = self.font_title.render("PRUNED!", True, (255, 0, 0))
                  self.screen.blit(t, (self.board_area_size//2 - t.get_width()//2, self.board_area_size//2))
 
+    def _draw_search_summary(self, stream):
+        """ Aggregated view of a decimated search: cutoff heat per square and the line being searched. """
+        cs = self.cell_size
+        if stream.max_heat:
+            s = pygame.Surface((cs, cs), pygame.SRCALPHA)
+            for i, count in enumerate(stream.heat):
+                if count:
+                    r, c = divmod(i, self.grid_size)
+                    s.fill((255, 40, 0, 40 + 140 * count // stream.max_heat))
+                    self.screen.blit(s, (c * cs, r * cs))
+
+        # Current line: numbered markers in the colour of the side that played them
+        for n, (r, c, player) in enumerate(stream.line(), 1):
+            center = (c * cs + cs // 2, r * cs + cs // 2)
+            fill = self.COLOR_BLACK if player == Board.BLACK else self.COLOR_WHITE
+            ink = self.COLOR_WHITE if player == Board.BLACK else self.COLOR_BLACK
+            pygame.draw.circle(self.screen, fill, center, cs // 4)
+            pygame.draw.circle(self.screen, self.COLOR_NODE_SEARCH, center, cs // 4, 2)
+            t = self.small_font.render(str(n), True, ink)
+            self.screen.blit(t, (center[0] - t.get_width() // 2, center[1] - t.get_height() // 2))
+
+        rate = stream.events / max(stream.elapsed, 1e-9)
+        info = f"{stream.events:,} events  {stream.cutoffs:,} cutoffs  {rate:,.0f}/s"
+        txt = self.small_font.render(info, True, (255, 255, 255), (40, 40, 40))
+        self.screen.blit(txt, (20, 20 + self.font.get_height() + 5))
+
     def _draw_eval_bar(self, x, y, width, height):
         # Background
         pygame.draw.rect(self.screen, (50, 50, 50), (x, y, width, height))
@@ -597,6 +754,8 @@ class PyGameUI:
                 mode_str += " - GREEDY"
             elif self.cpu_strategy == STRAT_DNC:
                 mode_str += " - D&C"
+            elif self.cpu_strategy == STRAT_DNC_DEEP:
+                mode_str += " - D&C LOOKAHEAD"
             elif self.cpu_strategy == STRAT_DP:
                 mode_str += " - DP"
             elif self.cpu_strategy == STRAT_BT:
@@ -632,6 +791,26 @@ class PyGameUI:
         self.screen.blit(self.font_title.render(hm_txt, True, hm_col), (x + 140, y - 5))
         y += 40
         
+        pt_txt = "ON" if self.use_pattern_eval else "OFF"
+        pt_col = (0, 255, 0) if self.use_pattern_eval else (100, 100, 100)
+        self.screen.blit(self.font.render("Patterns (P)", True, (200,200,200)), (x, y))
+        self.screen.blit(self.font_title.render(pt_txt, True, pt_col), (x + 140, y - 5))
+        y += 40
+        
+        rec_txt = "ON" if self.record_trace else "OFF"
+        rec_col = (255, 80, 80) if self.record_trace else (100, 100, 100)
+        self.screen.blit(self.font.render("Record (R)", True, (200,200,200)), (x, y))
+        self.screen.blit(self.font_title.render(rec_txt, True, rec_col), (x + 140, y - 5))
+        y += 40
+
+        po_txt = "ON" if self.ponder_mode else "OFF"
+        if self.ponder_mode and self.ponderer is not None:
+            po_txt += f" {len(self.ponderer.replies)}"
+        po_col = (0, 255, 0) if self.ponder_mode else (100, 100, 100)
+        self.screen.blit(self.font.render("Ponder (T)", True, (200,200,200)), (x, y))
+        self.screen.blit(self.font_title.render(po_txt, True, po_col), (x + 140, y - 5))
+        y += 40
+        
         ev_txt = "ON" if self.show_eval_bar else "OFF"
         ev_col = (0, 255, 0) if self.show_eval_bar else (100, 100, 100)
         self.screen.blit(self.font.render("Eval Bar (E)", True, (200,200,200)), (x, y))
@@ -647,6 +826,13 @@ class PyGameUI:
             self.screen.blit(self.small_font.render(f"Eval: {sc}", True, col), (x + 50, y + 70))
         
         y += 170
+
+        # Search statistics of the last AI move
+        if self.last_stats is not None:
+            for line in self.last_stats.summary_lines():
+                self.screen.blit(self.small_font.render(line, True, (200, 200, 200)), (x, y))
+                y += 22
+
         # Surrender
         self.btn_restart = pygame.Rect(x, self.screen_height - 80, 160, 50)
         pygame.draw.rect(self.screen, (200, 50, 50), self.btn_restart, border_radius=5)
@@ -654,72 +840,120 @@ class PyGameUI:
         self.screen.blit(oms, (self.btn_restart.centerx - oms.get_width()//2, self.btn_restart.centery - oms.get_height()//2))
 
 
+    def make_ai_search(self, state):
+        """ The engine generator the CPU runs for 'state' (also used to ponder). """
+        heuristic = pattern_heuristic if self.use_pattern_eval else weighted_heuristic
+        if self.cpu_strategy == STRAT_GREEDY:
+            return get_greedy_move_generator(state)
+        elif self.cpu_strategy == STRAT_DNC:
+            return choosebestmovevisual(state.board, state.player)
+        elif self.cpu_strategy == STRAT_DNC_DEEP:
+            return get_dnc_lookahead_generator(state, budget=DNC_BUDGET)
+        elif self.cpu_strategy == STRAT_DP:
+            if not self.ponder_mode:
+                return get_dp_move_generator(state, depth=3, heuristic_func=heuristic)
+            # Pondering keeps the transposition table between moves
+            if len(self.ponder_memo) > PONDER_MEMO_LIMIT:
+                self.ponder_memo.clear()
+            return get_dp_move_generator(state, depth=3, heuristic_func=heuristic, memo=self.ponder_memo)
+        elif self.cpu_strategy == STRAT_BT:
+            # Pass a copy so the in-place algorithm does not mutate the live game state
+            # (a PatternBoard keeps the pattern indices updated on every push/pop)
+            from model.game_state import GameState
+            board_cls = PatternBoard if self.use_pattern_eval else Board
+            bt_board = board_cls(state.board.grid, size=state.board.SIZE)
+            bt_state = GameState(board=bt_board, player=state.player)
+            # The tree of the previous moves seeds move ordering and bounds
+            return get_backtracking_move_generator(bt_state, depth=4, heuristic_func=heuristic, cache=self.tree_cache)
+        elif self.cpu_strategy == STRAT_BT_NO_HEURISTIC:
+            from model.game_state import GameState
+            bt_board = Board(state.board.grid, size=state.board.SIZE)
+            bt_state = GameState(board=bt_board, player=state.player)
+            return get_backtracking_move_generator_noheur(bt_state, depth=4)
+        return get_best_move_generator(state, depth=3, heuristic_func=heuristic)
+
+    def reset_ponder(self):
+        """ Drops the pondering work and the tables kept between moves (new game, new heuristic). """
+        if self.ponderer is not None:
+            self.ponderer.cancel()
+        self.ponderer = None
+        self.ponder_reply = None
+        self.ponder_memo = {}
+        self.tree_cache = TreeCache()
+
+    def ponder(self):
+        """ Searches the CPU's replies for a frame's time slice while the human is on move. """
+        if self.ponderer is None or self.ponderer.root is not self.game_state:
+            if self.ponderer is not None:
+                self.ponderer.cancel()
+            heuristic = pattern_heuristic if self.use_pattern_eval else weighted_heuristic
+            self.ponderer = Ponderer(self.game_state, self.make_ai_search, heuristic)
+        self.ponderer.step(self.vis_frame_budget)
+
+    def stop_ponder(self):
+        """ Called once the human's move is applied: keeps the reply for the new position, if searched. """
+        if self.ponderer is not None:
+            reply = self.ponderer.take(self.game_state)
+            self.ponder_reply = (key_from_state(self.game_state), reply) if reply else None
+            self.ponderer = None
+
     def update_ai(self):
         if not self.ai_generator:
-            if self.cpu_strategy == STRAT_GREEDY:
-                # Greedy Strategy doesn't have an iterative generator, make move immediately
-                best_state = get_greedy_move(self.game_state)
-                # Create a simple generator that yields the result
-                def greedy_gen():
-                    yield {'type': 'result', 'state': best_state}
-                self.ai_generator = greedy_gen()
-            elif self.cpu_strategy == STRAT_DNC:
-                self.ai_generator = choosebestmovevisual(self.game_state.board, self.game_state.player)
-            elif self.cpu_strategy == STRAT_DP:
-                self.ai_generator = get_dp_move_generator(self.game_state, depth=3)
-            elif self.cpu_strategy == STRAT_BT:
-                # Pass a copy so the in-place algorithm does not mutate the live game state
-                from model.game_state import GameState
-                bt_board = Board(self.game_state.board.grid, size=self.game_state.board.SIZE)
-                bt_state = GameState(board=bt_board, player=self.game_state.player)
-                self.ai_generator = get_backtracking_move_generator(bt_state, depth=4)
-            elif self.cpu_strategy == STRAT_BT_NO_HEURISTIC:
-                from model.game_state import GameState
-                bt_board = Board(self.game_state.board.grid, size=self.game_state.board.SIZE)
-                bt_state = GameState(board=bt_board, player=self.game_state.player)
-                self.ai_generator = get_backtracking_move_generator_noheur(bt_state, depth=4)
-
+            # Keep only the cached subtree under the moves actually played
+            # (this also drops what pondering stored for the moves not played)
+            self.tree_cache.advance(self.game_state)
+            reply = self.ponder_reply
+            self.ponder_reply = None
+            if reply is not None and reply[0] == key_from_state(self.game_state):
+                # Answered while the human was thinking
+                self.ai_generator = iter([reply[1]])
             else:
-                self.ai_generator = get_best_move_generator(self.game_state, depth=3)
-        try:
-            vis = next(self.ai_generator)
-            if vis['type'] == 'result':
-                # Force a copy of the board to prevent in-place algorithms from mutating the final state
-                final_state = vis['state']
-                final_board = Board(final_state.board.grid, size=final_state.board.SIZE)
-                
-                # Check flipped count
-                ai = self.game_state.player
-                ai_before = sum(row.count(ai) for row in self.game_state.board.grid)
-                ai_after = sum(row.count(ai) for row in final_board.grid)
-                flipped_count = ai_after - ai_before - 1
-                
-                if flipped_count >= 8:
-                    self.play_sound('opp_capture_more')
-                else:
-                    self.play_sound('move')
-
-                from model.game_state import GameState
-                self.game_state = GameState(final_board, final_state.player)
-                
-                # Update Score for Eval Bar
-                self.last_eval_score = weighted_heuristic(self.game_state.board, Board.BLACK)
-                
+                self.ai_generator = self.make_ai_search(self.game_state)
+            label = STRATEGY_NAMES.get(self.cpu_strategy, 'alphabeta')
+            if profiling.ENABLED:
+                self.ai_generator = profiling.profile_generator(self.ai_generator, label)
+            if self.record_trace:
+                # Stream this search to traces/ for pygame_replay.py
+                writer = TraceWriter(new_trace_path(label), self.game_state, engine=label)
+                self.ai_generator = record_generator(self.ai_generator, writer)
+            self.ai_stream = EventRateController(self.ai_generator, Snapshot.from_state(self.game_state),
+                                                 self.vis_frame_budget, self.vis_time_limit)
+        vis = self.ai_stream.pump()
+        if vis is None:
+            if self.ai_stream.done:
+                # Generator ended without a result
                 self.ai_generator = None
-                self.current_vis_data = None
-            elif vis['type'] == 'dp_hit':
-                 # Flash a message simply if needed or let data show it
-                 self.current_vis_data = vis
-                 # self.play_sound('flip')
-            else:
-                self.current_vis_data = vis
-                # Optional: Play ticking sound for search?
-                if vis['type'] == 'prune':
-                     # self.play_sound('flip') # Maybe too annoying
-                     pass
-        except StopIteration:
-            self.ai_generator = None
-            self.current_vis_data = None
+                self.ai_stream = None
+            # Past the time limit the search finishes without being drawn
+            stream = self.ai_stream
+            self.current_vis_data = stream.last if stream and stream.visualizing else None
+            return
+
+        # Force a copy of the board to prevent in-place algorithms from mutating the final state
+        final_state = vis['state']
+        final_board = Board(final_state.board.grid, size=final_state.board.SIZE)
+        
+        # Check flipped count
+        ai = self.game_state.player
+        ai_before = sum(row.count(ai) for row in self.game_state.board.grid)
+        ai_after = sum(row.count(ai) for row in final_board.grid)
+        flipped_count = ai_after - ai_before - 1
+        
+        if flipped_count >= 8:
+            self.play_sound('opp_capture_more')
+        else:
+            self.play_sound('move')
+
+        from model.game_state import GameState
+        self.game_state = GameState(final_board, final_state.player)
+        
+        # Update Score for Eval Bar
+        self.last_eval_score = weighted_heuristic(self.game_state.board, Board.BLACK)
+        self.last_stats = vis.get('stats')
+        
+        self.ai_generator = None
+        self.ai_stream = None
+        self.current_vis_data = None
 
     def run(self):
         while self.running:
@@ -732,9 +966,14 @@ class PyGameUI:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_f:
                         pygame.display.toggle_fullscreen()
+                        self.invalidate_screen()
 
                 if event.type == pygame.VIDEORESIZE:
                     self.calculate_layout(event.w, event.h)
+                    self.invalidate_screen()
+
+                if event.type == pygame.VIDEOEXPOSE:
+                    self.invalidate_screen()
 
                 if self.app_state == STATE_MENU:
                     if event.type == pygame.MOUSEBUTTONDOWN:
@@ -758,6 +997,19 @@ class PyGameUI:
                         if event.key == pygame.K_e:
                             self.show_eval_bar = not self.show_eval_bar
                             self.play_sound('flip')
+                        if event.key == pygame.K_p:
+                            self.use_pattern_eval = not self.use_pattern_eval
+                            self.reset_ponder()
+                            self.play_sound('flip')
+                        if event.key == pygame.K_t:
+                            self.ponder_mode = not self.ponder_mode
+                            if self.ponderer is not None:
+                                self.ponderer.cancel()
+                                self.ponderer = None
+                            self.play_sound('flip')
+                        if event.key == pygame.K_r:
+                            self.record_trace = not self.record_trace
+                            self.play_sound('flip')
                     
                     if event.type == pygame.MOUSEBUTTONDOWN:
                         # Human Move Logic
@@ -786,6 +1038,8 @@ class PyGameUI:
                                      self.game_state = GameState(new_board, -self.game_state.player)
                                      self.last_eval_score = weighted_heuristic(self.game_state.board, Board.BLACK)
                                      self.ai_generator = None  # Cancel any in-progress AI generator
+                                     self.ai_stream = None
+                                     self.stop_ponder()
                         
                         # Restart Button
                         if hasattr(self, 'btn_restart') and self.btn_restart.collidepoint((mx, my)):
@@ -799,16 +1053,11 @@ class PyGameUI:
                 
                 # AI Logic
                 if self.game_mode == MODE_PvCPU and self.game_state.player == self.ai_player and not self.game_state.is_terminal():
-                    if self.algo_mode:
-                        self.update_ai()
-                    else:
-                        # Speed up calculation significantly for Classical BT to prevent UI freezing
-                        steps_per_frame = 1000 if self.cpu_strategy == STRAT_BT else 20
-                        for _ in range(steps_per_frame): 
-                            if self.game_state.player == self.ai_player:
-                                self.update_ai()
-                            else:
-                                break
+                    # Drains a frame's worth of search events (ui/event_rate.py)
+                    self.update_ai()
+                elif (self.ponder_mode and self.game_mode == MODE_PvCPU and self.game_state.player == self.human_player
+                        and not self.game_state.is_terminal()):
+                    self.ponder()
 
                 # --- AUTO PASS LOGIC (HUMAN) ---
                 if self.game_mode == MODE_PvP or (self.game_mode == MODE_PvCPU and self.game_state.player == self.human_player):
@@ -822,9 +1071,11 @@ class PyGameUI:
                                  self.screen.blit(t, (self.board_area_size//2 - t.get_width()//2, self.board_area_size//2))
                                  pygame.display.flip()
                                  pygame.time.delay(1000)
+                                 self.invalidate_screen()
                                  
                                  self.game_state = succ[0]
                                  self.current_vis_data = None
+                                 self.stop_ponder()
                                  
                 if self.game_state.is_terminal() and self.app_state == STATE_PLAYING:
                      self.app_state = STATE_GAME_OVER
@@ -846,7 +1097,7 @@ class PyGameUI:
                 self.draw_game_over()
 
 
-            pygame.display.flip()
+            self.present()
             self.clock.tick(30 if self.algo_mode else 60)
 
         pygame.quit()
@@ -1,7 +1,9 @@
 import sys
 from model.board import Board
 from model.game_state import GameState
-from algorithms.graph import get_best_move
+from algorithms.graph import get_best_move_generator
+from algorithms.stats import SearchStats
+from algorithms import profiling
 
 class TerminalUI:
     def __init__(self):
@@ -72,7 +74,15 @@ class TerminalUI:
             else:
                 # AI Turn
                 print("AI is thinking...")
-                next_state = get_best_move(self.game_state, depth=3)
+                stats = SearchStats()
+                gen = get_best_move_generator(self.game_state, depth=3, stats=stats)
+                if profiling.ENABLED:
+                    gen = profiling.profile_generator(gen, 'alphabeta')
+                next_state = None
+                for evt in gen:
+                    if evt['type'] == 'result':
+                        next_state = evt['state']
+                print(stats)
                 if next_state:
                     self.game_state = next_state
                 else: